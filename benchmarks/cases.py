@@ -0,0 +1,155 @@
+"""Benchmark cases: every engine entry point swept over its input grid.
+
+Each case is a name, a function and the list of argument tuples it is called
+with.  Grids cover every crop, index and category the CLI accepts; argument
+combinations the engine rejects with ``ValueError`` are dropped so each case
+times only successful calls.
+"""
+
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from rb209.data.ber import CROP_BER_GROUP
+from rb209.data.crops import CROP_INFO
+from rb209.engine import (
+    calculate_grass_ley_sns,
+    calculate_lime,
+    calculate_organic,
+    calculate_sns,
+    calculate_veg_sns,
+    nitrogen_timing,
+    recommend_all,
+    recommend_fruit_all,
+)
+from rb209.formatters import (
+    format_lime,
+    format_organic,
+    format_recommendation,
+    format_sns,
+    format_timing,
+)
+from rb209.models import (
+    FruitSoilCategory,
+    OrchardManagement,
+    OrganicMaterial,
+    PreviousCrop,
+    Rainfall,
+    SoilType,
+    VegPreviousCrop,
+    VegSoilType,
+)
+from rb209.vector import ber_curve
+
+_SOILS = [s.value for s in SoilType]
+_RAINFALL = [r.value for r in Rainfall]
+_FORMATS = ("table", "json", "ndjson", "csv")
+# A weekly price sweep: break-even ratios 1.5-12.0 in steps of 0.01.
+_BER_SWEEP = [1.5 + i / 100 for i in range(1051)]
+
+
+@dataclass
+class Case:
+    """One benchmark: *func* called once with each tuple in *calls*."""
+    name: str
+    func: Callable
+    calls: list[tuple]
+
+
+def _valid(func: Callable, grid) -> list[tuple]:
+    calls = []
+    for args in grid:
+        try:
+            func(*args)
+        except ValueError:
+            continue
+        calls.append(tuple(args))
+    return calls
+
+
+def _results(func: Callable, calls: list[tuple]) -> list:
+    return [func(*args) for args in calls]
+
+
+def _grids() -> dict[str, tuple[Callable, list[tuple]]]:
+    arable = sorted(c for c, info in CROP_INFO.items() if info["category"] != "fruit")
+    fruit = sorted(c for c, info in CROP_INFO.items() if info["category"] == "fruit")
+    return {
+        "calculate_sns": (calculate_sns, itertools.product(
+            [p.value for p in PreviousCrop], _SOILS, _RAINFALL,
+        )),
+        "calculate_grass_ley_sns": (calculate_grass_ley_sns, itertools.product(
+            ["1-2yr", "3-5yr"], ["low", "high"], ["cut", "grazed", "1-cut-then-grazed"],
+            ["light", "medium", "heavy"], _RAINFALL, [1, 2, 3],
+        )),
+        "calculate_veg_sns": (calculate_veg_sns, itertools.product(
+            [p.value for p in VegPreviousCrop], [s.value for s in VegSoilType], _RAINFALL,
+        )),
+        "recommend_all": (recommend_all, itertools.product(
+            arable, range(7), range(5), range(5), [2], [True, False],
+        )),
+        "recommend_fruit_all": (recommend_fruit_all, itertools.product(
+            fruit, [s.value for s in FruitSoilCategory], range(5), range(5), range(5),
+            [None] + [m.value for m in OrchardManagement],
+        )),
+        "nitrogen_timing": (nitrogen_timing, itertools.product(
+            arable, [0.0, 40.0, 120.0, 250.0], [None] + _SOILS,
+        )),
+        "calculate_organic": (calculate_organic, itertools.product(
+            [m.value for m in OrganicMaterial], [10.0, 30.0],
+            [None, "autumn", "winter", "spring", "summer"], [False, True], [None] + _SOILS,
+        )),
+        "calculate_lime": (calculate_lime, itertools.product(
+            [4.5, 5.0, 5.5, 6.0, 6.5, 7.0], [None, 6.5], _SOILS, ["arable", "grassland"],
+        )),
+        "ber_curve": (ber_curve, [(crop, _BER_SWEEP) for crop in sorted(CROP_BER_GROUP)]),
+    }
+
+
+def build_cases(only: set[str] | None = None, stride: int = 1) -> list[Case]:
+    """Build every case (or those named in *only*).
+
+    Args:
+        only: Case names to build; ``None`` builds all of them.  Formatter
+            cases are named ``format_<kind>.<fmt>``.
+        stride: Keep every *stride*-th grid point, for quick runs.
+
+    Returns:
+        Cases in a stable order.
+    """
+    def wanted(name: str) -> bool:
+        return only is None or name in only
+
+    cases = []
+    calls_by_name = {}
+    for name, (func, grid) in _grids().items():
+        calls = _valid(func, grid)[::stride]
+        calls_by_name[name] = calls
+        if wanted(name):
+            cases.append(Case(name, func, calls))
+
+    formatters = {
+        "format_recommendation": (format_recommendation, "recommend_all", recommend_all),
+        "format_sns": (format_sns, "calculate_sns", calculate_sns),
+        "format_timing": (format_timing, "nitrogen_timing", nitrogen_timing),
+        "format_organic": (format_organic, "calculate_organic", calculate_organic),
+        "format_lime": (format_lime, "calculate_lime", calculate_lime),
+    }
+    for kind, (formatter, source, func) in formatters.items():
+        names = [f"{kind}.{fmt}" for fmt in _FORMATS]
+        if not any(wanted(n) for n in names):
+            continue
+        results = _results(func, calls_by_name[source])
+        for fmt, name in zip(_FORMATS, names):
+            if wanted(name):
+                cases.append(Case(name, formatter, [(r, fmt) for r in results]))
+    return cases
+
+
+def case_names() -> list[str]:
+    """Every case name, in the order :func:`build_cases` returns them."""
+    names = list(_grids())
+    for kind in ("format_recommendation", "format_sns", "format_timing",
+                 "format_organic", "format_lime"):
+        names.extend(f"{kind}.{fmt}" for fmt in _FORMATS)
+    return names
@@ -0,0 +1,184 @@
+"""Measure how much memory pre-forked workers keep sharing with their parent.
+
+Usage::
+
+    python benchmarks/fork_memory.py --workers 4
+    python benchmarks/fork_memory.py --workers 8 --out fork.json
+
+Each mode runs in a fresh interpreter.  The parent imports the engine and
+loads every table as a pre-fork server would.  In ``frozen`` mode it then
+calls :func:`rb209.data.freeze_tables`.  Finally it forks ``--workers``
+workers.  Each worker reads ``/proc/self/smaps_rollup`` right after the
+fork and again after it has run every benchmark grid once and a full
+garbage collection.  Shared pages are those still mapped by another
+process; private pages are the worker's own copies.  Linux only.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rb209 import __version__  # noqa: E402
+
+SCHEMA_VERSION = 1
+MODES = ("baseline", "frozen")
+_SMAPS = "/proc/self/smaps_rollup"
+
+# smaps_rollup fields (kB) -> reported name.
+_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+    "Private_Clean": "private",
+    "Private_Dirty": "private",
+}
+
+
+def read_memory() -> dict[str, int]:
+    """Return this process's ``rss``, ``pss``, ``shared`` and ``private`` KiB."""
+    memory = dict.fromkeys(("rss", "pss", "shared", "private"), 0)
+    with open(_SMAPS) as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            name = _FIELDS.get(key)
+            if name is not None:
+                memory[name] += int(rest.split()[0])
+    return memory
+
+
+def _load_engine() -> None:
+    """Import the engine and execute every lazily imported table."""
+    import rb209.batch  # noqa: F401
+    import rb209.engine  # noqa: F401
+    import rb209.vector  # noqa: F401
+    from rb209.server import preload
+
+    preload()
+
+
+def _worker(stride: int, report_fd: int, release_fd: int) -> None:
+    from benchmarks.cases import build_cases
+
+    before = read_memory()
+    for case in build_cases(None, stride=stride):
+        func = case.func
+        for args in case.calls:
+            func(*args)
+    gc.collect()
+    after = read_memory()
+    os.write(report_fd, (json.dumps({"before": before, "after": after}) + "\n").encode())
+    # Stay alive until every worker has reported, so pages shared between
+    # workers are still counted as shared.
+    os.read(release_fd, 1)
+
+
+def run_mode(mode: str, workers: int, stride: int) -> dict:
+    """Load the engine, optionally freeze, fork *workers* and collect reports."""
+    _load_engine()
+    if mode == "frozen":
+        from rb209.data import freeze_tables
+
+        freeze_tables()
+    parent = read_memory()
+
+    report_r, report_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(report_r)
+            os.close(release_w)
+            try:
+                _worker(stride, report_w, release_r)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    os.close(report_w)
+    os.close(release_r)
+
+    with os.fdopen(report_r) as reports:
+        results = [json.loads(next(reports)) for _ in pids]
+    os.close(release_w)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    def mean(phase: str) -> dict[str, float]:
+        return {
+            key: round(sum(r[phase][key] for r in results) / len(results), 1)
+            for key in results[0][phase]
+        }
+
+    return {"parent": parent, "before": mean("before"), "after": mean("after")}
+
+
+def format_summary(report: dict) -> str:
+    """Render mean KiB per worker for each mode and phase."""
+    lines = [f"{'mode':<10} {'phase':<7} {'rss':>9} {'pss':>9} {'shared':>9} {'private':>9}"]
+    for mode, result in report["results"].items():
+        for phase in ("before", "after"):
+            m = result[phase]
+            lines.append(
+                f"{mode:<10} {phase:<7} {m['rss']:>9,.0f} {m['pss']:>9,.0f} "
+                f"{m['shared']:>9,.0f} {m['private']:>9,.0f}"
+            )
+    return "\n".join(lines) + "\n(KiB, mean per worker)"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", "-w", type=int, default=4,
+                        help="Workers forked per mode (default: 4)")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="Run every Nth call of each benchmark grid (default: 1)")
+    parser.add_argument("--out", "-o", default="-",
+                        help="Write JSON results here (default: stdout)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(_SMAPS):
+        parser.error(f"{_SMAPS} is not available; this harness needs Linux")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.mode:
+        # Child interpreter: measure one mode and print it as JSON.
+        print(json.dumps(run_mode(args.mode, args.workers, args.stride)))
+        return
+
+    results = {}
+    for mode in MODES:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--workers", str(args.workers), "--stride", str(args.stride)],
+            capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(proc.stdout)
+    report = {
+        "schema": SCHEMA_VERSION,
+        "rb209_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "settings": {"workers": args.workers, "stride": args.stride},
+        "results": results,
+    }
+    print(format_summary(report), file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        Path(args.out).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Run the RB209 micro-benchmarks and write machine-readable results.
+
+Usage::
+
+    python benchmarks/run.py --out results.json
+    python benchmarks/run.py --out new.json --compare old.json
+
+For each case the whole input grid is called repeatedly for at least
+``--min-time`` seconds, ``--repeat`` times, and the fastest pass is kept.
+Allocation figures come from a separate, traced pass over a sample of the
+grid so that tracing does not distort the timings.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.cases import Case, build_cases, case_names  # noqa: E402
+from rb209 import __version__  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+
+def _time_pass(case: Case) -> float:
+    func = case.func
+    start = time.perf_counter()
+    for args in case.calls:
+        func(*args)
+    return time.perf_counter() - start
+
+
+def time_case(case: Case, min_time: float, repeat: int) -> float:
+    """Return the best seconds-per-call over *repeat* timed passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        passes = 0
+        elapsed = 0.0
+        while elapsed < min_time or passes == 0:
+            elapsed += _time_pass(case)
+            passes += 1
+        best = min(best, elapsed / (passes * len(case.calls)))
+    return best
+
+
+def measure_allocations(case: Case, sample: int) -> tuple[float, float]:
+    """Return mean (peak bytes, live blocks) per call over a sample of the grid.
+
+    Peak bytes is the largest amount of memory the call had allocated at
+    once, temporaries included.  Live blocks is the number of memory blocks
+    still held once the call returns, which is the size of its result.
+    """
+    step = max(1, len(case.calls) // sample)
+    calls = case.calls[::step]
+    func = case.func
+    peak_total = 0
+    blocks_total = 0
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for args in calls:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+            result = func(*args)
+            blocks_total += sys.getallocatedblocks() - blocks_before
+            peak_total += tracemalloc.get_traced_memory()[1] - base
+            del result
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return peak_total / len(calls), blocks_total / len(calls)
+
+
+def run(cases: list[Case], min_time: float, repeat: int, sample: int) -> dict:
+    results = {}
+    for case in cases:
+        if not case.calls:
+            continue
+        seconds = time_case(case, min_time, repeat)
+        peak, blocks = measure_allocations(case, sample)
+        results[case.name] = {
+            "calls": len(case.calls),
+            "ops_per_sec": round(1.0 / seconds, 1),
+            "usec_per_op": round(seconds * 1e6, 3),
+            "alloc_peak_bytes": round(peak, 1),
+            "alloc_blocks": round(blocks, 2),
+        }
+        print(
+            f"{case.name:<30} {1.0 / seconds:>12,.0f} ops/s "
+            f"{seconds * 1e6:>9.2f} us/op {peak:>9.0f} B peak {blocks:>7.1f} blocks",
+            file=sys.stderr,
+        )
+    return {
+        "schema": SCHEMA_VERSION,
+        "rb209_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "settings": {"min_time": min_time, "repeat": repeat, "alloc_sample": sample},
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> str:
+    """Render a table of ops/sec and allocation changes between two runs."""
+    lines = [
+        f"{'case':<30} {'base ops/s':>12} {'ops/s':>12} {'speed':>7} {'base B':>8} {'B':>8}",
+    ]
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<30} {'--':>12} {cur['ops_per_sec']:>12,.0f}")
+            continue
+        ratio = cur["ops_per_sec"] / base["ops_per_sec"]
+        lines.append(
+            f"{name:<30} {base['ops_per_sec']:>12,.0f} {cur['ops_per_sec']:>12,.0f} "
+            f"{ratio:>6.2f}x {base['alloc_peak_bytes']:>8.0f} {cur['alloc_peak_bytes']:>8.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", "-o", default="-",
+                        help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Print a comparison against an earlier results file")
+    parser.add_argument("--only", action="append", choices=case_names(), metavar="CASE",
+                        help="Run only this case (repeatable)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per timed pass (default: 0.2)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timed passes per case; the fastest is kept (default: 5)")
+    parser.add_argument("--alloc-sample", type=int, default=500,
+                        help="Grid points traced for allocation figures (default: 500)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Thin the grids and time briefly, for smoke tests")
+    args = parser.parse_args(argv)
+
+    stride = 1
+    if args.quick:
+        stride, args.min_time, args.repeat, args.alloc_sample = 50, 0.0, 1, 20
+
+    cases = build_cases(set(args.only) if args.only else None, stride=stride)
+    report = run(cases, args.min_time, args.repeat, args.alloc_sample)
+
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        Path(args.out).write_text(text + "\n")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(compare(baseline, report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,661 @@
+"""Batch processing — stream a file of fields through the recommendation engine.
+
+Input files hold one field per row, either as CSV with a header line or as
+JSON Lines (one object per line).  Rows are read lazily and results are
+written as they are produced, so memory use does not grow with file size.
+A row that fails validation is reported on a separate error stream and the
+run carries on with the next row.
+"""
+
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from typing import IO
+
+from rb209.cache import RecommendationCache
+from rb209.engine import calculate_organic, nitrogen_timing
+from rb209.formatters import CSV_NOTE_SEPARATOR, TIMING_CSV_COLUMNS, csv_row, format_report
+from rb209.models import (
+    FrozenNitrogenSplit,
+    FrozenNitrogenTimingResult,
+    NutrientRecommendation,
+    RecommendationBatch,
+)
+from rb209.parallel import DEFAULT_CHUNK_SIZE, map_ordered
+from rb209.validation import organic_errors, recommend_errors
+
+# Columns understood by ``batch-recommend``.  ``field`` is an optional
+# caller-supplied identifier that is echoed back on every output record.
+RECOMMEND_COLUMNS: tuple[str, ...] = (
+    "field",
+    "crop",
+    "sns_index",
+    "p_index",
+    "k_index",
+    "mg_index",
+    "straw_removed",
+    "soil_type",
+    "expected_yield",
+    "ber",
+    "k_upper_half",
+)
+
+_TRUE_STRINGS = frozenset({"true", "yes", "y", "1"})
+_FALSE_STRINGS = frozenset({"false", "no", "n", "0"})
+
+
+def detect_format(path: str) -> str:
+    """Return "csv" or "jsonl" based on the file extension of *path*."""
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    raise ValueError(
+        f"Cannot determine input format from '{path}'. "
+        "Use a .csv or .jsonl extension, or pass --input-format."
+    )
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yield ``(row_number, raw_row, error)`` for each record in *stream*.
+
+    Row numbers are 1-based and count data rows only (the CSV header is not
+    a row).  Blank JSON lines are skipped.  When a line cannot be decoded,
+    ``raw_row`` is ``None`` and ``error`` describes the problem.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, row, None
+    elif fmt == "jsonl":
+        row_number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield row_number, None, f"Invalid JSON: {exc.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield row_number, None, "Each JSON line must be an object"
+                continue
+            yield row_number, row, None
+    else:
+        raise ValueError(f"Unknown input format '{fmt}'. Valid options: csv, jsonl")
+
+
+# ── Value coercion ─────────────────────────────────────────────────
+#
+# CSV cells are always strings and an empty cell means "not given".
+# JSON values may already have the right type, so each helper accepts both.
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _to_int(name: str, value) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def _to_float(name: str, value) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"{name} must be a number, got {value!r}")
+
+
+def _to_bool(name: str, value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise ValueError(f"{name} must be true or false, got {value!r}")
+
+
+def parse_recommend_row(row: dict) -> dict:
+    """Convert a raw input row into keyword arguments for ``recommend_all``.
+
+    Raises:
+        ValueError: If a required column is missing or a value cannot be
+            converted to the expected type.
+    """
+    missing = [c for c in ("crop", "sns_index", "p_index", "k_index") if _is_blank(row.get(c))]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    kwargs: dict = {
+        "crop": str(row["crop"]).strip(),
+        "sns_index": _to_int("sns_index", row["sns_index"]),
+        "p_index": _to_int("p_index", row["p_index"]),
+        "k_index": _to_int("k_index", row["k_index"]),
+    }
+    if not _is_blank(row.get("mg_index")):
+        kwargs["mg_index"] = _to_int("mg_index", row["mg_index"])
+    if not _is_blank(row.get("straw_removed")):
+        kwargs["straw_removed"] = _to_bool("straw_removed", row["straw_removed"])
+    if not _is_blank(row.get("soil_type")):
+        kwargs["soil_type"] = str(row["soil_type"]).strip()
+    if not _is_blank(row.get("expected_yield")):
+        kwargs["expected_yield"] = _to_float("expected_yield", row["expected_yield"])
+    if not _is_blank(row.get("ber")):
+        kwargs["ber"] = _to_float("ber", row["ber"])
+    if not _is_blank(row.get("k_upper_half")):
+        kwargs["k_upper_half"] = _to_bool("k_upper_half", row["k_upper_half"])
+    return kwargs
+
+
+def parse_timing_row(row: dict) -> dict:
+    """Convert a raw input row into keyword arguments for ``nitrogen_timing``.
+
+    Raises:
+        ValueError: If a required column is missing or a value cannot be
+            converted to the expected type.
+    """
+    missing = [c for c in ("crop", "total_n") if _is_blank(row.get(c))]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    kwargs: dict = {
+        "crop": str(row["crop"]).strip(),
+        "total_n": _to_float("total_n", row["total_n"]),
+    }
+    if not _is_blank(row.get("soil_type")):
+        kwargs["soil_type"] = str(row["soil_type"]).strip()
+    return kwargs
+
+
+def parse_organic_row(row: dict) -> dict:
+    """Convert a raw input row into keyword arguments for ``calculate_organic``.
+
+    Raises:
+        ValueError: If a required column is missing or a value cannot be
+            converted to the expected type.
+    """
+    missing = [c for c in ("material", "rate") if _is_blank(row.get(c))]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    kwargs: dict = {
+        "material": str(row["material"]).strip(),
+        "rate": _to_float("rate", row["rate"]),
+    }
+    if not _is_blank(row.get("timing")):
+        kwargs["timing"] = str(row["timing"]).strip()
+    if not _is_blank(row.get("incorporated")):
+        kwargs["incorporated"] = _to_bool("incorporated", row["incorporated"])
+    if not _is_blank(row.get("soil_type")):
+        kwargs["soil_type"] = str(row["soil_type"]).strip()
+    return kwargs
+
+
+def _field_id(row: dict | None):
+    if row is None:
+        return None
+    value = row.get("field")
+    return None if _is_blank(value) else value
+
+
+# ── Batch runner ───────────────────────────────────────────────────
+
+# Fields in a farm file mostly share a few crop/index combinations.  Each
+# process (including each worker) keeps its own cache.
+_CACHE = RecommendationCache()
+
+# Field order of the compact tuples passed between worker processes.
+RECORD_KEYS: tuple[str, ...] = (
+    "crop",
+    "nitrogen",
+    "phosphorus",
+    "potassium",
+    "magnesium",
+    "sulfur",
+    "sodium",
+    "notes",
+)
+
+
+# CSV output columns for ``batch-recommend``; lists (notes) are joined with
+# CSV_NOTE_SEPARATOR.
+RECOMMEND_OUTPUT_COLUMNS: tuple[str, ...] = ("row", "field", *RECORD_KEYS)
+
+
+def recommend_row(
+    item: tuple[int, dict | None, str | None],
+    note_codes: bool = False,
+) -> tuple[int, object, tuple | None, str | None]:
+    """Process one item from :func:`iter_rows`.
+
+    Returns ``(row_number, field_id, values, error)`` where ``values`` is a
+    tuple ordered as :data:`RECORD_KEYS`.  Notes are a tuple of strings, or
+    with *note_codes* a tuple of ``[code, *params]`` lists (see
+    :mod:`rb209.notes`).
+    """
+    row_number, row, error = item
+    field_id = _field_id(row)
+    if error is not None:
+        return row_number, field_id, None, error
+    try:
+        kwargs = parse_recommend_row(row)
+        errors = recommend_errors(**kwargs)
+        if errors:
+            return row_number, field_id, None, "; ".join(errors)
+        if note_codes:
+            rec = _CACHE.recommend_all_coded(**kwargs, trusted=True)
+            notes = tuple([code, *params] for code, params in rec.notes)
+        else:
+            rec = _CACHE.recommend_all(**kwargs, trusted=True)
+            notes = tuple(rec.notes)
+    except ValueError as exc:
+        return row_number, field_id, None, str(exc)
+    values = (
+        rec.crop, rec.nitrogen, rec.phosphorus, rec.potassium,
+        rec.magnesium, rec.sulfur, rec.sodium, notes,
+    )
+    return row_number, field_id, values, None
+
+
+def recommend_rows(
+    rows: Iterable[tuple[int, dict | None, str | None]],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    note_codes: bool = False,
+) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    """Run ``recommend_all`` over *rows* as produced by :func:`iter_rows`.
+
+    Args:
+        rows: Items from :func:`iter_rows`; consumed lazily.
+        workers: Number of worker processes (see :func:`rb209.parallel.map_ordered`).
+        chunk_size: Rows sent to a worker at a time when *workers* > 1.
+        note_codes: Return notes as ``[code, *params]`` lists instead of text.
+
+    Yields ``(row_number, field_id, record, error)`` in input order.  Exactly
+    one of ``record`` (the recommendation as a dict) and ``error`` is set.
+    """
+    func = partial(recommend_row, note_codes=True) if note_codes else recommend_row
+    return _map_records(func, RECORD_KEYS, rows, workers, chunk_size)
+
+
+def _map_records(
+    func, keys: tuple[str, ...], rows, workers: int, chunk_size: int,
+) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    # Run a row worker through map_ordered and turn its compact tuples back
+    # into records keyed by *keys*.
+    for row_number, field_id, values, error in map_ordered(
+        func, rows, workers, chunk_size,
+    ):
+        if values is None:
+            yield row_number, field_id, None, error
+            continue
+        record = dict(zip(keys, values))
+        record["notes"] = list(record["notes"])
+        yield row_number, field_id, record, None
+
+
+# ── Nitrogen timing and organic materials ──────────────────────────
+
+# Columns understood by ``batch-timing`` and ``batch-organic``.
+TIMING_COLUMNS: tuple[str, ...] = ("field", "crop", "total_n", "soil_type")
+ORGANIC_COLUMNS: tuple[str, ...] = (
+    "field", "material", "rate", "timing", "incorporated", "soil_type",
+)
+
+# Field order of the compact tuples returned by timing_row and organic_row.
+TIMING_RECORD_KEYS: tuple[str, ...] = ("crop", "total_n", "splits", "notes")
+ORGANIC_RECORD_KEYS: tuple[str, ...] = (
+    "material", "rate", "unit", "total_n", "available_n",
+    "p2o5", "k2o", "mgo", "so3", "notes",
+)
+_SPLIT_KEYS = ("amount", "timing", "note")
+
+# CSV output columns for ``batch-organic``.
+ORGANIC_OUTPUT_COLUMNS: tuple[str, ...] = ("row", "field", *ORGANIC_RECORD_KEYS)
+
+# CSV output columns for ``batch-timing``: the ``timing --format csv`` layout,
+# with one group of dressing columns per dressing.  Rows are filled by
+# :func:`timing_csv_row`.
+TIMING_OUTPUT_COLUMNS: tuple[str, ...] = ("row", "field", *TIMING_CSV_COLUMNS)
+
+
+def timing_row(
+    item: tuple[int, dict | None, str | None],
+) -> tuple[int, object, tuple | None, str | None]:
+    """Process one item from :func:`iter_rows` with ``nitrogen_timing``.
+
+    Returns ``(row_number, field_id, values, error)`` where ``values`` is a
+    tuple ordered as :data:`TIMING_RECORD_KEYS`; splits are
+    ``(amount, timing, note)`` tuples.
+    """
+    row_number, row, error = item
+    field_id = _field_id(row)
+    if error is not None:
+        return row_number, field_id, None, error
+    try:
+        result = nitrogen_timing(**parse_timing_row(row))
+    except ValueError as exc:
+        return row_number, field_id, None, str(exc)
+    splits = tuple((s.amount, s.timing, s.note) for s in result.splits)
+    return row_number, field_id, (result.crop, result.total_n, splits, tuple(result.notes)), None
+
+
+def timing_csv_row(record: dict) -> list:
+    """Return a :func:`timing_rows` record as cells of ``TIMING_CSV_COLUMNS``.
+
+    The cells come from :func:`rb209.formatters.csv_row`, so they always
+    match ``timing --format csv``.
+    """
+    return csv_row(FrozenNitrogenTimingResult(
+        record["crop"],
+        record["total_n"],
+        tuple(FrozenNitrogenSplit(**split) for split in record["splits"]),
+        tuple(record["notes"]),
+    ))
+
+
+def organic_row(
+    item: tuple[int, dict | None, str | None],
+) -> tuple[int, object, tuple | None, str | None]:
+    """Process one item from :func:`iter_rows` with ``calculate_organic``.
+
+    Returns ``(row_number, field_id, values, error)`` where ``values`` is a
+    tuple ordered as :data:`ORGANIC_RECORD_KEYS`.
+    """
+    row_number, row, error = item
+    field_id = _field_id(row)
+    if error is not None:
+        return row_number, field_id, None, error
+    try:
+        kwargs = parse_organic_row(row)
+        errors = organic_errors(**kwargs)
+        if errors:
+            return row_number, field_id, None, "; ".join(errors)
+        org = calculate_organic(**kwargs, trusted=True)
+    except ValueError as exc:
+        return row_number, field_id, None, str(exc)
+    values = (
+        org.material, org.rate, org.unit, org.total_n, org.available_n,
+        org.p2o5, org.k2o, org.mgo, org.so3, tuple(org.notes),
+    )
+    return row_number, field_id, values, None
+
+
+def timing_rows(
+    rows: Iterable[tuple[int, dict | None, str | None]],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    """Run ``nitrogen_timing`` over *rows* as produced by :func:`iter_rows`.
+
+    Arguments and results are as :func:`recommend_rows`; each record has
+    the same keys as ``timing --format json``.
+    """
+    for row_number, field_id, record, error in _map_records(
+        timing_row, TIMING_RECORD_KEYS, rows, workers, chunk_size,
+    ):
+        if record is not None:
+            record["splits"] = [dict(zip(_SPLIT_KEYS, split)) for split in record["splits"]]
+        yield row_number, field_id, record, error
+
+
+def organic_rows(
+    rows: Iterable[tuple[int, dict | None, str | None]],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    """Run ``calculate_organic`` over *rows* as produced by :func:`iter_rows`.
+
+    Arguments and results are as :func:`recommend_rows`; each record has
+    the same keys as ``organic --format json``.
+    """
+    return _map_records(organic_row, ORGANIC_RECORD_KEYS, rows, workers, chunk_size)
+
+
+# ── SMN samples ────────────────────────────────────────────────────
+
+# Columns understood by ``smn-batch``.  ``crop_n`` applies to the arable
+# table and ``depth_cm`` to the vegetable table.
+SMN_COLUMNS: tuple[str, ...] = ("field", "smn", "crop_n", "depth_cm")
+
+SMN_TABLES: tuple[str, ...] = ("arable", "veg")
+
+# CSV output columns for ``smn-batch``, by table.
+SMN_OUTPUT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "arable": ("row", "field", "method", "smn", "crop_n", "sns_value", "sns_index"),
+    "veg": ("row", "field", "method", "smn", "depth_cm", "sns_index"),
+}
+_VEG_DEPTHS = (30, 60, 90)
+
+
+def _to_measurement(name: str, value) -> float:
+    # NaN is rejected here even though the column functions give it SNS
+    # index 6: in a results file it is a missing or garbled reading, and it
+    # could not be written back out as valid JSON.
+    number = _to_float(name, value)
+    if number != number:
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if number < 0:
+        raise ValueError(f"{name} must be non-negative, got {number}")
+    return number
+
+
+def parse_smn_row(row: dict, table: str, depth_cm: int | None = None) -> tuple[float, float]:
+    """Convert a raw input row into ``(smn, crop_n)`` or ``(smn, depth_cm)``.
+
+    Args:
+        row: Raw input row.
+        table: "arable" (Table 4.10: ``crop_n`` defaults to 0) or "veg"
+            (Table 6.6: ``depth_cm`` defaults to *depth_cm*).
+        depth_cm: Sampling depth for vegetable rows without a ``depth_cm``.
+
+    Raises:
+        ValueError: If a required column is missing or a value is invalid,
+            including a NaN ``smn`` or ``crop_n``, which
+            :func:`rb209.vector.sns_value_to_index_many` would accept.
+    """
+    if _is_blank(row.get("smn")):
+        raise ValueError("Missing required column(s): smn")
+    smn = _to_measurement("smn", row["smn"])
+    if table == "arable":
+        crop_n = row.get("crop_n")
+        return smn, 0.0 if _is_blank(crop_n) else _to_measurement("crop_n", crop_n)
+    depth = row.get("depth_cm")
+    if _is_blank(depth):
+        if depth_cm is None:
+            raise ValueError("Missing required column(s): depth_cm")
+        depth = depth_cm
+    depth = _to_int("depth_cm", depth)
+    if depth not in _VEG_DEPTHS:
+        raise ValueError(f"depth_cm must be 30, 60, or 90, got {depth}")
+    return smn, depth
+
+
+def _smn_chunk(chunk: list, table: str) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    from rb209.vector import smn_to_sns_index_veg_many, sns_value_to_index_many
+
+    valid = [values for _, _, values, _ in chunk if values is not None]
+    if table == "arable":
+        sns_values = [smn + crop_n for smn, crop_n in valid]
+        indices = iter(sns_value_to_index_many(sns_values))
+        totals = iter(sns_values)
+    else:
+        smn, depths = zip(*valid) if valid else ((), ())
+        indices = iter(smn_to_sns_index_veg_many(smn, depths))
+    for row_number, field_id, values, error in chunk:
+        if values is None:
+            yield row_number, field_id, None, error
+        elif table == "arable":
+            yield row_number, field_id, {
+                "method": "smn", "smn": values[0], "crop_n": values[1],
+                "sns_value": next(totals), "sns_index": next(indices),
+            }, None
+        else:
+            yield row_number, field_id, {
+                "method": "veg-smn", "smn": values[0], "depth_cm": values[1],
+                "sns_index": next(indices),
+            }, None
+
+
+def smn_rows(
+    rows: Iterable[tuple[int, dict | None, str | None]],
+    table: str = "arable",
+    depth_cm: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, object, dict | None, str | None]]:
+    """Convert SMN samples from :func:`iter_rows` to SNS indices.
+
+    Rows are parsed one at a time and converted *chunk_size* at a time with
+    :func:`rb209.vector.sns_value_to_index_many` (Table 4.10, on SMN plus
+    crop N) or :func:`rb209.vector.smn_to_sns_index_veg_many` (Table 6.6).
+
+    Args:
+        rows: Items from :func:`iter_rows`; consumed lazily.
+        table: "arable" or "veg".
+        depth_cm: Sampling depth for vegetable rows without a ``depth_cm``.
+        chunk_size: Rows converted per call.
+
+    Yields ``(row_number, field_id, record, error)`` in input order, as
+    :func:`recommend_rows`.
+
+    Raises:
+        ValueError: If *table* or *depth_cm* is invalid.
+    """
+    if table not in SMN_TABLES:
+        raise ValueError(f"Unknown SMN table '{table}'. Valid options: {', '.join(SMN_TABLES)}")
+    if depth_cm is not None and depth_cm not in _VEG_DEPTHS:
+        raise ValueError(f"depth_cm must be 30, 60, or 90, got {depth_cm}")
+    chunk = []
+    for row_number, row, error in rows:
+        field_id = _field_id(row)
+        values = None
+        if error is None:
+            try:
+                values = parse_smn_row(row, table, depth_cm)
+            except ValueError as exc:
+                error = str(exc)
+        chunk.append((row_number, field_id, values, error))
+        if len(chunk) >= chunk_size:
+            yield from _smn_chunk(chunk, table)
+            chunk = []
+    yield from _smn_chunk(chunk, table)
+
+
+def write_note_catalogue(out: IO[str]) -> None:
+    """Write the note catalogue as one JSON line: ``{"note_catalogue": {...}}``."""
+    from rb209.notes import catalogue
+
+    out.write(json.dumps({"note_catalogue": catalogue()}))
+    out.write("\n")
+
+
+def write_results(
+    results: Iterable[tuple[int, object, dict | None, str | None]],
+    out: IO[str],
+    errors: IO[str],
+    columns: tuple[str, ...] | None = None,
+    to_row: Callable[[dict], list] | None = None,
+) -> tuple[int, int]:
+    """Write batch results as JSON Lines, or as CSV when *columns* is given.
+
+    Successful rows go to *out* and failed rows to *errors*; each line
+    carries the 1-based input ``row`` number and the ``field`` identifier.
+    Errors are always JSON Lines.
+
+    Args:
+        results: Items from :func:`recommend_rows`, :func:`timing_rows`,
+            :func:`organic_rows` or :func:`smn_rows`.
+        out: Stream for successful rows.
+        errors: Stream for failed rows.
+        columns: CSV header for *out*, starting ``("row", "field")`` and
+            followed by record keys (:data:`RECOMMEND_OUTPUT_COLUMNS`,
+            :data:`ORGANIC_OUTPUT_COLUMNS` or an entry of
+            :data:`SMN_OUTPUT_COLUMNS`).  List values are joined
+            with ``CSV_NOTE_SEPARATOR``.
+        to_row: With *columns*, turns a record into the cells after ``row``
+            and ``field`` instead of looking up ``columns[2:]`` (e.g.
+            :func:`timing_csv_row` with :data:`TIMING_OUTPUT_COLUMNS`).
+
+    Returns:
+        Tuple of (rows written to *out*, rows written to *errors*).
+    """
+    writerow = None
+    if columns is not None:
+        writerow = csv.writer(out, lineterminator="\n").writerow
+        writerow(columns)
+        keys = columns[2:]
+    n_ok = 0
+    n_err = 0
+    for row_number, field_id, record, error in results:
+        if error is not None:
+            errors.write(json.dumps({"row": row_number, "field": field_id, "error": error}))
+            errors.write("\n")
+            n_err += 1
+        elif writerow is not None:
+            values = [row_number, field_id]
+            if to_row is not None:
+                values += to_row(record)
+            else:
+                for key in keys:
+                    value = record[key]
+                    values.append(CSV_NOTE_SEPARATOR.join(value) if type(value) is list else value)
+            writerow(values)
+            n_ok += 1
+        else:
+            out.write(json.dumps({"row": row_number, "field": field_id, **record}))
+            out.write("\n")
+            n_ok += 1
+    return n_ok, n_err
+
+
+def write_report(
+    results: Iterable[tuple[int, object, dict | None, str | None]],
+    out: IO[str],
+    errors: IO[str],
+) -> tuple[int, int]:
+    """Write :func:`recommend_rows` results as one table report.
+
+    Failed rows are written to *errors* as JSON Lines as they arrive.
+    Successful rows are held in a :class:`~rb209.models.RecommendationBatch`
+    until the input is exhausted, then written to *out* with
+    :func:`rb209.formatters.format_report`.  Rows are labelled with their
+    ``field`` identifier, or their row number if they have none.
+
+    Returns:
+        Tuple of (rows in the report, rows written to *errors*).
+    """
+    batch = RecommendationBatch()
+    labels = []
+    n_err = 0
+    for row_number, field_id, record, error in results:
+        if error is not None:
+            errors.write(json.dumps({"row": row_number, "field": field_id, "error": error}))
+            errors.write("\n")
+            n_err += 1
+        else:
+            batch.append(NutrientRecommendation(**record))
+            labels.append(row_number if field_id is None else field_id)
+    out.write(format_report(batch, labels))
+    out.write("\n")
+    return len(batch), n_err
+
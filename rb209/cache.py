@@ -0,0 +1,151 @@
+"""Memoised recommendations with a bounded least-recently-used cache.
+
+Across a farm portfolio most fields share a handful of crop and index
+combinations, so ``recommend_all`` is called with the same arguments over
+and over.  :class:`RecommendationCache` keeps the most recently used results
+and hands back a fresh copy on every call, so callers can modify the
+returned ``notes`` list without affecting later lookups.  Rendered and coded
+(``recommend_all_coded``) results are cached side by side, as are results
+computed with ``trusted=True`` (see :mod:`rb209.validation`).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from rb209.engine import recommend_all, recommend_all_coded
+from rb209.models import CodedRecommendation, NutrientRecommendation
+
+DEFAULT_MAXSIZE = 4096
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by :meth:`RecommendationCache.stats`."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _copy(rec):
+    return type(rec)(
+        crop=rec.crop,
+        nitrogen=rec.nitrogen,
+        phosphorus=rec.phosphorus,
+        potassium=rec.potassium,
+        magnesium=rec.magnesium,
+        sulfur=rec.sulfur,
+        sodium=rec.sodium,
+        notes=list(rec.notes),
+    )
+
+
+class RecommendationCache:
+    """Bounded LRU cache in front of ``recommend_all``.
+
+    Errors are not cached: a call that raises ``ValueError`` raises again
+    the next time it is made.
+
+    Args:
+        maxsize: Maximum number of distinct argument combinations to keep.
+            Must be at least 1.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, NutrientRecommendation | CodedRecommendation] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def recommend_all(
+        self,
+        crop: str,
+        sns_index: int,
+        p_index: int,
+        k_index: int,
+        mg_index: int = 2,
+        straw_removed: bool = True,
+        soil_type: str | None = None,
+        expected_yield: float | None = None,
+        ber: float | None = None,
+        k_upper_half: bool = False,
+        *,
+        trusted: bool = False,
+    ) -> NutrientRecommendation:
+        """Return ``recommend_all(...)`` for these arguments, using the cache."""
+        return self._get(recommend_all, (
+            crop, sns_index, p_index, k_index, mg_index, straw_removed,
+            soil_type, expected_yield, ber, k_upper_half,
+        ), trusted)
+
+    def recommend_all_coded(
+        self,
+        crop: str,
+        sns_index: int,
+        p_index: int,
+        k_index: int,
+        mg_index: int = 2,
+        straw_removed: bool = True,
+        soil_type: str | None = None,
+        expected_yield: float | None = None,
+        ber: float | None = None,
+        k_upper_half: bool = False,
+        *,
+        trusted: bool = False,
+    ) -> CodedRecommendation:
+        """Return ``recommend_all_coded(...)`` for these arguments, using the cache."""
+        return self._get(recommend_all_coded, (
+            crop, sns_index, p_index, k_index, mg_index, straw_removed,
+            soil_type, expected_yield, ber, k_upper_half,
+        ), trusted)
+
+    def _get(self, func, args: tuple, trusted: bool):
+        # True == 1 and 2.0 == 2 as dict keys, but the engine rejects bool
+        # and float indices; send those straight through so they still raise.
+        if not (type(args[1]) is type(args[2]) is type(args[3]) is type(args[4]) is int):
+            return func(*args, trusted=trusted)
+
+        # Trusted results are keyed apart so that a caller breaking the
+        # trusted contract cannot hand a wrong result to a validating caller.
+        key = (func, trusted, *args)
+        entries = self._entries
+        rec = entries.get(key)
+        if rec is not None:
+            entries.move_to_end(key)
+            self._hits += 1
+            return _copy(rec)
+
+        self._misses += 1
+        rec = func(*args, trusted=trusted)
+        entries[key] = rec
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self._evictions += 1
+        return _copy(rec)
+
+    def stats(self) -> CacheStats:
+        """Return hit, miss and eviction counts and the current size."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset the counters."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
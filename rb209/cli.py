@@ -1,39 +1,12 @@
 """Command-line interface for RB209 fertiliser recommendations."""
 
 import argparse
+import contextlib
 import sys
+from functools import partial
 
 from rb209 import __version__
 from rb209.data.crops import CROP_INFO
-from rb209.data.organic import ORGANIC_MATERIAL_INFO
-from rb209.engine import (
-    calculate_grass_ley_sns,
-    calculate_lime,
-    calculate_organic,
-    calculate_smn_sns,
-    calculate_sns,
-    calculate_veg_sns,
-    nitrogen_timing,
-    recommend_all,
-    recommend_fruit_all,
-    recommend_fruit_nitrogen,
-    recommend_nitrogen,
-    recommend_phosphorus,
-    recommend_potassium,
-    recommend_sodium,
-    recommend_sulfur,
-    smn_to_sns_index_veg,
-)
-from rb209.formatters import (
-    format_crop_list,
-    format_lime,
-    format_material_list,
-    format_organic,
-    format_recommendation,
-    format_single_nutrient,
-    format_sns,
-    format_timing,
-)
 from rb209.models import (
     FruitSoilCategory,
     OrchardManagement,
@@ -54,19 +27,37 @@ def _material_choices() -> list[str]:
     return [m.value for m in OrganicMaterial]
 
 
+def _worker_count(value: str) -> int:
+    """Parse a --workers value; 0 means one worker per available CPU."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    if number == 0:
+        from rb209.parallel import default_workers
+        return default_workers()
+    return number
+
+
 def _add_format_arg(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--format",
-        choices=["table", "json"],
+        choices=["table", "json", "ndjson", "csv"],
         default="table",
         dest="output_format",
-        help="Output format (default: table)",
+        help="Output format; ndjson is compact single-line JSON, csv a header "
+             "and one row (default: table)",
     )
 
 
 # ── Subcommand handlers ────────────────────────────────────────────
 
 def _handle_recommend(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_all
+    from rb209.formatters import format_recommendation
+
     soil = getattr(args, "soil_type", None)
     expected_yield = getattr(args, "expected_yield", None)
     ber = getattr(args, "ber", None)
@@ -87,6 +78,9 @@ def _handle_recommend(args: argparse.Namespace) -> None:
 
 
 def _handle_nitrogen(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_nitrogen
+    from rb209.formatters import format_single_nutrient
+
     soil = getattr(args, "soil_type", None)
     expected_yield = getattr(args, "expected_yield", None)
     ber = getattr(args, "ber", None)
@@ -96,6 +90,9 @@ def _handle_nitrogen(args: argparse.Namespace) -> None:
 
 
 def _handle_phosphorus(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_phosphorus
+    from rb209.formatters import format_single_nutrient
+
     expected_yield = getattr(args, "expected_yield", None)
     value = recommend_phosphorus(args.crop, args.p_index, expected_yield=expected_yield)
     name = CROP_INFO[args.crop]["name"]
@@ -103,6 +100,9 @@ def _handle_phosphorus(args: argparse.Namespace) -> None:
 
 
 def _handle_potassium(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_potassium
+    from rb209.formatters import format_single_nutrient
+
     expected_yield = getattr(args, "expected_yield", None)
     value = recommend_potassium(args.crop, args.k_index, args.straw_removed, expected_yield=expected_yield)
     name = CROP_INFO[args.crop]["name"]
@@ -110,12 +110,18 @@ def _handle_potassium(args: argparse.Namespace) -> None:
 
 
 def _handle_sulfur(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_sulfur
+    from rb209.formatters import format_single_nutrient
+
     value = recommend_sulfur(args.crop)
     name = CROP_INFO[args.crop]["name"]
     print(format_single_nutrient(name, "Sulfur (SO3)", "kg/ha", value, args.output_format))
 
 
 def _handle_sodium(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_sodium
+    from rb209.formatters import format_single_nutrient
+
     k_index = getattr(args, "k_index", None)
     value = recommend_sodium(args.crop, k_index=k_index)
     name = CROP_INFO[args.crop]["name"]
@@ -123,6 +129,9 @@ def _handle_sodium(args: argparse.Namespace) -> None:
 
 
 def _handle_sns(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_sns
+    from rb209.formatters import format_sns
+
     grass_history = None
     ley_flags = (args.ley_age, args.ley_n_intensity, args.ley_management)
     if any(f is not None for f in ley_flags):
@@ -147,11 +156,17 @@ def _handle_sns(args: argparse.Namespace) -> None:
 
 
 def _handle_sns_smn(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_smn_sns
+    from rb209.formatters import format_sns
+
     result = calculate_smn_sns(args.smn, args.crop_n)
     print(format_sns(result, args.output_format))
 
 
 def _handle_sns_ley(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_grass_ley_sns
+    from rb209.formatters import format_sns
+
     result = calculate_grass_ley_sns(
         ley_age=args.ley_age,
         n_intensity=args.n_intensity,
@@ -164,6 +179,9 @@ def _handle_sns_ley(args: argparse.Namespace) -> None:
 
 
 def _handle_organic(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_organic
+    from rb209.formatters import format_organic
+
     result = calculate_organic(
         args.material,
         args.rate,
@@ -175,6 +193,9 @@ def _handle_organic(args: argparse.Namespace) -> None:
 
 
 def _handle_lime(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_lime
+    from rb209.formatters import format_lime
+
     target_ph = getattr(args, "target_ph", None)
     land_use = getattr(args, "land_use", None)
     crop = getattr(args, "crop", None)
@@ -189,17 +210,26 @@ def _handle_lime(args: argparse.Namespace) -> None:
 
 
 def _handle_timing(args: argparse.Namespace) -> None:
+    from rb209.engine import nitrogen_timing
+    from rb209.formatters import format_timing
+
     soil = getattr(args, "soil_type", None)
     result = nitrogen_timing(args.crop, args.total_n, soil_type=soil)
     print(format_timing(result, args.output_format))
 
 
 def _handle_veg_sns(args: argparse.Namespace) -> None:
+    from rb209.engine import calculate_veg_sns
+    from rb209.formatters import format_sns
+
     result = calculate_veg_sns(args.previous_crop, args.soil_type, args.rainfall)
     print(format_sns(result, args.output_format))
 
 
 def _handle_veg_smn(args: argparse.Namespace) -> None:
+    from rb209.engine import smn_to_sns_index_veg
+    from rb209.formatters import format_sns
+
     index = smn_to_sns_index_veg(args.smn, args.depth)
     # Build an SNSResult-like object for formatting
     from rb209.models import SNSResult
@@ -216,6 +246,9 @@ def _handle_veg_smn(args: argparse.Namespace) -> None:
 
 
 def _handle_fruit_recommend(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_fruit_all
+    from rb209.formatters import format_recommendation
+
     orchard_management = getattr(args, "orchard_management", None)
     sns_index = getattr(args, "sns_index", None)
     rec = recommend_fruit_all(
@@ -231,6 +264,9 @@ def _handle_fruit_recommend(args: argparse.Namespace) -> None:
 
 
 def _handle_fruit_nitrogen(args: argparse.Namespace) -> None:
+    from rb209.engine import recommend_fruit_nitrogen
+    from rb209.formatters import format_single_nutrient
+
     orchard_management = getattr(args, "orchard_management", None)
     sns_index = getattr(args, "sns_index", None)
     value = recommend_fruit_nitrogen(
@@ -243,7 +279,135 @@ def _handle_fruit_nitrogen(args: argparse.Namespace) -> None:
     print(format_single_nutrient(name, "Nitrogen (N)", "kg/ha", value, args.output_format))
 
 
+def _open_text(path: str, mode: str, default):
+    """Open *path* for text I/O, treating "-" as the given standard stream."""
+    if path == "-":
+        return contextlib.nullcontext(default)
+    return open(path, mode, encoding="utf-8", newline="" if "r" in mode else None)
+
+
+def _run_batch(
+    args: argparse.Namespace,
+    run_rows,
+    columns: tuple[str, ...] | None = None,
+    to_row=None,
+    writer=None,
+    header=None,
+) -> None:
+    """Stream ``args.input`` through *run_rows* and write the results.
+
+    Args:
+        args: Parsed ``--input``, ``--input-format``, ``--output`` and
+            ``--errors`` arguments.
+        run_rows: Called with the items from :func:`rb209.batch.iter_rows`;
+            returns ``(row_number, field_id, record, error)`` results.
+        columns: CSV columns for :func:`rb209.batch.write_results`, or
+            ``None`` for JSON Lines.
+        to_row: CSV cell function for ``write_results``; used only with
+            *columns*.
+        writer: Replaces ``write_results``; called as
+            ``writer(results, out, errors)`` and returns ``(n_ok, n_err)``.
+        header: Called with the output stream before any result is written.
+
+    Exits with status 1 after a summary line if any row failed.
+    """
+    from rb209.batch import detect_format, iter_rows, write_results
+
+    fmt = args.input_format or detect_format(args.input)
+    if writer is None:
+        writer = partial(write_results, columns=columns, to_row=to_row)
+    with _open_text(args.input, "r", sys.stdin) as src, \
+            _open_text(args.output, "w", sys.stdout) as out, \
+            _open_text(args.errors, "w", sys.stderr) as err:
+        if header is not None:
+            header(out)
+        n_ok, n_err = writer(run_rows(iter_rows(src, fmt)), out, err)
+    if n_err:
+        print(
+            f"Completed with errors: {n_ok} row(s) succeeded, {n_err} row(s) failed.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def _handle_batch_recommend(args: argparse.Namespace) -> None:
+    from rb209.batch import (
+        RECOMMEND_OUTPUT_COLUMNS,
+        recommend_rows,
+        write_note_catalogue,
+        write_report,
+    )
+
+    note_codes = args.notes == "codes"
+    if note_codes and args.output_format != "jsonl":
+        print("Error: --notes codes requires --output-format jsonl.", file=sys.stderr)
+        sys.exit(2)
+    _run_batch(
+        args,
+        partial(recommend_rows, workers=args.workers, note_codes=note_codes),
+        columns=RECOMMEND_OUTPUT_COLUMNS if args.output_format == "csv" else None,
+        writer=write_report if args.output_format == "report" else None,
+        header=write_note_catalogue if note_codes else None,
+    )
+
+
+def _handle_batch_timing(args: argparse.Namespace) -> None:
+    from rb209.batch import TIMING_OUTPUT_COLUMNS, timing_csv_row, timing_rows
+
+    _run_batch(
+        args,
+        partial(timing_rows, workers=args.workers),
+        columns=TIMING_OUTPUT_COLUMNS if args.output_format == "csv" else None,
+        to_row=timing_csv_row,
+    )
+
+
+def _handle_batch_organic(args: argparse.Namespace) -> None:
+    from rb209.batch import ORGANIC_OUTPUT_COLUMNS, organic_rows
+
+    _run_batch(
+        args,
+        partial(organic_rows, workers=args.workers),
+        columns=ORGANIC_OUTPUT_COLUMNS if args.output_format == "csv" else None,
+    )
+
+
+def _handle_smn_batch(args: argparse.Namespace) -> None:
+    from rb209.batch import SMN_OUTPUT_COLUMNS, smn_rows
+
+    _run_batch(
+        args,
+        partial(smn_rows, table=args.table, depth_cm=args.depth),
+        columns=SMN_OUTPUT_COLUMNS[args.table] if args.output_format == "csv" else None,
+    )
+
+
+def _handle_compile_cube(args: argparse.Namespace) -> None:
+    from rb209.cube import compile_cube
+
+    n_records = compile_cube(args.out, crops=args.crop)
+    print(f"Wrote {n_records} records to {args.out}", file=sys.stderr)
+
+
+def _handle_serve(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from rb209.server import serve_forever
+
+    if args.socket:
+        where = args.socket
+    else:
+        where = f"{args.host}:{args.port}"
+    print(f"rb209 serving JSON-RPC on {where}", file=sys.stderr)
+    try:
+        asyncio.run(serve_forever(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
 def _handle_list_crops(args: argparse.Namespace) -> None:
+    from rb209.formatters import format_crop_list
+
     crops = []
     for value, info in sorted(CROP_INFO.items()):
         if args.category and info["category"] != args.category:
@@ -257,6 +421,9 @@ def _handle_list_crops(args: argparse.Namespace) -> None:
 
 
 def _handle_list_materials(args: argparse.Namespace) -> None:
+    from rb209.data.organic import ORGANIC_MATERIAL_INFO
+    from rb209.formatters import format_material_list
+
     materials = []
     for value, info in ORGANIC_MATERIAL_INFO.items():
         materials.append({
@@ -658,6 +825,120 @@ def build_parser() -> argparse.ArgumentParser:
     _add_format_arg(p_fn)
     p_fn.set_defaults(func=_handle_fruit_nitrogen)
 
+    # ── batch-recommend ──────────────────────────────────────────
+    p_batch = subparsers.add_parser(
+        "batch-recommend",
+        help="Full recommendations for every field in a CSV or JSON Lines file",
+    )
+    p_batch.add_argument("--input", "-i", required=True,
+                          help="Input file of fields (.csv or .jsonl); '-' for stdin")
+    p_batch.add_argument("--input-format", choices=["csv", "jsonl"], default=None,
+                          help="Input format (default: from the file extension)")
+    p_batch.add_argument("--output", "-o", default="-",
+                          help="Output file (default: stdout)")
+    p_batch.add_argument("--output-format", choices=["jsonl", "csv", "report"],
+                          default="jsonl",
+                          help="Output format; report is one table with numbered "
+                               "notes (default: jsonl)")
+    p_batch.add_argument("--errors", default="-",
+                          help="JSON Lines file for rows that fail (default: stderr)")
+    p_batch.add_argument("--workers", "-w", type=_worker_count, default=1,
+                          metavar="N",
+                          help="Number of worker processes; 0 uses every CPU (default: 1)")
+    p_batch.add_argument("--notes", choices=["text", "codes"], default="text",
+                          help="Write notes as text, or as note codes after a "
+                               "catalogue line (default: text)")
+    p_batch.set_defaults(func=_handle_batch_recommend)
+
+    # ── batch-timing ─────────────────────────────────────────────
+    p_batch_tim = subparsers.add_parser(
+        "batch-timing",
+        help="Nitrogen split dressings for every field in a CSV or JSON Lines file",
+    )
+    p_batch_tim.add_argument("--input", "-i", required=True,
+                              help="Input file of fields (.csv or .jsonl); '-' for stdin")
+    p_batch_tim.add_argument("--input-format", choices=["csv", "jsonl"], default=None,
+                              help="Input format (default: from the file extension)")
+    p_batch_tim.add_argument("--output", "-o", default="-",
+                              help="Output file (default: stdout)")
+    p_batch_tim.add_argument("--output-format", choices=["jsonl", "csv"], default="jsonl",
+                              help="Output format; csv has one group of columns per "
+                                   "dressing, as timing --format csv (default: jsonl)")
+    p_batch_tim.add_argument("--errors", default="-",
+                              help="JSON Lines file for rows that fail (default: stderr)")
+    p_batch_tim.add_argument("--workers", "-w", type=_worker_count, default=1,
+                              metavar="N",
+                              help="Number of worker processes; 0 uses every CPU (default: 1)")
+    p_batch_tim.set_defaults(func=_handle_batch_timing)
+
+    # ── batch-organic ────────────────────────────────────────────
+    p_batch_org = subparsers.add_parser(
+        "batch-organic",
+        help="Nutrients from every organic material application in a CSV or JSON Lines file",
+    )
+    p_batch_org.add_argument("--input", "-i", required=True,
+                              help="Input file of applications (.csv or .jsonl); '-' for stdin")
+    p_batch_org.add_argument("--input-format", choices=["csv", "jsonl"], default=None,
+                              help="Input format (default: from the file extension)")
+    p_batch_org.add_argument("--output", "-o", default="-",
+                              help="Output file (default: stdout)")
+    p_batch_org.add_argument("--output-format", choices=["jsonl", "csv"], default="jsonl",
+                              help="Output format (default: jsonl)")
+    p_batch_org.add_argument("--errors", default="-",
+                              help="JSON Lines file for rows that fail (default: stderr)")
+    p_batch_org.add_argument("--workers", "-w", type=_worker_count, default=1,
+                              metavar="N",
+                              help="Number of worker processes; 0 uses every CPU (default: 1)")
+    p_batch_org.set_defaults(func=_handle_batch_organic)
+
+    # ── smn-batch ────────────────────────────────────────────────
+    p_smn_batch = subparsers.add_parser(
+        "smn-batch",
+        help="SNS indices for every SMN sample in a CSV or JSON Lines file",
+    )
+    p_smn_batch.add_argument("--input", "-i", required=True,
+                              help="Input file of samples (.csv or .jsonl); '-' for stdin")
+    p_smn_batch.add_argument("--input-format", choices=["csv", "jsonl"], default=None,
+                              help="Input format (default: from the file extension)")
+    p_smn_batch.add_argument("--output", "-o", default="-",
+                              help="Output file (default: stdout)")
+    p_smn_batch.add_argument("--output-format", choices=["jsonl", "csv"], default="jsonl",
+                              help="Output format (default: jsonl)")
+    p_smn_batch.add_argument("--errors", default="-",
+                              help="JSON Lines file for rows that fail (default: stderr)")
+    p_smn_batch.add_argument("--table", choices=["arable", "veg"], default="arable",
+                              help="arable: Table 4.10 on SMN + crop N; "
+                                   "veg: Table 6.6 (default: arable)")
+    p_smn_batch.add_argument("--depth", type=int, choices=[30, 60, 90], default=None,
+                              help="Sampling depth (cm) for veg rows without a "
+                                   "depth_cm column")
+    p_smn_batch.set_defaults(func=_handle_smn_batch)
+
+    # ── compile-cube ─────────────────────────────────────────────
+    p_cube = subparsers.add_parser(
+        "compile-cube",
+        help="Precompute every recommend combination into a binary cube file",
+    )
+    p_cube.add_argument("--out", "-o", required=True,
+                         help="Output cube file")
+    p_cube.add_argument("--crop", action="append", choices=_crop_choices(),
+                         help="Only include this crop (repeatable; default: all crops)")
+    p_cube.set_defaults(func=_handle_compile_cube)
+
+    # ── serve ────────────────────────────────────────────────────
+    p_serve = subparsers.add_parser(
+        "serve",
+        help="Answer newline-delimited JSON-RPC requests over a socket",
+    )
+    listen = p_serve.add_mutually_exclusive_group(required=True)
+    listen.add_argument("--socket", metavar="PATH",
+                        help="Listen on this Unix domain socket")
+    listen.add_argument("--port", type=int,
+                        help="Listen on this TCP port")
+    p_serve.add_argument("--host", default="127.0.0.1",
+                          help="Address to bind with --port (default: 127.0.0.1)")
+    p_serve.set_defaults(func=_handle_serve)
+
     # ── list-crops ───────────────────────────────────────────────
     p_lc = subparsers.add_parser("list-crops", help="List available crops")
     p_lc.add_argument("--category",
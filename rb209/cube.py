@@ -0,0 +1,249 @@
+"""Precomputed recommendation cube in a memory-mapped binary file.
+
+Without a yield or break-even ratio adjustment, ``recommend_all`` depends on
+a finite set of inputs: crop, SNS index (0-6), P, K and Mg index (each
+clamped to 0-4, with K Index 2 split into lower and upper halves), straw
+option and soil type.  :func:`compile_cube` evaluates every combination
+once and writes one fixed-width record per combination.
+:class:`RecommendationCube` maps the file read-only and answers each lookup
+with one offset calculation and one ``struct`` read, so any number of worker
+processes can share a single page-cached copy.
+
+File layout (little-endian)::
+
+    header    _HEADER: magic, format version, record size, dimension
+              sizes, data offset, metadata length
+    metadata  UTF-8 JSON: crop and soil order, field names, note flags,
+              rb209 version
+    padding   to a page boundary
+    records   _RECORD per combination, in C order over DIMENSIONS
+
+Record fields are ``uint16`` kg/ha values (``MISSING`` where the engine
+has no table entry) followed by a ``uint32`` :class:`~rb209.vector.NoteFlag`
+bit set.
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Iterable
+
+from rb209 import __version__
+from rb209.tables import CROP_ID, CROPS, SOIL_TYPES
+
+MAGIC = b"RB209CUB"
+FORMAT_VERSION = 1
+MISSING = 0xFFFF
+
+# Dimension names and sizes, outermost first.  The crop dimension is sized
+# from the crop list stored in the file.
+DIMENSIONS = ("crop", "sns_index", "p_index", "k_slot", "mg_index", "straw_removed", "soil_type")
+_N_SNS, _N_P, _N_K_SLOTS, _N_MG, _N_STRAW, _N_SOIL = 7, 5, 6, 5, 2, len(SOIL_TYPES)
+
+FIELDS = ("nitrogen", "phosphorus", "potassium", "magnesium", "sulfur", "sodium", "notes")
+
+_HEADER = struct.Struct("<8sHH7HII")
+_RECORD = struct.Struct("<6HI")
+_PAGE = mmap.ALLOCATIONGRANULARITY
+
+# Index 0-9 -> clamped 0-4, as the engine does.
+_CLAMP = (0, 1, 2, 3, 4, 4, 4, 4, 4, 4)
+# K index 0-9 -> slot 0-5; slot 3 is the upper half of K Index 2.
+_K_SLOT = (0, 1, 2, 4, 5, 5, 5, 5, 5, 5)
+
+
+def _grid() -> tuple[list, ...]:
+    """Return the per-crop input columns, in record order."""
+    sns, p, k, mg, straw, upper, soil = ([] for _ in range(7))
+    for s in range(_N_SNS):
+        for pi in range(_N_P):
+            for slot in range(_N_K_SLOTS):
+                ki = slot if slot < 3 else slot - 1
+                for m in range(_N_MG):
+                    for st in (False, True):
+                        for so in range(_N_SOIL):
+                            sns.append(s)
+                            p.append(pi)
+                            k.append(ki)
+                            mg.append(m)
+                            straw.append(st)
+                            upper.append(slot == 3)
+                            soil.append(so)
+    return sns, p, k, mg, straw, upper, soil
+
+
+def _metadata(crops: list[str]) -> bytes:
+    from rb209.vector import NoteFlag
+
+    return json.dumps({
+        "rb209_version": __version__,
+        "crops": crops,
+        "soil_types": list(SOIL_TYPES),
+        "fields": list(FIELDS),
+        "note_flags": {flag.name: flag.value for flag in NoteFlag},
+    }).encode()
+
+
+def compile_cube(path: str, crops: Iterable[str] | None = None) -> int:
+    """Evaluate every recommendation combination and write the cube to *path*.
+
+    Args:
+        path: Output file.
+        crops: Crops to include; default every crop.
+
+    Returns:
+        Number of records written.
+
+    Raises:
+        ValueError: If a crop is unknown.
+    """
+    from rb209.vector import recommend_all_array
+
+    crops = list(CROPS) if crops is None else sorted(set(crops))
+    for crop in crops:
+        if crop not in CROP_ID:
+            valid = ", ".join(CROPS)
+            raise ValueError(f"Unknown crop '{crop}'. Valid crops: {valid}")
+
+    meta = _metadata(crops)
+    data_offset = -(-(_HEADER.size + len(meta)) // _PAGE) * _PAGE
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, _RECORD.size,
+        len(crops), _N_SNS, _N_P, _N_K_SLOTS, _N_MG, _N_STRAW, _N_SOIL,
+        data_offset, len(meta),
+    )
+    sns, p, k, mg, straw, upper, soil = _grid()
+    soil = array("B", soil)
+    per_crop = len(sns)
+    pack_into = _RECORD.pack_into
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(b"\0" * (data_offset - len(header) - len(meta)))
+        chunk = bytearray(per_crop * _RECORD.size)
+        for crop in crops:
+            out = recommend_all_array(
+                array("H", [CROP_ID[crop]]) * per_crop, sns, p, k, mg, straw, soil,
+                k_upper_half=upper,
+            )
+            columns = [
+                [MISSING if v != v else int(v) for v in out[name]] for name in FIELDS[:-1]
+            ]
+            rows = zip(*columns, out["notes"])
+            for i, row in enumerate(rows):
+                pack_into(chunk, i * _RECORD.size, *row)
+            f.write(chunk)
+    return len(crops) * per_crop
+
+
+class RecommendationCube:
+    """Read-only, memory-mapped view of a file written by :func:`compile_cube`.
+
+    Args:
+        path: Cube file to open.
+
+    Raises:
+        ValueError: If the file is not a cube or has an unsupported format.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load_header()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _load_header(self) -> None:
+        mm = self._mm
+        if len(mm) < _HEADER.size:
+            raise ValueError("Not an RB209 cube file (too short)")
+        magic, version, record_size, *dims, data_offset, meta_len = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an RB209 cube file (bad magic)")
+        if version != FORMAT_VERSION or record_size != _RECORD.size:
+            raise ValueError(
+                f"Unsupported cube format {version} (record size {record_size}); "
+                f"recompile with 'rb209 compile-cube'"
+            )
+        if dims[1:] != [_N_SNS, _N_P, _N_K_SLOTS, _N_MG, _N_STRAW, _N_SOIL]:
+            raise ValueError(f"Unexpected cube dimensions {dims}")
+        meta = json.loads(mm[_HEADER.size:_HEADER.size + meta_len])
+        if len(mm) != data_offset + dims[0] * self._stride(0, dims) * record_size:
+            raise ValueError("Cube file size does not match its header")
+
+        self.rb209_version: str = meta["rb209_version"]
+        self.crops: tuple[str, ...] = tuple(meta["crops"])
+        self._crop_id = {crop: i for i, crop in enumerate(self.crops)}
+        self._soil_id = {soil: i for i, soil in enumerate(meta["soil_types"])}
+        self._data_offset = data_offset
+        self._strides = tuple(self._stride(i, dims) * record_size for i in range(len(dims)))
+
+    @staticmethod
+    def _stride(axis: int, dims: list[int]) -> int:
+        stride = 1
+        for size in dims[axis + 1:]:
+            stride *= size
+        return stride
+
+    def lookup(
+        self,
+        crop: str,
+        sns_index: int,
+        p_index: int,
+        k_index: int,
+        mg_index: int = 2,
+        straw_removed: bool = True,
+        soil_type: str | None = None,
+        k_upper_half: bool = False,
+    ) -> tuple[int, ...]:
+        """Return the precomputed record for one field.
+
+        Arguments match ``recommend_all`` without ``expected_yield`` and
+        ``ber``.
+
+        Returns:
+            ``(nitrogen, phosphorus, potassium, magnesium, sulfur, sodium,
+            notes)`` as integers, in the order of ``FIELDS``.  Nutrient
+            values are ``MISSING`` where the engine has no table entry;
+            ``notes`` is a :class:`~rb209.vector.NoteFlag` bit set.
+
+        Raises:
+            ValueError: If the crop, soil type or an index is invalid.
+        """
+        crop_id = self._crop_id.get(crop)
+        if crop_id is None:
+            valid = ", ".join(sorted(self._crop_id))
+            raise ValueError(f"Unknown crop '{crop}'. Valid crops: {valid}")
+        soil_id = self._soil_id.get(soil_type)
+        if soil_id is None:
+            valid = ", ".join(s for s in self._soil_id if s)
+            raise ValueError(f"Unknown soil type '{soil_type}'. Valid options: {valid}")
+        for name, value, max_val in (
+            ("SNS index", sns_index, 6), ("P index", p_index, 9),
+            ("K index", k_index, 9), ("Mg index", mg_index, 9),
+        ):
+            if type(value) is not int or not 0 <= value <= max_val:
+                raise ValueError(
+                    f"{name} must be an integer between 0 and {max_val}, got {value!r}"
+                )
+        k_slot = 3 if k_index == 2 and k_upper_half else _K_SLOT[k_index]
+        s = self._strides
+        offset = (
+            self._data_offset + crop_id * s[0] + sns_index * s[1] + _CLAMP[p_index] * s[2]
+            + k_slot * s[3] + _CLAMP[mg_index] * s[4] + bool(straw_removed) * s[5]
+            + soil_id * s[6]
+        )
+        return _RECORD.unpack_from(self._mm, offset)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+    def __enter__(self) -> "RecommendationCube":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,116 @@
+"""RB209 reference tables.
+
+Most commands need only one or two of these modules, so the engine binds
+them with :func:`lazy_import` and each table is executed the first time one
+of its attributes is read.
+
+Processes that fork workers after loading the tables (pre-fork servers,
+``ProcessPoolExecutor`` on Linux) can call :func:`freeze_tables` first, so
+the workers keep sharing the tables' memory pages with the parent.
+"""
+
+import gc
+import importlib
+import importlib.util
+import pkgutil
+import sys
+from types import MappingProxyType, ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module *name*, deferring its execution until first attribute access.
+
+    Once loaded the module is an ordinary module object, so later attribute
+    reads cost no more than a normal import.  Modules that are already
+    imported are returned as they are.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# ── Pre-fork freezing ───────────────────────────────────────────────
+
+def _frozen(value, memo: dict[int, tuple]):
+    """Return an immutable copy of a dict/list/set tree, or *value* itself.
+
+    *memo* maps ``id(original)`` to ``(original, copy)`` so shared
+    sub-tables stay shared (and the originals stay alive while it is used).
+    """
+    kind = type(value)
+    if kind is not dict and kind is not list and kind is not tuple and kind is not set:
+        return value
+    seen = memo.get(id(value))
+    if seen is not None:
+        return seen[1]
+    if kind is dict:
+        copy = MappingProxyType({key: _frozen(item, memo) for key, item in value.items()})
+    elif kind is set:
+        copy = frozenset(value)
+    else:
+        items = tuple(_frozen(item, memo) for item in value)
+        # Keep a tuple whose items were already immutable.
+        if kind is tuple and all(a is b for a, b in zip(items, value)):
+            copy = value
+        else:
+            copy = items
+    memo[id(value)] = (value, copy)
+    return copy
+
+
+def freeze_tables(collect: bool = True) -> int:
+    """Load every table and convert it to immutable containers; opt-in.
+
+    Every public table in the ``rb209.data`` modules (module-level
+    ``UPPER_CASE`` dicts, lists and sets, and everything nested in them)
+    is replaced by a copy built from ``MappingProxyType``, tuples and
+    frozensets.  Loaded ``rb209`` modules that bound a table by name are
+    rebound to the copy.  With *collect*, the garbage collector then runs
+    once and :func:`gc.freeze` moves every surviving object into the
+    permanent generation, so collections in a forked worker never touch
+    the parent's objects.
+
+    Call it once in the parent, after everything else is imported and
+    before forking.  Freezing cannot be undone: code that mutates a table
+    raises ``TypeError`` afterwards, and ``json`` can no longer serialise
+    a table directly.  Most of the memory saving comes from
+    :func:`gc.freeze`, since reading a table still updates reference counts.
+
+    Returns:
+        Number of top-level tables converted.
+    """
+    for info in pkgutil.iter_modules(__path__):
+        vars(importlib.import_module(f"{__name__}.{info.name}"))
+
+    memo: dict[int, tuple] = {}
+    n_tables = 0
+    for name, module in list(sys.modules.items()):
+        if not name.startswith(f"{__name__}.") or type(module) is not ModuleType:
+            continue
+        for attr, value in list(vars(module).items()):
+            if attr.isupper() and not attr.startswith("_") and type(value) in (dict, list, set):
+                setattr(module, attr, _frozen(value, memo))
+                n_tables += 1
+
+    # Rebind names imported with "from rb209.data.x import TABLE".  Modules
+    # still waiting on lazy_import are skipped: they import the copies.
+    for name, module in list(sys.modules.items()):
+        if (name != "rb209" and not name.startswith("rb209.")) or type(module) is not ModuleType:
+            continue
+        namespace = vars(module)
+        for attr, value in list(namespace.items()):
+            seen = memo.get(id(value))
+            if seen is not None and seen[0] is value:
+                namespace[attr] = seen[1]
+
+    if collect:
+        gc.collect()
+        gc.freeze()
+    return n_tables
@@ -37,3 +37,10 @@ CROP_BER_GROUP: dict[str, str] = {
     "winter-barley": "barley",
     "spring-barley": "barley",
 }
+
+# BER_ADJUSTMENTS compiled per group into parallel sorted tuples of
+# (breakpoints, adjustments) for bisect lookup.
+BER_BREAKPOINTS: dict[str, tuple[tuple[float, ...], tuple[float, ...]]] = {
+    group: tuple(zip(*sorted((b, adj) for (g, b), adj in BER_ADJUSTMENTS.items() if g == group)))
+    for group in sorted({g for g, _ in BER_ADJUSTMENTS})
+}
@@ -341,3 +341,68 @@ FRUIT_HOPS_PKM: dict[tuple[str, int], float] = {
     ("magnesium", 4):   0,
     ("magnesium", 5):   0,
 }
+
+
+# ── Compiled per-crop resolver ──────────────────────────────────────
+# The tables above compiled once at import so the engine resolves a crop
+# with one dict lookup instead of probing the slug groups in turn.
+#
+# FRUIT_RESOLVER[crop] = (kind, nitrogen, pkm) where kind picks the rule
+# for nitrogen:
+#   "preplant":   no nitrogen; *nitrogen* is None.
+#   "top":        nitrogen[(soil_category, orchard_management)] (Table 7.4).
+#   "strawberry": nitrogen[soil_category][min(sns_index, 5)] (Table 7.8),
+#                 with clay already mapped to other-mineral.
+#   "hops":       nitrogen[soil_category] (Table 7.17); no light-sand entry.
+#   "soft":       nitrogen[soil_category] (Table 7.6).
+# pkm is (phosphate, potash, magnesium), each a tuple indexed by soil index
+# 0-9 with the table's top index ("4 and over" or "5 and over") repeated.
+
+FRUIT_PREPLANT, FRUIT_TOP, FRUIT_STRAWBERRY, FRUIT_HOPS, FRUIT_SOFT = (
+    "preplant", "top", "strawberry", "hops", "soft",
+)
+_NUTRIENTS = ("phosphate", "potash", "magnesium")
+
+
+def _pkm_rows(lookup, max_index: int) -> tuple[tuple[float, ...], ...]:
+    return tuple(
+        tuple(lookup(nutrient, min(index, max_index)) for index in range(10))
+        for nutrient in _NUTRIENTS
+    )
+
+
+def _compile() -> dict[str, tuple[str, object, tuple]]:
+    resolver = {}
+    for crop, group in (("fruit-preplant", "fruit-vines"), ("hops-preplant", "hops")):
+        resolver[crop] = (FRUIT_PREPLANT, None, _pkm_rows(
+            lambda nutrient, i, group=group: FRUIT_PREPLANT_PKM[(group, nutrient, i)], 5,
+        ))
+
+    top_pkm = _pkm_rows(lambda nutrient, i: FRUIT_TOP_PKM[(nutrient, i)], 4)
+    for (crop, soil, management), n in FRUIT_TOP_NITROGEN.items():
+        resolver.setdefault(crop, (FRUIT_TOP, {}, top_pkm))[1][(soil, management)] = n
+
+    strawberry_pkm = _pkm_rows(lambda nutrient, i: FRUIT_STRAWBERRY_PKM[(nutrient, i)], 4)
+    for crop in dict.fromkeys(key[0] for key in FRUIT_STRAWBERRY_NITROGEN):
+        by_soil = {
+            soil: tuple(FRUIT_STRAWBERRY_NITROGEN[(crop, soil, sns)] for sns in range(6))
+            for soil in ("light-sand", "deep-silt", "other-mineral")
+        }
+        by_soil["clay"] = by_soil["other-mineral"]
+        resolver[crop] = (FRUIT_STRAWBERRY, by_soil, strawberry_pkm)
+
+    resolver["fruit-hops"] = (
+        FRUIT_HOPS, dict(FRUIT_HOPS_NITROGEN),
+        _pkm_rows(lambda nutrient, i: FRUIT_HOPS_PKM[(nutrient, i)], 5),
+    )
+
+    for crop in _ALL_SOFT_SLUGS:
+        resolver[crop] = (
+            FRUIT_SOFT,
+            {soil: n for (slug, soil), n in FRUIT_SOFT_NITROGEN.items() if slug == crop},
+            _pkm_rows(lambda nutrient, i, crop=crop: FRUIT_SOFT_PKM[(crop, nutrient, i)], 4),
+        )
+    return resolver
+
+
+FRUIT_RESOLVER: dict[str, tuple[str, object, tuple]] = _compile()
@@ -291,3 +291,36 @@ ORGANIC_MATERIAL_INFO: dict[str, dict] = {
         "so3": 4.0,
     },
 }
+
+# ── Compiled available-N grid ───────────────────────────────────────
+#
+# AVAILABLE_N_GRID[material] holds kg available N per tonne or m3 for
+# every (timing slot, soil category, incorporated) combination, at
+# [(timing_slot * 2 + soil_category) * 2 + incorporated]:
+#   timing slot 0:   no timing given, the flat available_n coefficient
+#                    (the same for every soil category and incorporation)
+#   timing slot 1-4: ORGANIC_TIMINGS, the factor times total_n
+#   soil category:   position in TIMING_SOIL_CATEGORIES
+# NaN marks combinations with no factor (summer incorporation, and any
+# timing for materials without a timing table).  Multiplying by the rate
+# gives the same float as factor * total_n * rate evaluated left to right.
+
+ORGANIC_TIMINGS: tuple[str, ...] = ("autumn", "winter", "spring", "summer")
+TIMING_SOIL_CATEGORIES: tuple[str, ...] = ("sandy", "medium_heavy")
+
+
+def _available_n_slots(material: str, info: dict) -> tuple[float, ...]:
+    factors = ORGANIC_N_TIMING_FACTORS.get(material, {})
+    slots = [info["available_n"]] * 4
+    for timing in ORGANIC_TIMINGS:
+        for soil_cat in TIMING_SOIL_CATEGORIES:
+            for incorporated in (False, True):
+                factor = factors.get((timing, soil_cat, incorporated))
+                slots.append(float("nan") if factor is None else factor * info["total_n"])
+    return tuple(slots)
+
+
+AVAILABLE_N_GRID: dict[str, tuple[float, ...]] = {
+    material: _available_n_slots(material, info)
+    for material, info in ORGANIC_MATERIAL_INFO.items()
+}
@@ -107,6 +107,60 @@ GRASS_LEY_SNS_LOOKUP: dict[tuple[str, str], tuple[int, int, int]] = {
     ("heavy-medium-high", "high-n-grazed-35yr"):     (4, 3, 2),
 }
 
+# Table 4.6 ley row for every (ley_age, n_intensity, management).
+GRASS_LEY_ROW: dict[tuple[str, str, str], str] = {
+    ("1-2yr", "low",  "cut"):               "low-n-or-cut",
+    ("1-2yr", "low",  "grazed"):            "low-n-or-cut",
+    ("1-2yr", "low",  "1-cut-then-grazed"): "low-n-or-cut",
+    ("1-2yr", "high", "cut"):               "low-n-or-cut",
+    ("1-2yr", "high", "grazed"):            "high-n-grazed-or-mixed",
+    ("1-2yr", "high", "1-cut-then-grazed"): "low-n-or-cut",
+    ("3-5yr", "low",  "cut"):               "low-n-or-cut",
+    ("3-5yr", "low",  "grazed"):            "high-n-grazed-or-mixed",
+    ("3-5yr", "low",  "1-cut-then-grazed"): "low-n-or-cut",
+    ("3-5yr", "high", "cut"):               "low-n-or-cut",
+    ("3-5yr", "high", "grazed"):            "high-n-grazed-35yr",
+    ("3-5yr", "high", "1-cut-then-grazed"): "high-n-grazed-or-mixed",
+}
+
+# Table 4.6 fully enumerated into one flat table of SNS indices.  Each input
+# is coded by its position in these tuples; years 1-3 are coded 0-2.
+LEY_AGES: tuple[str, ...] = ("1-2yr", "3-5yr")
+LEY_N_INTENSITIES: tuple[str, ...] = ("low", "high")
+LEY_MANAGEMENTS: tuple[str, ...] = ("cut", "grazed", "1-cut-then-grazed")
+LEY_SOILS: tuple[str, ...] = ("light", "medium", "heavy")  # organic is not covered
+LEY_RAINFALL: tuple[str, ...] = ("low", "medium", "high")
+
+LEY_AGE_ID = {v: i for i, v in enumerate(LEY_AGES)}
+LEY_N_INTENSITY_ID = {v: i for i, v in enumerate(LEY_N_INTENSITIES)}
+LEY_MANAGEMENT_ID = {v: i for i, v in enumerate(LEY_MANAGEMENTS)}
+LEY_SOIL_ID = {v: i for i, v in enumerate(LEY_SOILS)}
+LEY_RAINFALL_ID = {v: i for i, v in enumerate(LEY_RAINFALL)}
+
+
+def grass_ley_offset(
+    age: int, intensity: int, management: int, soil: int, rainfall: int, year: int,
+) -> int:
+    """Return the position in GRASS_LEY_SNS of the given codes (*year* is 1-3)."""
+    return ((((age * 2 + intensity) * 3 + management) * 3 + soil) * 3 + rainfall) * 3 + year - 1
+
+
+def _ley_soil_category(soil: str, rainfall: str) -> str:
+    if soil == "heavy":
+        return "heavy-low" if rainfall == "low" else "heavy-medium-high"
+    return soil
+
+
+GRASS_LEY_SNS: bytes = bytes(
+    GRASS_LEY_SNS_LOOKUP[(_ley_soil_category(soil, rain), GRASS_LEY_ROW[(age, intensity, management)])][year]
+    for age in LEY_AGES
+    for intensity in LEY_N_INTENSITIES
+    for management in LEY_MANAGEMENTS
+    for soil in LEY_SOILS
+    for rain in LEY_RAINFALL
+    for year in range(3)
+)
+
 # Table 4.10: SNS value (kg N/ha) to SNS index.
 # Each tuple is (upper_bound_inclusive, sns_index).
 # Evaluated in order; first match wins.
@@ -120,6 +174,10 @@ SNS_VALUE_TO_INDEX: list[tuple[float, int]] = [
     (float("inf"), 6),
 ]
 
+# Table 4.10 compiled for binary search: the index of a value is
+# bisect_left(SNS_VALUE_BOUNDS, value), the number of bounds below it.
+SNS_VALUE_BOUNDS: tuple[float, ...] = tuple(bound for bound, _ in SNS_VALUE_TO_INDEX[:-1])
+
 # ── Vegetable SNS Tables (Section 6) ────────────────────────────────
 
 # Tables 6.2–6.4: Vegetable SNS lookup.
@@ -285,3 +343,9 @@ VEG_SMN_SNS_THRESHOLDS: dict[int, list[tuple[float, int]]] = {
     60: [(39.9, 0), (53, 1), (67, 2), (80, 3), (107, 4), (160, 5)], # >160 -> 6
     90: [(59.9, 0), (80, 1), (100, 2), (120, 3), (160, 4), (240, 5)], # >240 -> 6
 }
+
+# Table 6.6 compiled for binary search, as SNS_VALUE_BOUNDS.
+VEG_SMN_BOUNDS: dict[int, tuple[float, ...]] = {
+    depth: tuple(bound for bound, _ in thresholds)
+    for depth, thresholds in VEG_SMN_SNS_THRESHOLDS.items()
+}
@@ -21,6 +21,9 @@ SODIUM_RECOMMENDATIONS: dict[tuple[str, int], float] = {
     ("sugar-beet", 4): 0,
 }
 
+# Crops whose sodium recommendation depends on K Index.
+SODIUM_K_INDEX_CROPS: frozenset[str] = frozenset(crop for crop, _ in SODIUM_RECOMMENDATIONS)
+
 # ── Asparagus — Section 6 ────────────────────────────────────────────
 # Asparagus can respond to applied sodium.  Apply up to 500 kg Na₂O/ha
 # per year at the end of June, but not in the establishment year.
@@ -6,17 +6,22 @@ rule dicts. Rules are evaluated in order; the first matching rule is used.
 Rule dict keys:
   "min_n":          Minimum total N for this rule to apply (inclusive, default 0).
   "max_n":          Maximum total N for this rule to apply (inclusive, default inf).
-  "soil_condition": Optional callable(soil_type: str | None) -> bool. When
-                    present, the rule only matches if the callable returns True.
+  "soil_types":     Optional tuple of soil type strings. When present, the
+                    rule only matches those soils (never an unspecified soil).
   "splits":         list of {"fraction": float, "timing": str} dicts.
                     fraction is the share of total_n for this dressing.
                     All fractions in a rule should sum to 1.0.
   "notes":          list[str] of additional advisory notes for this rule.
 
+The rules are plain data.  TIMING_INDEX, built from them at import, gives
+the matching rule for any total N with one bisect per lookup.
+
 Source: RB209 9th edition — S3 pp.14-15 (grassland), S4 pp.26-31 (arable),
 S5 p.23 (potatoes).
 """
 
+from rb209.models import SoilType
+
 NITROGEN_TIMING_RULES: dict[str, list[dict]] = {}
 
 # ── Winter Wheat (feed) — RB209 S4 pp.26-27 ─────────────────────────────────
@@ -177,7 +182,7 @@ NITROGEN_TIMING_RULES["winter-rye"] = [
 
 NITROGEN_TIMING_RULES["potatoes-maincrop"] = [
     {
-        "soil_condition": lambda s: s == "light",
+        "soil_types": ("light",),
         "splits": [
             {"fraction": 2 / 3, "timing": "Seedbed (before planting)"},
             {"fraction": 1 / 3, "timing": "Post-emergence (when shoots emerge)"},
@@ -199,7 +204,7 @@ NITROGEN_TIMING_RULES["potatoes-maincrop"] = [
 
 NITROGEN_TIMING_RULES["potatoes-early"] = [
     {
-        "soil_condition": lambda s: s == "light",
+        "soil_types": ("light",),
         "splits": [
             {"fraction": 2 / 3, "timing": "Seedbed (before planting)"},
             {"fraction": 1 / 3, "timing": "Post-emergence (when shoots emerge)"},
@@ -220,7 +225,7 @@ NITROGEN_TIMING_RULES["potatoes-early"] = [
 
 NITROGEN_TIMING_RULES["potatoes-seed"] = [
     {
-        "soil_condition": lambda s: s == "light",
+        "soil_types": ("light",),
         "splits": [
             {"fraction": 2 / 3, "timing": "Seedbed (before planting)"},
             {"fraction": 1 / 3, "timing": "Post-emergence (when shoots emerge)"},
@@ -608,3 +613,45 @@ for _crop in ["veg-peas-market", "veg-beans-broad"]:
             "notes": [],
         },
     ]
+
+
+# ── Compiled index ──────────────────────────────────────────────────────────
+#
+# TIMING_INDEX[(crop, soil_type)] = (points, rules).  ``points`` holds every
+# min_n/max_n threshold of the crop's rules, plus 0, in ascending order.
+# They cut the N axis into regions that alternate between the open interval
+# below each point and the point itself:
+#
+#     region 2j      points[j-1] < total_n < points[j]
+#     region 2j + 1  total_n == points[j]
+#
+# with region 2 * len(points) above the last point.  ``rules[region]`` is the
+# position of the first matching rule, or None where no rule matches.
+
+def _first_match(rules: list[dict], total_n: float, soil_type: str | None) -> int | None:
+    for i, rule in enumerate(rules):
+        if total_n < rule.get("min_n", 0) or total_n > rule.get("max_n", float("inf")):
+            continue
+        soil_types = rule.get("soil_types")
+        if soil_types is not None and soil_type not in soil_types:
+            continue
+        return i
+    return None
+
+
+def _compile(rules: list[dict], soil_type: str | None) -> tuple[tuple, tuple]:
+    points = tuple(sorted(
+        {0} | {rule[key] for rule in rules for key in ("min_n", "max_n") if key in rule}
+    ))
+    samples = [points[0] - 1]
+    for lo, hi in zip(points, points[1:]):
+        samples += [lo, (lo + hi) / 2]
+    samples += [points[-1], points[-1] + 1]
+    return points, tuple(_first_match(rules, n, soil_type) for n in samples)
+
+
+TIMING_INDEX: dict[tuple[str, str | None], tuple[tuple, tuple]] = {
+    (crop, soil): _compile(rules, soil)
+    for crop, rules in NITROGEN_TIMING_RULES.items()
+    for soil in (None, *(s.value for s in SoilType))
+}
@@ -1,6 +1,10 @@
 """Recommendation engine — core logic for RB209 fertiliser calculations."""
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping
+
 from rb209.models import (
+    CodedRecommendation,
     FruitSoilCategory,
     LimeRecommendation,
     NResidueCategory,
@@ -18,58 +22,23 @@ from rb209.models import (
     VegPreviousCrop,
     VegSoilType,
 )
+from rb209.data import lazy_import
 from rb209.data.crops import CROP_INFO
-from rb209.data.lime import LIME_FACTORS, MAX_SINGLE_APPLICATION, MIN_PH_FOR_LIMING, TARGET_PH
-from rb209.data.magnesium import MAGNESIUM_RECOMMENDATIONS, VEG_MAGNESIUM_RECOMMENDATIONS
-from rb209.data.nitrogen import (
-    NITROGEN_RECOMMENDATIONS,
-    NITROGEN_SOIL_SPECIFIC,
-    NITROGEN_VEG_RECOMMENDATIONS,
-    NVZ_NMAX,
-)
-from rb209.data.organic import (
-    ORGANIC_MATERIAL_INFO,
-    ORGANIC_N_TIMING_FACTORS,
-    TIMING_SOIL_CATEGORY,
-)
-from rb209.data.phosphorus import PHOSPHORUS_RECOMMENDATIONS, PHOSPHORUS_VEG_RECOMMENDATIONS
-from rb209.data.potassium import (
-    POTASSIUM_RECOMMENDATIONS,
-    POTASSIUM_STRAW_INCORPORATED,
-    POTASSIUM_STRAW_REMOVED,
-    POTASSIUM_VEG_RECOMMENDATIONS,
-    POTASSIUM_VEG_K2_UPPER,
-)
-from rb209.data.sns import (
-    GRASS_LEY_SNS_LOOKUP,
-    SNS_LOOKUP,
-    SNS_VALUE_TO_INDEX,
-    VEG_SNS_LOOKUP,
-    VEG_SMN_SNS_THRESHOLDS,
-    VEG_SNS_ORGANIC_ADVISORY,
-)
-from rb209.data.sodium import (
-    SODIUM_FLAT_RATES,
-    SODIUM_GRASSLAND_CROPS,
-    SODIUM_GRASSLAND_RATE,
-    SODIUM_NOTES,
-    SODIUM_RECOMMENDATIONS,
-)
-from rb209.data.fruit import (
-    FRUIT_PREPLANT_PKM,
-    FRUIT_TOP_NITROGEN,
-    FRUIT_TOP_PKM,
-    FRUIT_SOFT_NITROGEN,
-    FRUIT_SOFT_PKM,
-    FRUIT_STRAWBERRY_NITROGEN,
-    FRUIT_STRAWBERRY_PKM,
-    FRUIT_HOPS_NITROGEN,
-    FRUIT_HOPS_PKM,
-)
-from rb209.data.sulfur import SULFUR_RECOMMENDATIONS
-from rb209.data.timing import NITROGEN_TIMING_RULES
-from rb209.data.ber import BER_ADJUSTMENTS, CROP_BER_GROUP
-from rb209.data.yield_adjustments import YIELD_ADJUSTMENTS
+from rb209 import notes as _notes
+
+# Table modules are executed on first use (see rb209.data.lazy_import).
+_ber = lazy_import("rb209.data.ber")
+_fruit = lazy_import("rb209.data.fruit")
+_lime = lazy_import("rb209.data.lime")
+_magnesium = lazy_import("rb209.data.magnesium")
+_nitrogen = lazy_import("rb209.data.nitrogen")
+_organic = lazy_import("rb209.data.organic")
+_sns = lazy_import("rb209.data.sns")
+_sodium = lazy_import("rb209.data.sodium")
+_sulfur = lazy_import("rb209.data.sulfur")
+_tables = lazy_import("rb209.tables")
+_timing = lazy_import("rb209.data.timing")
+_yield = lazy_import("rb209.data.yield_adjustments")
 
 
 def _validate_crop(crop: str) -> None:
@@ -92,12 +61,18 @@ def _clamp_index(value: int, max_key: int) -> int:
 
 # ── SNS ─────────────────────────────────────────────────────────────
 
+# Previous crop slug -> N residue category slug.
+_N_CATEGORY_BY_PREVIOUS_CROP = {
+    prev.value: n_cat.value for prev, n_cat in PREVIOUS_CROP_N_CATEGORY.items()
+}
+
 def calculate_sns(
     previous_crop: str,
     soil_type: str,
     rainfall: str,
     *,
     grass_history: dict | None = None,
+    trusted: bool = False,
 ) -> SNSResult:
     """Calculate Soil Nitrogen Supply index using the field assessment method.
 
@@ -116,38 +91,40 @@ def calculate_sns(
             ``n_intensity`` ("low" / "high"), ``management`` ("cut" /
             "grazed" / "1-cut-then-grazed"), and optionally ``year``
             (1/2/3, default 2).
+        trusted: Skip validating *previous_crop*, *soil_type* and
+            *rainfall*.  Only for arguments that have already passed
+            :func:`rb209.validation.sns_errors`.
 
     Returns:
         SNSResult with the calculated SNS index.  When grass_history is used,
         method is "combined" and notes describe both assessments.
     """
-    # Validate enums
-    try:
-        prev = PreviousCrop(previous_crop)
-    except ValueError:
-        valid = ", ".join(p.value for p in PreviousCrop)
-        raise ValueError(
-            f"Unknown previous crop '{previous_crop}'. Valid options: {valid}"
-        )
-    try:
-        SoilType(soil_type)
-    except ValueError:
-        valid = ", ".join(s.value for s in SoilType)
-        raise ValueError(f"Unknown soil type '{soil_type}'. Valid options: {valid}")
-    try:
-        Rainfall(rainfall)
-    except ValueError:
-        valid = ", ".join(r.value for r in Rainfall)
-        raise ValueError(
-            f"Unknown rainfall category '{rainfall}'. Valid options: {valid}"
-        )
+    if not trusted:
+        try:
+            PreviousCrop(previous_crop)
+        except ValueError:
+            valid = ", ".join(p.value for p in PreviousCrop)
+            raise ValueError(
+                f"Unknown previous crop '{previous_crop}'. Valid options: {valid}"
+            )
+        try:
+            SoilType(soil_type)
+        except ValueError:
+            valid = ", ".join(s.value for s in SoilType)
+            raise ValueError(f"Unknown soil type '{soil_type}'. Valid options: {valid}")
+        try:
+            Rainfall(rainfall)
+        except ValueError:
+            valid = ", ".join(r.value for r in Rainfall)
+            raise ValueError(
+                f"Unknown rainfall category '{rainfall}'. Valid options: {valid}"
+            )
 
-    n_cat = PREVIOUS_CROP_N_CATEGORY[prev]
-    key = (n_cat.value, soil_type, rainfall)
-    sns_index = SNS_LOOKUP[key]
+    n_cat = _N_CATEGORY_BY_PREVIOUS_CROP[previous_crop]
+    sns_index = _sns.SNS_LOOKUP[(n_cat, soil_type, rainfall)]
 
     field_notes = [
-        f"Previous crop '{previous_crop}' has {n_cat.value} N residue.",
+        f"Previous crop '{previous_crop}' has {n_cat} N residue.",
     ]
 
     if grass_history is not None:
@@ -196,10 +173,9 @@ def sns_value_to_index(sns_value: float) -> int:
     """
     if sns_value < 0:
         raise ValueError(f"SNS value must be non-negative, got {sns_value}")
-    for upper_bound, index in SNS_VALUE_TO_INDEX:
-        if sns_value <= upper_bound:
-            return index
-    return 6
+    if sns_value != sns_value:
+        return 6  # NaN: as the former linear scan over Table 4.10
+    return bisect_left(_sns.SNS_VALUE_BOUNDS, sns_value)
 
 
 def calculate_smn_sns(smn: float, crop_n: float) -> SNSResult:
@@ -307,28 +283,12 @@ def calculate_grass_ley_sns(
     if year not in (1, 2, 3):
         raise ValueError(f"year must be 1, 2, or 3, got {year}")
 
-    # Map soil_type + rainfall to Table 4.6 soil category
-    if soil_type == "light":
-        soil_cat = "light"
-    elif soil_type == "medium":
-        soil_cat = "medium"
-    else:  # heavy
-        soil_cat = "heavy-low" if rainfall == "low" else "heavy-medium-high"
-
-    # Determine Table 4.6 ley management row
-    if ley_age == "3-5yr" and n_intensity == "high" and management == "grazed":
-        ley_row = "high-n-grazed-35yr"
-    elif (
-        (n_intensity == "high" and management == "grazed")
-        or (ley_age == "3-5yr" and n_intensity == "low" and management == "grazed")
-        or (ley_age == "3-5yr" and n_intensity == "high" and management == "1-cut-then-grazed")
-    ):
-        ley_row = "high-n-grazed-or-mixed"
-    else:
-        ley_row = "low-n-or-cut"
-
-    year1, year2, year3 = GRASS_LEY_SNS_LOOKUP[(soil_cat, ley_row)]
-    sns_index = (year1, year2, year3)[year - 1]
+    # Table 4.6 is enumerated in full in rb209.data.sns.
+    sns_index = _sns.GRASS_LEY_SNS[_sns.grass_ley_offset(
+        _sns.LEY_AGE_ID[ley_age], _sns.LEY_N_INTENSITY_ID[n_intensity],
+        _sns.LEY_MANAGEMENT_ID[management], _sns.LEY_SOIL_ID[soil_type],
+        _sns.LEY_RAINFALL_ID[rainfall], year,
+    )]
 
     notes = [
         f"Table 4.6: {ley_age} ley, {n_intensity} N, {management} management, "
@@ -390,8 +350,8 @@ def calculate_veg_sns(
     # Advisory-only soil types — Tables 6.2–6.4 give only a range for these
     # soils because their high N mineralisation potential cannot be
     # characterised by previous crop and rainfall alone.
-    if soil_type in VEG_SNS_ORGANIC_ADVISORY:
-        min_idx, rep_idx, max_idx = VEG_SNS_ORGANIC_ADVISORY[soil_type]
+    if soil_type in _sns.VEG_SNS_ORGANIC_ADVISORY:
+        min_idx, rep_idx, max_idx = _sns.VEG_SNS_ORGANIC_ADVISORY[soil_type]
         soil_label = "organic" if soil_type == "organic" else "peat"
         notes.append(
             f"RB209 Tables 6.2–6.4 do not provide a crop- or rainfall-specific "
@@ -417,12 +377,12 @@ def calculate_veg_sns(
         )
 
     key = (previous_crop, soil_type, rainfall)
-    if key not in VEG_SNS_LOOKUP:
+    if key not in _sns.VEG_SNS_LOOKUP:
         raise ValueError(
             f"No vegetable SNS data for previous_crop='{previous_crop}', "
             f"soil_type='{soil_type}', rainfall='{rainfall}'."
         )
-    sns_index = VEG_SNS_LOOKUP[key]
+    sns_index = _sns.VEG_SNS_LOOKUP[key]
 
     notes.append(
         f"Previous crop '{previous_crop}' on {soil_type} soil with {rainfall} rainfall "
@@ -457,14 +417,14 @@ def smn_to_sns_index_veg(smn: float, depth_cm: int) -> int:
     """
     if smn < 0:
         raise ValueError(f"SMN must be non-negative, got {smn}")
-    if depth_cm not in VEG_SMN_SNS_THRESHOLDS:
+    bounds = _sns.VEG_SMN_BOUNDS.get(depth_cm)
+    if bounds is None:
         raise ValueError(
             f"depth_cm must be 30, 60, or 90, got {depth_cm}"
         )
-    for upper_bound, index in VEG_SMN_SNS_THRESHOLDS[depth_cm]:
-        if smn <= upper_bound:
-            return index
-    return 6
+    if smn != smn:
+        return 6  # NaN: as the former linear scan over Table 6.6
+    return bisect_left(bounds, smn)
 
 
 def combine_sns(*results: SNSResult) -> SNSResult:
@@ -494,28 +454,24 @@ def _interpolate_ber(group: str, ber: float) -> float:
 
     Extrapolates (clamped) at the table boundaries.
     """
-    # Collect all BER values for this group, sorted.
-    points = sorted(
-        (b, adj) for (g, b), adj in BER_ADJUSTMENTS.items() if g == group
-    )
-    if not points:
+    points = _ber.BER_BREAKPOINTS.get(group)
+    if points is None:
         return 0.0
+    bers, adjs = points
 
     # Clamp to table boundaries.
-    if ber <= points[0][0]:
-        return points[0][1]
-    if ber >= points[-1][0]:
-        return points[-1][1]
-
-    # Find the two surrounding points and interpolate.
-    for i in range(len(points) - 1):
-        b_lo, adj_lo = points[i]
-        b_hi, adj_hi = points[i + 1]
-        if b_lo <= ber <= b_hi:
-            frac = (ber - b_lo) / (b_hi - b_lo)
-            return adj_lo + frac * (adj_hi - adj_lo)
+    if ber <= bers[0]:
+        return adjs[0]
+    if ber >= bers[-1]:
+        return adjs[-1]
+    if ber != ber:
+        return 0.0  # NaN
 
-    return 0.0  # pragma: no cover
+    # Interpolate between the two surrounding breakpoints.
+    i = bisect_right(bers, ber)
+    b_lo, b_hi = bers[i - 1], bers[i]
+    adj_lo, adj_hi = adjs[i - 1], adjs[i]
+    return adj_lo + (ber - b_lo) / (b_hi - b_lo) * (adj_hi - adj_lo)
 
 
 # ── Nitrogen ────────────────────────────────────────────────────────
@@ -545,49 +501,45 @@ def recommend_nitrogen(
     _validate_crop(crop)
     _validate_index("SNS index", sns_index, 0, 6)
 
-    if soil_type is not None:
-        try:
-            SoilType(soil_type)
-        except ValueError:
+    if soil_type is None:
+        soil_id = 0
+    else:
+        soil_id = _tables.SOIL_ID.get(soil_type)
+        if soil_id is None:
             valid = ", ".join(s.value for s in SoilType)
             raise ValueError(
                 f"Unknown soil type '{soil_type}'. Valid options: {valid}"
             )
-        soil_key = (crop, sns_index, soil_type)
-        if soil_key in NITROGEN_SOIL_SPECIFIC:
-            base = NITROGEN_SOIL_SPECIFIC[soil_key]
-        else:
-            # No soil-specific table for this crop; fall back to generic or veg table.
-            key = (crop, sns_index)
-            if key in NITROGEN_RECOMMENDATIONS:
-                base = NITROGEN_RECOMMENDATIONS[key]
-            elif key in NITROGEN_VEG_RECOMMENDATIONS:
-                base = NITROGEN_VEG_RECOMMENDATIONS[key]
-            else:
-                raise ValueError(f"No nitrogen data for crop '{crop}' at SNS {sns_index}")
-    else:
-        key = (crop, sns_index)
-        if key in NITROGEN_RECOMMENDATIONS:
-            base = NITROGEN_RECOMMENDATIONS[key]
-        elif key in NITROGEN_VEG_RECOMMENDATIONS:
-            base = NITROGEN_VEG_RECOMMENDATIONS[key]
-        else:
-            raise ValueError(f"No nitrogen data for crop '{crop}' at SNS {sns_index}")
+    return _nitrogen_value(crop, sns_index, soil_id, expected_yield, ber)
+
+
+def _nitrogen_value(
+    crop: str,
+    sns_index: int,
+    soil_id: int,
+    expected_yield: float | None,
+    ber: float | None,
+) -> float:
+    """:func:`recommend_nitrogen` for arguments that are already validated."""
+    # Soil-specific → generic → vegetable fallback is resolved in rb209.tables.
+    base = _tables.NITROGEN[_tables.nitrogen_offset(_tables.CROP_ID[crop], sns_index, soil_id)]
+    if base is None:
+        raise ValueError(f"No nitrogen data for crop '{crop}' at SNS {sns_index}")
 
     if expected_yield is not None:
-        if crop not in YIELD_ADJUSTMENTS:
-            valid = ", ".join(sorted(YIELD_ADJUSTMENTS))
+        if crop not in _yield.YIELD_ADJUSTMENTS:
+            valid = ", ".join(sorted(_yield.YIELD_ADJUSTMENTS))
             raise ValueError(
                 f"No yield adjustment data for crop '{crop}'. "
                 f"Supported crops: {valid}"
             )
-        adj = YIELD_ADJUSTMENTS[crop]
+        adj = _yield.YIELD_ADJUSTMENTS[crop]
         capped_yield = min(expected_yield, adj["max_yield"]) if "max_yield" in adj else expected_yield
         delta = (capped_yield - adj["baseline_yield"]) * adj["n_adjust_per_t"]
         base = max(0.0, base + delta)
 
     if ber is not None:
-        group = CROP_BER_GROUP.get(crop)
+        group = _ber.CROP_BER_GROUP.get(crop)
         if group is not None:
             ber_adj = _interpolate_ber(group, ber)
             base = max(0.0, base + ber_adj)
@@ -613,24 +565,24 @@ def recommend_phosphorus(
     """
     _validate_crop(crop)
     _validate_index("P index", p_index, 0, 9)
+    return _phosphorus_value(crop, p_index, expected_yield)
 
+
+def _phosphorus_value(crop: str, p_index: int, expected_yield: float | None) -> float:
+    """:func:`recommend_phosphorus` for arguments that are already validated."""
     clamped = _clamp_index(p_index, 4)
-    key = (crop, clamped)
-    if key in PHOSPHORUS_RECOMMENDATIONS:
-        base = PHOSPHORUS_RECOMMENDATIONS[key]
-    elif key in PHOSPHORUS_VEG_RECOMMENDATIONS:
-        base = PHOSPHORUS_VEG_RECOMMENDATIONS[key]
-    else:
+    base = _tables.PHOSPHORUS[_tables.phosphorus_offset(_tables.CROP_ID[crop], clamped)]
+    if base is None:
         raise ValueError(f"No phosphorus data for crop '{crop}'")
 
     if expected_yield is not None:
-        if crop not in YIELD_ADJUSTMENTS:
-            valid = ", ".join(sorted(YIELD_ADJUSTMENTS))
+        if crop not in _yield.YIELD_ADJUSTMENTS:
+            valid = ", ".join(sorted(_yield.YIELD_ADJUSTMENTS))
             raise ValueError(
                 f"No yield adjustment data for crop '{crop}'. "
                 f"Supported crops: {valid}"
             )
-        adj = YIELD_ADJUSTMENTS[crop]
+        adj = _yield.YIELD_ADJUSTMENTS[crop]
         capped_yield = min(expected_yield, adj["max_yield"]) if "max_yield" in adj else expected_yield
         delta = (capped_yield - adj["baseline_yield"]) * adj["p_adjust_per_t"]
         base = max(0.0, base + delta)
@@ -661,37 +613,35 @@ def recommend_potassium(
     """
     _validate_crop(crop)
     _validate_index("K index", k_index, 0, 9)
+    return _potassium_value(crop, k_index, straw_removed, expected_yield, k_upper_half)
+
 
+def _potassium_value(
+    crop: str,
+    k_index: int,
+    straw_removed: bool,
+    expected_yield: float | None,
+    k_upper_half: bool,
+) -> float:
+    """:func:`recommend_potassium` for arguments that are already validated."""
     clamped = _clamp_index(k_index, 4)
-    key = (crop, clamped)
-
-    # K Index 2 upper-half (2+) override for vegetable crops
-    if clamped == 2 and k_upper_half and crop in POTASSIUM_VEG_K2_UPPER:
-        base = POTASSIUM_VEG_K2_UPPER[crop]
-    # Check if this is a cereal with straw option
-    elif CROP_INFO[crop].get("has_straw_option"):
-        table = POTASSIUM_STRAW_REMOVED if straw_removed else POTASSIUM_STRAW_INCORPORATED
-        if key in table:
-            base = table[key]
-        elif key in POTASSIUM_RECOMMENDATIONS:
-            base = POTASSIUM_RECOMMENDATIONS[key]
-        else:
-            raise ValueError(f"No potassium data for crop '{crop}'")
-    elif key in POTASSIUM_RECOMMENDATIONS:
-        base = POTASSIUM_RECOMMENDATIONS[key]
-    elif key in POTASSIUM_VEG_RECOMMENDATIONS:
-        base = POTASSIUM_VEG_RECOMMENDATIONS[key]
-    else:
+    # Straw option, K Index 2+ override and vegetable fallback are resolved
+    # in rb209.tables.
+    offset = _tables.potassium_offset(
+        _tables.CROP_ID[crop], clamped, bool(straw_removed), bool(k_upper_half),
+    )
+    base = _tables.POTASSIUM[offset]
+    if base is None:
         raise ValueError(f"No potassium data for crop '{crop}'")
 
     if expected_yield is not None:
-        if crop not in YIELD_ADJUSTMENTS:
-            valid = ", ".join(sorted(YIELD_ADJUSTMENTS))
+        if crop not in _yield.YIELD_ADJUSTMENTS:
+            valid = ", ".join(sorted(_yield.YIELD_ADJUSTMENTS))
             raise ValueError(
                 f"No yield adjustment data for crop '{crop}'. "
                 f"Supported crops: {valid}"
             )
-        adj = YIELD_ADJUSTMENTS[crop]
+        adj = _yield.YIELD_ADJUSTMENTS[crop]
         capped_yield = min(expected_yield, adj["max_yield"]) if "max_yield" in adj else expected_yield
         delta = (capped_yield - adj["baseline_yield"]) * adj["k_adjust_per_t"]
         base = max(0.0, base + delta)
@@ -711,10 +661,15 @@ def recommend_magnesium(mg_index: int, crop: str | None = None) -> float:
             instead of the arable rates (90/60).
     """
     _validate_index("Mg index", mg_index, 0, 9)
+    return _magnesium_value(mg_index, crop)
+
+
+def _magnesium_value(mg_index: int, crop: str | None) -> float:
+    """:func:`recommend_magnesium` for arguments that are already validated."""
     clamped = _clamp_index(mg_index, 4)
     if crop and CROP_INFO.get(crop, {}).get("category") == "vegetables":
-        return VEG_MAGNESIUM_RECOMMENDATIONS[clamped]
-    return MAGNESIUM_RECOMMENDATIONS[clamped]
+        return _magnesium.VEG_MAGNESIUM_RECOMMENDATIONS[clamped]
+    return _magnesium.MAGNESIUM_RECOMMENDATIONS[clamped]
 
 
 # ── Sulfur ──────────────────────────────────────────────────────────
@@ -726,9 +681,14 @@ def recommend_sulfur(crop: str) -> float:
         crop: Crop value string.
     """
     _validate_crop(crop)
-    if crop not in SULFUR_RECOMMENDATIONS:
+    return _sulfur_value(crop)
+
+
+def _sulfur_value(crop: str) -> float:
+    """:func:`recommend_sulfur` for a crop that is already validated."""
+    if crop not in _sulfur.SULFUR_RECOMMENDATIONS:
         raise ValueError(f"No sulfur data for crop '{crop}'")
-    return SULFUR_RECOMMENDATIONS[crop]
+    return _sulfur.SULFUR_RECOMMENDATIONS[crop]
 
 
 # ── Sodium ─────────────────────────────────────────────────────────
@@ -752,288 +712,294 @@ def recommend_sodium(crop: str, k_index: int | None = None) -> float:
         Sodium recommendation in kg Na₂O/ha.
     """
     _validate_crop(crop)
-
-    # Sugar beet: index-dependent recommendation
-    if crop in {c for (c, _) in SODIUM_RECOMMENDATIONS}:
+    if crop in _sodium.SODIUM_K_INDEX_CROPS:
         if k_index is None:
             raise ValueError(
                 f"k_index is required for sodium recommendation for '{crop}'"
             )
         _validate_index("K index", k_index, 0, 9)
+    return _sodium_value(crop, k_index)
+
+
+def _sodium_value(crop: str, k_index: int | None) -> float:
+    """:func:`recommend_sodium` for arguments that are already validated."""
+    # Sugar beet: index-dependent recommendation
+    if crop in _sodium.SODIUM_K_INDEX_CROPS:
         clamped = _clamp_index(k_index, 4)
         key = (crop, clamped)
-        return SODIUM_RECOMMENDATIONS.get(key, 0.0)
+        return _sodium.SODIUM_RECOMMENDATIONS.get(key, 0.0)
 
     # Asparagus (subsequent years): flat rate
-    if crop in SODIUM_FLAT_RATES:
-        return SODIUM_FLAT_RATES[crop]
+    if crop in _sodium.SODIUM_FLAT_RATES:
+        return _sodium.SODIUM_FLAT_RATES[crop]
 
     # Grassland: flat rate for herbage mineral balance
-    if crop in SODIUM_GRASSLAND_CROPS:
-        return SODIUM_GRASSLAND_RATE
+    if crop in _sodium.SODIUM_GRASSLAND_CROPS:
+        return _sodium.SODIUM_GRASSLAND_RATE
 
     return 0.0
 
 
 # ── Full recommendation ────────────────────────────────────────────
 
-def recommend_all(
+_N_FIXING_CROPS = frozenset({"peas", "field-beans", "veg-peas-market", "veg-beans-broad"})
+_VEG_SEEDBED_CAP_CROPS = frozenset({
+    "veg-beans-dwarf", "veg-radish", "veg-sweetcorn", "veg-beetroot",
+    "veg-swedes", "veg-turnips-parsnips", "veg-carrots", "veg-coriander",
+})
+_TISSUE_NITRATE_CROPS = frozenset({"veg-lettuce-whole", "veg-lettuce-baby", "veg-rocket"})
+
+
+def _recommend_all(
     crop: str,
     sns_index: int,
     p_index: int,
     k_index: int,
-    mg_index: int = 2,
-    straw_removed: bool = True,
-    soil_type: str | None = None,
-    expected_yield: float | None = None,
-    ber: float | None = None,
-    k_upper_half: bool = False,
-) -> NutrientRecommendation:
-    """Return a full nutrient recommendation for a crop.
-
-    Args:
-        crop: Crop value string.
-        sns_index: Soil Nitrogen Supply index (0-6).
-        p_index: Soil P index (0-9).
-        k_index: Soil K index (0-9).
-        mg_index: Soil Mg index (0-9). Defaults to 2 (target).
-        straw_removed: For cereals — True if straw removed.
-        soil_type: Optional soil type for soil-specific N recommendations.
-        expected_yield: Optional expected yield in t/ha for yield-adjusted
-            recommendations.
-        ber: Optional break-even ratio for cereal N adjustment.
-        k_upper_half: For vegetable crops at K Index 2 — True if soil K is in
-            the upper half (181–240 mg/l, i.e. 2+), False for 2- (121–180 mg/l).
-    """
-    _validate_crop(crop)
-
-    n = recommend_nitrogen(crop, sns_index, soil_type, expected_yield=expected_yield, ber=ber)
-    p = recommend_phosphorus(crop, p_index, expected_yield=expected_yield)
-    k = recommend_potassium(crop, k_index, straw_removed, expected_yield=expected_yield, k_upper_half=k_upper_half)
-    mg = recommend_magnesium(mg_index, crop=crop)
-    s = recommend_sulfur(crop)
-    na = recommend_sodium(crop, k_index=k_index)
+    mg_index: int,
+    straw_removed: bool,
+    soil_type: str | None,
+    expected_yield: float | None,
+    ber: float | None,
+    k_upper_half: bool,
+    trusted: bool,
+) -> tuple:
+    """Return ``(crop name, n, p, k, mg, s, na, notes)`` with notes as ``(code, params)``."""
+    if trusted:
+        soil_id = 0 if soil_type is None else _tables.SOIL_ID[soil_type]
+        n = _nitrogen_value(crop, sns_index, soil_id, expected_yield, ber)
+        p = _phosphorus_value(crop, p_index, expected_yield)
+        k = _potassium_value(crop, k_index, straw_removed, expected_yield, k_upper_half)
+        mg = _magnesium_value(mg_index, crop)
+        s = _sulfur_value(crop)
+        na = _sodium_value(crop, k_index)
+    else:
+        _validate_crop(crop)
+        n = recommend_nitrogen(crop, sns_index, soil_type, expected_yield=expected_yield, ber=ber)
+        p = recommend_phosphorus(crop, p_index, expected_yield=expected_yield)
+        k = recommend_potassium(crop, k_index, straw_removed, expected_yield=expected_yield, k_upper_half=k_upper_half)
+        mg = recommend_magnesium(mg_index, crop=crop)
+        s = recommend_sulfur(crop)
+        na = recommend_sodium(crop, k_index=k_index)
 
-    notes: list[str] = []
     info = CROP_INFO[crop]
+    notes: list[tuple[int, tuple]] = []
 
     if info.get("has_straw_option"):
-        mode = "removed" if straw_removed else "incorporated"
-        notes.append(f"K recommendation assumes straw {mode}.")
+        notes.append((_notes.STRAW_REMOVED if straw_removed else _notes.STRAW_INCORPORATED, ()))
 
     if info.get("notes"):
-        notes.append(info["notes"])
+        notes.append((_notes.CROP_NOTE, (crop,)))
 
-    if n == 0 and crop in ("peas", "field-beans", "veg-peas-market", "veg-beans-broad"):
-        notes.append("N-fixing crop: no fertiliser nitrogen required.")
+    if n == 0 and crop in _N_FIXING_CROPS:
+        notes.append((_notes.N_FIXING, ()))
 
     # Vegetable-specific advisory notes
-    _VEG_SEEDBED_CAP_CROPS = {
-        "veg-beans-dwarf", "veg-radish", "veg-sweetcorn", "veg-beetroot",
-        "veg-swedes", "veg-turnips-parsnips", "veg-carrots", "veg-coriander",
-    }
     if crop in _VEG_SEEDBED_CAP_CROPS and n > 0:
-        notes.append(
-            "Apply no more than 100 kg N/ha in the seedbed. "
-            "Apply remainder after establishment."
-        )
+        notes.append((_notes.VEG_SEEDBED_CAP, ()))
 
     if crop == "veg-asparagus":
-        notes.append(
-            "Year 2: apply 120 kg N/ha by end-Feb/early-Mar. "
-            "Year 3+: rate depends on winter rainfall (40–80 kg N/ha); seek FACTS advice."
-        )
+        notes.append((_notes.ASPARAGUS, ()))
 
     if crop == "veg-celery-seedbed":
-        notes.append(
-            "Apply 75–150 kg N/ha top dressing 4–6 weeks after planting."
-        )
+        notes.append((_notes.CELERY_TOP_DRESSING, ()))
 
-    if crop in ("veg-lettuce-whole", "veg-lettuce-baby", "veg-rocket"):
-        notes.append(
-            "Reduce N for late-season crops to comply with EU/UK tissue-nitrate limits."
-        )
+    if crop in _TISSUE_NITRATE_CROPS:
+        notes.append((_notes.TISSUE_NITRATE, ()))
 
     if crop == "veg-leeks":
-        notes.append(
-            "Do not apply fertiliser N during the NVZ closed period "
-            "without written FACTS Qualified Adviser recommendation."
-        )
+        notes.append((_notes.LEEKS_CLOSED_PERIOD, ()))
 
     if info["category"] == "vegetables" and k_index == 2:
-        notes.append(
-            "K Index 2 is split into 2- (121–180 mg/l) and 2+ (181–240 mg/l). "
-            "Use --k-upper-half flag if soil K is in the upper half."
-        )
+        notes.append((_notes.VEG_K_INDEX_2, ()))
 
     # 1.1 NVZ N-max warning
-    if crop in NVZ_NMAX and n > NVZ_NMAX[crop]:
-        limit = NVZ_NMAX[crop]
-        notes.append(
-            f"N recommendation ({n:.0f} kg/ha) exceeds the NVZ N-max limit "
-            f"({limit:.0f} kg/ha) for this crop type. "
-            "The N-max applies as a whole-farm average."
-        )
+    if crop in _nitrogen.NVZ_NMAX and n > _nitrogen.NVZ_NMAX[crop]:
+        notes.append((_notes.NVZ_NMAX, (n, _nitrogen.NVZ_NMAX[crop])))
 
     # 1.2 Potash split warning for potatoes
     if crop.startswith("potatoes-") and k > 300:
-        notes.append(
-            f"K2O recommendation ({k:.0f} kg/ha) exceeds 300 kg/ha. "
-            "Apply half in late autumn/winter and half in spring."
-        )
+        notes.append((_notes.POTATO_POTASH_SPLIT, (k,)))
 
     # 1.3 Potash split warning for grass silage
     if crop == "grass-silage" and k > 90:
-        notes.append(
-            "Limit spring K2O application for 1st cut to 80-90 kg/ha "
-            "to minimise luxury uptake. Apply balance in previous autumn."
-        )
+        notes.append((_notes.SILAGE_POTASH_LIMIT, ()))
 
     # 1.6 Hypomagnesaemia warning for grassland at Mg Index 0
     if info["category"] == "grassland" and mg_index == 0 and k > 0:
-        notes.append(
-            "Mg Index 0 on grassland: risk of hypomagnesaemia (grass staggers). "
-            "Avoid applying potash in spring. Apply 50-100 kg MgO/ha every 3-4 years."
-        )
+        notes.append((_notes.HYPOMAGNESAEMIA, ()))
 
     # 1.7 Clover N-fixation inhibition warning
     if info.get("clover_risk") and n > 0:
-        notes.append(
-            "Mineral N inhibits clover N fixation. If the sward contains "
-            "significant clover, reduce or omit N applications."
-        )
+        notes.append((_notes.CLOVER, ()))
 
     # 1.9 Seedbed N+K2O combine-drill limit for light soils
     if soil_type == "light" and (n + k) > 150 and info["category"] == "arable":
-        notes.append(
-            f"On sandy soils, do not combine-drill more than 150 kg/ha of N + K2O "
-            f"(current total: {n + k:.0f} kg/ha). Risk of seedling damage."
-        )
+        notes.append((_notes.COMBINE_DRILL_LIMIT, (n + k,)))
 
     # 3.2 Yield adjustment note
-    if expected_yield is not None and crop in YIELD_ADJUSTMENTS:
-        adj = YIELD_ADJUSTMENTS[crop]
+    if expected_yield is not None and crop in _yield.YIELD_ADJUSTMENTS:
+        adj = _yield.YIELD_ADJUSTMENTS[crop]
         capped_yield = min(expected_yield, adj["max_yield"]) if "max_yield" in adj else expected_yield
-        notes.append(
-            f"Recommendations adjusted for expected yield of {capped_yield:.1f} t/ha "
-            f"(baseline: {adj['baseline_yield']:.1f} t/ha)."
-        )
+        notes.append((_notes.YIELD_ADJUSTED, (capped_yield, adj["baseline_yield"])))
 
     # 4.2 BER adjustment note
-    if ber is not None and crop in CROP_BER_GROUP:
-        ber_adj = _interpolate_ber(CROP_BER_GROUP[crop], ber)
-        notes.append(
-            f"N adjusted for break-even ratio {ber:.1f} "
-            f"({ber_adj:+.0f} kg/ha from default BER 5.0)."
-        )
+    if ber is not None and crop in _ber.CROP_BER_GROUP:
+        ber_adj = _interpolate_ber(_ber.CROP_BER_GROUP[crop], ber)
+        notes.append((_notes.BER_ADJUSTED, (ber, ber_adj)))
 
     # 2.6 Timing hint — direct users to the timing subcommand
-    if n > 0 and crop in NITROGEN_TIMING_RULES:
-        notes.append(
-            f"Run 'rb209 timing --crop {crop} --total-n {n:.0f}' for "
-            "N application timing guidance."
-        )
+    if n > 0 and crop in _timing.NITROGEN_TIMING_RULES:
+        notes.append((_notes.TIMING_HINT, (crop, n)))
 
     # Sodium advisory notes
-    if na > 0 and crop in SODIUM_NOTES:
-        notes.extend(SODIUM_NOTES[crop])
-    elif na > 0 and info["category"] == "grassland" and "grassland" in SODIUM_NOTES:
-        notes.extend(SODIUM_NOTES["grassland"])
-    elif na == 0 and crop in SODIUM_NOTES:
+    sodium_key = None
+    if na > 0 and crop in _sodium.SODIUM_NOTES:
+        sodium_key = crop
+    elif na > 0 and info["category"] == "grassland" and "grassland" in _sodium.SODIUM_NOTES:
+        sodium_key = "grassland"
+    elif na == 0 and crop in _sodium.SODIUM_NOTES:
         # Advisory-only crops (e.g. asparagus establishment, celery)
-        notes.extend(SODIUM_NOTES[crop])
+        sodium_key = crop
+    if sodium_key is not None:
+        for line in range(len(_sodium.SODIUM_NOTES[sodium_key])):
+            notes.append((_notes.SODIUM, (sodium_key, line)))
 
+    return info["name"], n, p, k, mg, s, na, notes
+
+
+def recommend_all_coded(
+    crop: str,
+    sns_index: int,
+    p_index: int,
+    k_index: int,
+    mg_index: int = 2,
+    straw_removed: bool = True,
+    soil_type: str | None = None,
+    expected_yield: float | None = None,
+    ber: float | None = None,
+    k_upper_half: bool = False,
+    *,
+    trusted: bool = False,
+) -> CodedRecommendation:
+    """Return a full nutrient recommendation with notes as ``(code, params)``.
+
+    Takes the same arguments as :func:`recommend_all`.  Rendering note text
+    is left to the caller (see :mod:`rb209.notes`), which saves building
+    strings that are identical across many results.
+    """
+    return CodedRecommendation(*_recommend_all(
+        crop, sns_index, p_index, k_index, mg_index, straw_removed,
+        soil_type, expected_yield, ber, k_upper_half, trusted,
+    ))
+
+
+def recommend_all(
+    crop: str,
+    sns_index: int,
+    p_index: int,
+    k_index: int,
+    mg_index: int = 2,
+    straw_removed: bool = True,
+    soil_type: str | None = None,
+    expected_yield: float | None = None,
+    ber: float | None = None,
+    k_upper_half: bool = False,
+    *,
+    trusted: bool = False,
+) -> NutrientRecommendation:
+    """Return a full nutrient recommendation for a crop.
+
+    Args:
+        crop: Crop value string.
+        sns_index: Soil Nitrogen Supply index (0-6).
+        p_index: Soil P index (0-9).
+        k_index: Soil K index (0-9).
+        mg_index: Soil Mg index (0-9). Defaults to 2 (target).
+        straw_removed: For cereals — True if straw removed.
+        soil_type: Optional soil type for soil-specific N recommendations.
+        expected_yield: Optional expected yield in t/ha for yield-adjusted
+            recommendations.
+        ber: Optional break-even ratio for cereal N adjustment.
+        k_upper_half: For vegetable crops at K Index 2 — True if soil K is in
+            the upper half (181–240 mg/l, i.e. 2+), False for 2- (121–180 mg/l).
+        trusted: Skip argument validation.  Only for arguments that have
+            already passed :func:`rb209.validation.recommend_errors`; invalid
+            arguments may then give a wrong result instead of ``ValueError``.
+    """
+    name, n, p, k, mg, s, na, notes = _recommend_all(
+        crop, sns_index, p_index, k_index, mg_index, straw_removed,
+        soil_type, expected_yield, ber, k_upper_half, trusted,
+    )
+    texts = list(map(_notes.rendered_texts().get, notes))
+    if None in texts:
+        texts = [_notes.render(*note) for note in notes]
     return NutrientRecommendation(
-        crop=info["name"],
+        crop=name,
         nitrogen=n,
         phosphorus=p,
         potassium=k,
         magnesium=mg,
         sulfur=s,
         sodium=na,
-        notes=notes,
+        notes=texts,
     )
 
 
 # ── Fruit, Vines and Hops (Section 7) ─────────────────────────────
+#
+# Each fruit crop resolves to a compiled (kind, nitrogen, pkm) entry in
+# rb209.data.fruit.FRUIT_RESOLVER; see that module for the layout.
 
-_TOP_FRUIT_SLUGS = frozenset({
-    "fruit-dessert-apple", "fruit-culinary-apple",
-    "fruit-pear", "fruit-cherry", "fruit-plum",
-})
-_STRAWBERRY_SLUGS = frozenset({"fruit-strawberry-main", "fruit-strawberry-ever"})
-_SOFT_FRUIT_SLUGS = frozenset({
-    "fruit-blackcurrant", "fruit-redcurrant", "fruit-gooseberry",
-    "fruit-raspberry", "fruit-loganberry", "fruit-tayberry",
-    "fruit-blackberry", "fruit-vine",
-})
-_PREPLANT_SLUGS = frozenset({"fruit-preplant", "hops-preplant"})
-
-
-def _is_fruit_crop(crop: str) -> bool:
-    return CROP_INFO.get(crop, {}).get("category") == "fruit"
+_FRUIT_SOIL_CATEGORIES = frozenset(c.value for c in FruitSoilCategory)
+_ORCHARD_MANAGEMENTS = frozenset(m.value for m in OrchardManagement)
+_SOP_CROPS = frozenset({"fruit-redcurrant", "fruit-gooseberry", "fruit-raspberry"})
 
 
-def recommend_fruit_nitrogen(
-    crop: str,
-    soil_category: str,
-    orchard_management: str | None = None,
-    sns_index: int | None = None,
-) -> float:
-    """Return kg N/ha for a fruit, vine or hop crop.
-
-    Args:
-        crop: A fruit crop slug (category == "fruit").
-        soil_category: FruitSoilCategory value.
-        orchard_management: OrchardManagement value; required for top fruit only.
-        sns_index: SNS index 0–5; required for strawberry crops only.
-
-    Returns:
-        Nitrogen recommendation in kg N/ha.
-
-    Raises:
-        ValueError: If crop is unknown, parameters are missing/invalid, or no
-                    table entry exists for the given combination.
-    """
-    if crop not in CROP_INFO:
-        raise ValueError(f"Unknown crop '{crop}'.")
-    if not _is_fruit_crop(crop):
+def _fruit_entry(crop: str) -> tuple:
+    entry = _fruit.FRUIT_RESOLVER.get(crop)
+    if entry is None:
+        if crop not in CROP_INFO:
+            raise ValueError(f"Unknown crop '{crop}'.")
         raise ValueError(f"Crop '{crop}' is not a fruit category crop.")
+    return entry
 
-    try:
-        FruitSoilCategory(soil_category)
-    except ValueError:
+
+def _validate_fruit_soil(soil_category: str) -> None:
+    if soil_category not in _FRUIT_SOIL_CATEGORIES:
         valid = ", ".join(c.value for c in FruitSoilCategory)
         raise ValueError(
             f"Unknown soil category '{soil_category}'. Valid options: {valid}"
         )
 
-    if crop in _PREPLANT_SLUGS:
+
+def _fruit_nitrogen(
+    entry: tuple,
+    crop: str,
+    soil_category: str,
+    orchard_management: str | None,
+    sns_index: int | None,
+) -> float:
+    """Nitrogen for a resolved crop and an already validated soil category."""
+    kind, table, _ = entry
+
+    if kind == _fruit.FRUIT_PREPLANT:
         return 0.0
 
-    if crop in _TOP_FRUIT_SLUGS:
+    if kind == _fruit.FRUIT_TOP:
         if orchard_management is None:
             raise ValueError(
                 f"orchard_management is required for top fruit crop '{crop}'. "
                 "Use 'grass-strip' or 'overall-grass'."
             )
-        try:
-            OrchardManagement(orchard_management)
-        except ValueError:
+        if orchard_management not in _ORCHARD_MANAGEMENTS:
             valid = ", ".join(m.value for m in OrchardManagement)
             raise ValueError(
                 f"Unknown orchard management '{orchard_management}'. "
                 f"Valid options: {valid}"
             )
-        key = (crop, soil_category, orchard_management)
-        if key not in FRUIT_TOP_NITROGEN:
-            raise ValueError(
-                f"No nitrogen data for top fruit combination: "
-                f"crop={crop}, soil={soil_category}, management={orchard_management}"
-            )
-        return FRUIT_TOP_NITROGEN[key]
+        return table[(soil_category, orchard_management)]
 
-    if crop in _STRAWBERRY_SLUGS:
+    if kind == _fruit.FRUIT_STRAWBERRY:
         if sns_index is None:
             raise ValueError(
                 f"sns_index is required for strawberry crop '{crop}'."
@@ -1042,39 +1008,48 @@ def recommend_fruit_nitrogen(
             raise ValueError(
                 f"sns_index must be a non-negative integer, got {sns_index!r}"
             )
-        # Map clay → other-mineral for Table 7.8
-        mapped_soil = "other-mineral" if soil_category == "clay" else soil_category
-        clamped_sns = min(sns_index, 5)
-        key = (crop, mapped_soil, clamped_sns)
-        if key not in FRUIT_STRAWBERRY_NITROGEN:
-            raise ValueError(
-                f"No nitrogen data for strawberry combination: "
-                f"crop={crop}, soil={mapped_soil}, sns_index={clamped_sns}"
-            )
-        return FRUIT_STRAWBERRY_NITROGEN[key]
+        # Clay is compiled to the other-mineral row of Table 7.8.
+        return table[soil_category][min(sns_index, 5)]
 
-    if crop == "fruit-hops":
-        if soil_category == "light-sand":
-            raise ValueError(
-                "Hops nitrogen is not given for light sand soils in Table 7.17. "
-                "Seek specialist advice."
-            )
-        if soil_category not in FRUIT_HOPS_NITROGEN:
-            raise ValueError(
-                f"No hops nitrogen data for soil category '{soil_category}'."
-            )
-        return FRUIT_HOPS_NITROGEN[soil_category]
+    if kind == _fruit.FRUIT_HOPS and soil_category == "light-sand":
+        raise ValueError(
+            "Hops nitrogen is not given for light sand soils in Table 7.17. "
+            "Seek specialist advice."
+        )
+    # Hops and soft fruit: one rate per soil category.
+    return table[soil_category]
 
-    if crop in _SOFT_FRUIT_SLUGS:
-        key = (crop, soil_category)
-        if key not in FRUIT_SOFT_NITROGEN:
-            raise ValueError(
-                f"No nitrogen data for soft fruit combination: "
-                f"crop={crop}, soil={soil_category}"
-            )
-        return FRUIT_SOFT_NITROGEN[key]
 
-    raise ValueError(f"No nitrogen recommendation logic for fruit crop '{crop}'.")
+def _fruit_pkm(entry: tuple, p_index: int, k_index: int, mg_index: int) -> tuple[float, float, float]:
+    """P/K/Mg for a resolved crop; indices must already be validated."""
+    phosphate, potash, magnesium = entry[2]
+    return phosphate[p_index], potash[k_index], magnesium[mg_index]
+
+
+def recommend_fruit_nitrogen(
+    crop: str,
+    soil_category: str,
+    orchard_management: str | None = None,
+    sns_index: int | None = None,
+) -> float:
+    """Return kg N/ha for a fruit, vine or hop crop.
+
+    Args:
+        crop: A fruit crop slug (category == "fruit").
+        soil_category: FruitSoilCategory value.
+        orchard_management: OrchardManagement value; required for top fruit only.
+        sns_index: SNS index 0–5; required for strawberry crops only.
+
+    Returns:
+        Nitrogen recommendation in kg N/ha.
+
+    Raises:
+        ValueError: If crop is unknown, parameters are missing/invalid, or no
+                    table entry exists for the given combination.
+    """
+    entry = _fruit_entry(crop)
+    _validate_fruit_soil(soil_category)
+    return _fruit_nitrogen(entry, crop, soil_category, orchard_management, sns_index)
 
 
 def recommend_fruit_pkm(
@@ -1094,110 +1069,23 @@ def recommend_fruit_pkm(
     Returns:
         Tuple of (phosphate, potash, magnesium) in kg/ha.
     """
-    if crop not in CROP_INFO:
-        raise ValueError(f"Unknown crop '{crop}'.")
-    if not _is_fruit_crop(crop):
-        raise ValueError(f"Crop '{crop}' is not a fruit category crop.")
-
+    entry = _fruit_entry(crop)
     _validate_index("P index", p_index, 0, 9)
     _validate_index("K index", k_index, 0, 9)
     _validate_index("Mg index", mg_index, 0, 9)
+    return _fruit_pkm(entry, p_index, k_index, mg_index)
 
-    if crop == "fruit-preplant":
-        cp = _clamp_index(p_index, 5)
-        ck = _clamp_index(k_index, 5)
-        cm = _clamp_index(mg_index, 5)
-        return (
-            FRUIT_PREPLANT_PKM[("fruit-vines", "phosphate", cp)],
-            FRUIT_PREPLANT_PKM[("fruit-vines", "potash", ck)],
-            FRUIT_PREPLANT_PKM[("fruit-vines", "magnesium", cm)],
-        )
 
-    if crop == "hops-preplant":
-        cp = _clamp_index(p_index, 5)
-        ck = _clamp_index(k_index, 5)
-        cm = _clamp_index(mg_index, 5)
-        return (
-            FRUIT_PREPLANT_PKM[("hops", "phosphate", cp)],
-            FRUIT_PREPLANT_PKM[("hops", "potash", ck)],
-            FRUIT_PREPLANT_PKM[("hops", "magnesium", cm)],
-        )
+# Crop slug -> advisory notes common to every recommendation for that crop.
+_FRUIT_NOTES: dict[str, tuple[str, ...]] = {}
 
-    if crop in _TOP_FRUIT_SLUGS:
-        cp = _clamp_index(p_index, 4)
-        ck = _clamp_index(k_index, 4)
-        cm = _clamp_index(mg_index, 4)
-        return (
-            FRUIT_TOP_PKM[("phosphate", cp)],
-            FRUIT_TOP_PKM[("potash", ck)],
-            FRUIT_TOP_PKM[("magnesium", cm)],
-        )
 
-    if crop in _SOFT_FRUIT_SLUGS:
-        cp = _clamp_index(p_index, 4)
-        ck = _clamp_index(k_index, 4)
-        cm = _clamp_index(mg_index, 4)
-        return (
-            FRUIT_SOFT_PKM[(crop, "phosphate", cp)],
-            FRUIT_SOFT_PKM[(crop, "potash", ck)],
-            FRUIT_SOFT_PKM[(crop, "magnesium", cm)],
-        )
+def _fruit_notes(crop: str, kind: str) -> tuple[str, ...]:
+    notes = _FRUIT_NOTES.get(crop)
+    if notes is not None:
+        return notes
 
-    if crop in _STRAWBERRY_SLUGS:
-        cp = _clamp_index(p_index, 4)
-        ck = _clamp_index(k_index, 4)
-        cm = _clamp_index(mg_index, 4)
-        return (
-            FRUIT_STRAWBERRY_PKM[("phosphate", cp)],
-            FRUIT_STRAWBERRY_PKM[("potash", ck)],
-            FRUIT_STRAWBERRY_PKM[("magnesium", cm)],
-        )
-
-    if crop == "fruit-hops":
-        cp = _clamp_index(p_index, 5)
-        ck = _clamp_index(k_index, 5)
-        cm = _clamp_index(mg_index, 5)
-        return (
-            FRUIT_HOPS_PKM[("phosphate", cp)],
-            FRUIT_HOPS_PKM[("potash", ck)],
-            FRUIT_HOPS_PKM[("magnesium", cm)],
-        )
-
-    raise ValueError(f"No P/K/Mg recommendation logic for fruit crop '{crop}'.")
-
-
-def recommend_fruit_all(
-    crop: str,
-    soil_category: str,
-    p_index: int,
-    k_index: int,
-    mg_index: int,
-    orchard_management: str | None = None,
-    sns_index: int | None = None,
-) -> NutrientRecommendation:
-    """Return full N/P/K/Mg recommendation for a fruit, vine or hop crop.
-
-    Args:
-        crop: A fruit crop slug (category == "fruit").
-        soil_category: FruitSoilCategory value.
-        p_index: Soil P index 0–9.
-        k_index: Soil K index 0–9.
-        mg_index: Soil Mg index 0–9.
-        orchard_management: OrchardManagement value; required for top fruit.
-        sns_index: SNS index 0–5; required for strawberry crops.
-
-    Returns:
-        NutrientRecommendation with N, P, K, Mg, S and advisory notes.
-    """
-    n = recommend_fruit_nitrogen(
-        crop, soil_category,
-        orchard_management=orchard_management,
-        sns_index=sns_index,
-    )
-    p, k, mg = recommend_fruit_pkm(crop, p_index, k_index, mg_index)
-    s = SULFUR_RECOMMENDATIONS.get(crop, 0.0)
-
-    notes: list[str] = []
+    notes = []
     info = CROP_INFO[crop]
     if info.get("notes"):
         notes.append(info["notes"])
@@ -1210,7 +1098,7 @@ def recommend_fruit_all(
     )
 
     # Top fruit N excess warning
-    if crop in _TOP_FRUIT_SLUGS:
+    if kind == _fruit.FRUIT_TOP:
         notes.append(
             "Excess nitrogen reduces red colour in apples, encourages large dark "
             "leaves and can reduce storage life. Consider leaf and fruit analysis."
@@ -1227,11 +1115,6 @@ def recommend_fruit_all(
     if crop == "fruit-blackcurrant":
         notes.append("Ben-series varieties typically require only 70–120 kg N/ha.")
 
-    # Sulphate of potash note for raspberries/redcurrants/gooseberries
-    _SOP_CROPS = {"fruit-redcurrant", "fruit-gooseberry", "fruit-raspberry"}
-    if crop in _SOP_CROPS and k_index in (0, 1) and k > 120:
-        notes.append("Use sulphate of potash for this crop.")
-
     # Hops notes
     if crop == "fruit-hops":
         notes.append(
@@ -1251,7 +1134,7 @@ def recommend_fruit_all(
         )
 
     # Strawberry notes
-    if crop in _STRAWBERRY_SLUGS:
+    if kind == _fruit.FRUIT_STRAWBERRY:
         notes.append(
             "Nitrogen recommendations are based on SNS Index. Use `veg-sns` or "
             "`veg-smn` commands to determine SNS Index (Section 6 system)."
@@ -1261,20 +1144,135 @@ def recommend_fruit_all(
             "induced magnesium deficiency."
         )
 
+    notes = _FRUIT_NOTES[crop] = tuple(notes)
+    return notes
+
+
+def _fruit_recommendation(
+    crop: str,
+    entry: tuple,
+    n: float,
+    p_index: int,
+    k_index: int,
+    mg_index: int,
+) -> NutrientRecommendation:
+    """Finish a fruit recommendation once nitrogen has been resolved."""
+    _validate_index("P index", p_index, 0, 9)
+    _validate_index("K index", k_index, 0, 9)
+    _validate_index("Mg index", mg_index, 0, 9)
+    p, k, mg = _fruit_pkm(entry, p_index, k_index, mg_index)
+
+    notes = list(_fruit_notes(crop, entry[0]))
+    # Sulphate of potash note for raspberries/redcurrants/gooseberries
+    if crop in _SOP_CROPS and k_index in (0, 1) and k > 120:
+        notes.append("Use sulphate of potash for this crop.")
+
     return NutrientRecommendation(
-        crop=info["name"],
+        crop=CROP_INFO[crop]["name"],
         nitrogen=n,
         phosphorus=p,
         potassium=k,
         magnesium=mg,
-        sulfur=s,
+        sulfur=_sulfur.SULFUR_RECOMMENDATIONS.get(crop, 0.0),
         sodium=0.0,
         notes=notes,
     )
 
 
+def recommend_fruit_all(
+    crop: str,
+    soil_category: str,
+    p_index: int,
+    k_index: int,
+    mg_index: int,
+    orchard_management: str | None = None,
+    sns_index: int | None = None,
+) -> NutrientRecommendation:
+    """Return full N/P/K/Mg recommendation for a fruit, vine or hop crop.
+
+    Args:
+        crop: A fruit crop slug (category == "fruit").
+        soil_category: FruitSoilCategory value.
+        p_index: Soil P index 0–9.
+        k_index: Soil K index 0–9.
+        mg_index: Soil Mg index 0–9.
+        orchard_management: OrchardManagement value; required for top fruit.
+        sns_index: SNS index 0–5; required for strawberry crops.
+
+    Returns:
+        NutrientRecommendation with N, P, K, Mg, S and advisory notes.
+    """
+    entry = _fruit_entry(crop)
+    _validate_fruit_soil(soil_category)
+    n = _fruit_nitrogen(entry, crop, soil_category, orchard_management, sns_index)
+    return _fruit_recommendation(crop, entry, n, p_index, k_index, mg_index)
+
+
+def recommend_fruit_many(rows: Iterable[Mapping]) -> list[NutrientRecommendation]:
+    """Return :func:`recommend_fruit_all` for many orchard blocks.
+
+    Nitrogen is resolved and validated once per distinct crop, soil
+    category, orchard management and SNS index in the call, so an estate of
+    many blocks with a few planting types costs little more than its P, K
+    and Mg lookups.
+
+    Args:
+        rows: One mapping of ``recommend_fruit_all`` keyword arguments per
+            block.
+
+    Returns:
+        One NutrientRecommendation per row, in order.
+
+    Raises:
+        ValueError: If any row is invalid.  The message names the row
+            (0-based).
+    """
+    resolved: dict[tuple, tuple] = {}
+    results = []
+    for row, kwargs in enumerate(rows):
+        crop = kwargs["crop"]
+        key = (
+            crop, kwargs["soil_category"],
+            kwargs.get("orchard_management"), kwargs.get("sns_index"),
+        )
+        try:
+            # type(sns_index) keeps True, 1 and 1.0 apart in the key.
+            entry, n = resolved[key, type(key[3])]
+        except KeyError:
+            try:
+                entry = _fruit_entry(crop)
+                _validate_fruit_soil(key[1])
+                n = _fruit_nitrogen(entry, *key)
+            except ValueError as exc:
+                raise ValueError(f"{exc} at row {row}") from None
+            resolved[key, type(key[3])] = entry, n
+        try:
+            results.append(_fruit_recommendation(
+                crop, entry, n, kwargs["p_index"], kwargs["k_index"], kwargs["mg_index"],
+            ))
+        except ValueError as exc:
+            raise ValueError(f"{exc} at row {row}") from None
+    return results
+
+
 # ── Nitrogen timing ───────────────────────────────────────────────
 
+def _validate_timing(crop: str, total_n: float, soil_type: str | None) -> None:
+    _validate_crop(crop)
+
+    if total_n < 0:
+        raise ValueError(f"total_n must be non-negative, got {total_n}")
+
+    if soil_type is not None:
+        try:
+            SoilType(soil_type)
+        except ValueError:
+            valid = ", ".join(s.value for s in SoilType)
+            raise ValueError(
+                f"Unknown soil type '{soil_type}'. Valid options: {valid}"
+            )
+
+
 def nitrogen_timing(
     crop: str,
     total_n: float,
@@ -1294,22 +1292,46 @@ def nitrogen_timing(
     Raises:
         ValueError: If crop is unknown or total_n is negative.
     """
-    _validate_crop(crop)
+    _validate_timing(crop, total_n, soil_type)
+    return _nitrogen_timing(crop, total_n, soil_type)
 
-    if total_n < 0:
-        raise ValueError(f"total_n must be non-negative, got {total_n}")
 
-    if soil_type is not None:
-        try:
-            SoilType(soil_type)
-        except ValueError:
-            valid = ", ".join(s.value for s in SoilType)
-            raise ValueError(
-                f"Unknown soil type '{soil_type}'. Valid options: {valid}"
-            )
+def nitrogen_timing_many(
+    rows: Iterable[tuple[str, float, str | None]],
+) -> list[NitrogenTimingResult]:
+    """Return :func:`nitrogen_timing` for many ``(crop, total_n, soil_type)`` rows.
+
+    Each crop and soil type is validated once per call rather than once per
+    row, and each row's rule is found with the compiled index in
+    ``rb209.data.timing``.
+
+    Args:
+        rows: ``(crop, total_n, soil_type)`` tuples; *soil_type* may be None.
+
+    Returns:
+        One NitrogenTimingResult per row, in order.
 
+    Raises:
+        ValueError: If any row is invalid.  The message names the row
+            (0-based).
+    """
+    validated: set[tuple[str, str | None]] = set()
+    results = []
+    for row, (crop, total_n, soil_type) in enumerate(rows):
+        if (crop, soil_type) not in validated or total_n < 0:
+            try:
+                _validate_timing(crop, total_n, soil_type)
+            except ValueError as exc:
+                raise ValueError(f"{exc} at row {row}") from None
+            validated.add((crop, soil_type))
+        results.append(_nitrogen_timing(crop, total_n, soil_type))
+    return results
+
+
+def _nitrogen_timing(crop: str, total_n: float, soil_type: str | None) -> NitrogenTimingResult:
+    """:func:`nitrogen_timing` for arguments that are already validated."""
     crop_name = CROP_INFO[crop]["name"]
-    rules = NITROGEN_TIMING_RULES.get(crop)
+    rules = _timing.NITROGEN_TIMING_RULES.get(crop)
 
     if rules is None:
         # No timing data for this crop — return a single full dressing with advisory.
@@ -1327,20 +1349,13 @@ def nitrogen_timing(
             ],
         )
 
-    # Find first matching rule.
-    matched_rule: dict | None = None
-    for rule in rules:
-        min_n = rule.get("min_n", 0)
-        max_n = rule.get("max_n", float("inf"))
-        if total_n < min_n or total_n > max_n:
-            continue
-        soil_cond = rule.get("soil_condition")
-        if soil_cond is not None and not soil_cond(soil_type):
-            continue
-        matched_rule = rule
-        break
-
-    if matched_rule is None:
+    # Find the first matching rule: bisect the N thresholds for this crop and
+    # soil (see TIMING_INDEX).
+    points, region_rules = _timing.TIMING_INDEX[(crop, soil_type)]
+    j = bisect_left(points, total_n)
+    rule_no = region_rules[2 * j + 1 if j < len(points) and points[j] == total_n else 2 * j]
+
+    if rule_no is None:
         # Fallback: apply all in one dressing (should not normally occur).
         split = NitrogenSplit(
             amount=round(total_n),
@@ -1353,6 +1368,7 @@ def nitrogen_timing(
             notes=[],
         )
 
+    matched_rule = rules[rule_no]
     rule_splits = matched_rule["splits"]
     notes: list[str] = list(matched_rule.get("notes", []))
 
@@ -1392,6 +1408,8 @@ def calculate_organic(
     timing: str | None = None,
     incorporated: bool = False,
     soil_type: str | None = None,
+    *,
+    trusted: bool = False,
 ) -> OrganicNutrients:
     """Calculate nutrients supplied by an organic material application.
 
@@ -1410,29 +1428,32 @@ def calculate_organic(
         soil_type: Soil type string ("light", "medium", "heavy", "organic").
             Used with *timing* to select the correct soil category in the
             factor tables.  Defaults to "medium_heavy" when omitted.
+        trusted: Skip validating *material* and *rate*.  Only for arguments
+            that have already passed :func:`rb209.validation.organic_errors`.
     """
-    try:
-        OrganicMaterial(material)
-    except ValueError:
-        valid = ", ".join(m.value for m in OrganicMaterial)
-        raise ValueError(
-            f"Unknown organic material '{material}'. Valid options: {valid}"
-        )
+    if not trusted:
+        try:
+            OrganicMaterial(material)
+        except ValueError:
+            valid = ", ".join(m.value for m in OrganicMaterial)
+            raise ValueError(
+                f"Unknown organic material '{material}'. Valid options: {valid}"
+            )
 
-    if rate < 0:
-        raise ValueError("Application rate must be non-negative")
+        if rate < 0:
+            raise ValueError("Application rate must be non-negative")
 
-    info = ORGANIC_MATERIAL_INFO[material]
+    info = _organic.ORGANIC_MATERIAL_INFO[material]
     total_n = round(info["total_n"] * rate, 1)
 
     if timing is not None:
-        timing_table = ORGANIC_N_TIMING_FACTORS.get(material)
+        timing_table = _organic.ORGANIC_N_TIMING_FACTORS.get(material)
         if timing_table is None:
             raise ValueError(
                 f"No timing/incorporation factors available for '{material}'. "
                 "Use the flat available_n coefficient instead."
             )
-        soil_cat = TIMING_SOIL_CATEGORY.get(soil_type or "", "medium_heavy")
+        soil_cat = _organic.TIMING_SOIL_CATEGORY.get(soil_type or "", "medium_heavy")
         key = (timing, soil_cat, incorporated)
         if key not in timing_table:
             raise ValueError(
@@ -1502,18 +1523,18 @@ def calculate_lime(
         raise ValueError(f"Unknown soil type '{soil_type}'. Valid options: {valid}")
 
     if target_ph is None:
-        valid_land_uses = tuple(TARGET_PH.keys())
+        valid_land_uses = tuple(_lime.TARGET_PH.keys())
         if land_use is None:
             raise ValueError(
                 "Either target_ph or land_use must be provided. "
                 f"Valid land_use values: {', '.join(valid_land_uses)}"
             )
-        if land_use not in TARGET_PH:
+        if land_use not in _lime.TARGET_PH:
             raise ValueError(
                 f"Unknown land_use '{land_use}'. "
                 f"Valid options: {', '.join(valid_land_uses)}"
             )
-        target_ph = TARGET_PH[land_use]
+        target_ph = _lime.TARGET_PH[land_use]
 
     if not (3.0 <= current_ph <= 9.0):
         raise ValueError(f"Current pH must be between 3.0 and 9.0, got {current_ph}")
@@ -1522,9 +1543,9 @@ def calculate_lime(
 
     notes: list[str] = []
 
-    if current_ph < MIN_PH_FOR_LIMING:
+    if current_ph < _lime.MIN_PH_FOR_LIMING:
         notes.append(
-            f"Soil pH ({current_ph}) is below {MIN_PH_FOR_LIMING}. "
+            f"Soil pH ({current_ph}) is below {_lime.MIN_PH_FOR_LIMING}. "
             "Soil is very acidic — liming is strongly recommended."
         )
 
@@ -1539,13 +1560,13 @@ def calculate_lime(
         )
 
     ph_deficit = target_ph - current_ph
-    factor = LIME_FACTORS[soil_type]
+    factor = _lime.LIME_FACTORS[soil_type]
     lime_needed = round(ph_deficit * factor, 1)
 
-    if lime_needed > MAX_SINGLE_APPLICATION:
+    if lime_needed > _lime.MAX_SINGLE_APPLICATION:
         notes.append(
             f"Total lime required ({lime_needed} t/ha) exceeds single application "
-            f"maximum ({MAX_SINGLE_APPLICATION} t/ha). Apply in split dressings "
+            f"maximum ({_lime.MAX_SINGLE_APPLICATION} t/ha). Apply in split dressings "
             f"over successive years."
         )
 
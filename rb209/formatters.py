@@ -1,15 +1,357 @@
-"""Output formatters for human-readable tables and JSON."""
+"""Output formatters for human-readable tables, JSON, NDJSON and CSV.
 
+``json`` output is indented for reading.  ``ndjson`` output is one compact
+JSON object per line, for streaming many results; :func:`write_ndjson`
+writes any number of results to a stream.  Both are built from the
+``*_to_dict`` serialisers below, which read each field directly rather
+than deep-copying the result with ``dataclasses.asdict``.
+
+``csv`` output is a header line plus one row per result, with a fixed
+column layout per result type (see the ``*_CSV_COLUMNS`` constants);
+:func:`write_csv` streams any number of results of one type.
+"""
+
+import csv
+import io
 import json
-from dataclasses import asdict
+import textwrap
+from collections.abc import Iterable, Sequence
+from typing import IO
 
 from rb209.models import (
+    CodedRecommendation,
+    FrozenNitrogenTimingResult,
+    FrozenNutrientRecommendation,
+    FrozenOrganicNutrients,
+    FrozenSNSResult,
     LimeRecommendation,
     NitrogenTimingResult,
     NutrientRecommendation,
     OrganicNutrients,
+    RecommendationRow,
     SNSResult,
 )
+from rb209.notes import render
+
+
+# ── Serialisers ─────────────────────────────────────────────────────
+#
+# Keys are in field order, so the dicts match dataclasses.asdict.  Lists
+# (notes) are shared with the result, not copied.
+
+def recommendation_to_dict(rec: NutrientRecommendation | CodedRecommendation) -> dict:
+    return {
+        "crop": rec.crop,
+        "nitrogen": rec.nitrogen,
+        "phosphorus": rec.phosphorus,
+        "potassium": rec.potassium,
+        "magnesium": rec.magnesium,
+        "sulfur": rec.sulfur,
+        "sodium": rec.sodium,
+        "notes": rec.notes,
+    }
+
+
+def sns_to_dict(result: SNSResult) -> dict:
+    return {
+        "sns_index": result.sns_index,
+        "previous_crop": result.previous_crop,
+        "soil_type": result.soil_type,
+        "rainfall": result.rainfall,
+        "method": result.method,
+        "smn": result.smn,
+        "crop_n": result.crop_n,
+        "sns_value": result.sns_value,
+        "notes": result.notes,
+    }
+
+
+def organic_to_dict(org: OrganicNutrients) -> dict:
+    return {
+        "material": org.material,
+        "rate": org.rate,
+        "unit": org.unit,
+        "total_n": org.total_n,
+        "available_n": org.available_n,
+        "p2o5": org.p2o5,
+        "k2o": org.k2o,
+        "mgo": org.mgo,
+        "so3": org.so3,
+        "notes": org.notes,
+    }
+
+
+def lime_to_dict(lime: LimeRecommendation) -> dict:
+    return {
+        "current_ph": lime.current_ph,
+        "target_ph": lime.target_ph,
+        "soil_type": lime.soil_type,
+        "lime_required": lime.lime_required,
+        "notes": lime.notes,
+    }
+
+
+def timing_to_dict(result: NitrogenTimingResult) -> dict:
+    return {
+        "crop": result.crop,
+        "total_n": result.total_n,
+        "splits": [
+            {"amount": split.amount, "timing": split.timing, "note": split.note}
+            for split in result.splits
+        ],
+        "notes": result.notes,
+    }
+
+
+_TO_DICT = {
+    NutrientRecommendation: recommendation_to_dict,
+    CodedRecommendation: recommendation_to_dict,
+    FrozenNutrientRecommendation: recommendation_to_dict,
+    RecommendationRow: recommendation_to_dict,
+    SNSResult: sns_to_dict,
+    FrozenSNSResult: sns_to_dict,
+    OrganicNutrients: organic_to_dict,
+    FrozenOrganicNutrients: organic_to_dict,
+    LimeRecommendation: lime_to_dict,
+    NitrogenTimingResult: timing_to_dict,
+    FrozenNitrogenTimingResult: timing_to_dict,
+}
+
+
+def to_dict(obj) -> dict:
+    """Serialise any engine result with the matching ``*_to_dict`` function.
+
+    Raises:
+        TypeError: If *obj* is not an engine result.
+    """
+    serialise = _TO_DICT.get(type(obj))
+    if serialise is None:
+        raise TypeError(f"Cannot serialise {type(obj).__name__}")
+    return serialise(obj)
+
+
+# Compact encoder for NDJSON lines; the json module caches its own default
+# encoder only for calls without options.
+_encode_line = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _dumps(data, fmt: str) -> str:
+    if fmt == "ndjson":
+        return _encode_line(data)
+    return json.dumps(data, indent=2)
+
+
+def write_ndjson(results: Iterable, out: IO[str]) -> int:
+    """Write engine results to *out* as NDJSON, one compact line each.
+
+    *out* should be buffered (any file opened in text mode is); lines are
+    written as they are serialised, so *results* may be a generator.
+
+    Returns:
+        Number of lines written.
+    """
+    write = out.write
+    n_lines = 0
+    for obj in results:
+        write(_encode_line(to_dict(obj)))
+        write("\n")
+        n_lines += 1
+    return n_lines
+
+
+# ── CSV ─────────────────────────────────────────────────────────────
+#
+# Every result type has a fixed column layout.  Variable-length data is
+# flattened predictably: notes are joined into one "notes" cell with
+# CSV_NOTE_SEPARATOR (no note text contains it), and nitrogen timing
+# dressings fill CSV_MAX_SPLITS groups of dressing_<i>_* columns, left
+# empty past the last dressing.  None is written as an empty cell.
+
+CSV_NOTE_SEPARATOR = " | "
+
+# Most dressings in any NITROGEN_TIMING_RULES schedule.
+CSV_MAX_SPLITS = 5
+
+RECOMMENDATION_CSV_COLUMNS: tuple[str, ...] = (
+    "crop", "nitrogen", "phosphorus", "potassium", "magnesium", "sulfur", "sodium", "notes",
+)
+SNS_CSV_COLUMNS: tuple[str, ...] = (
+    "sns_index", "previous_crop", "soil_type", "rainfall", "method",
+    "smn", "crop_n", "sns_value", "notes",
+)
+ORGANIC_CSV_COLUMNS: tuple[str, ...] = (
+    "material", "rate", "unit", "total_n", "available_n",
+    "p2o5", "k2o", "mgo", "so3", "notes",
+)
+LIME_CSV_COLUMNS: tuple[str, ...] = (
+    "current_ph", "target_ph", "soil_type", "lime_required", "notes",
+)
+TIMING_CSV_COLUMNS: tuple[str, ...] = (
+    "crop", "total_n", "dressings",
+    *(
+        f"dressing_{i}_{part}"
+        for i in range(1, CSV_MAX_SPLITS + 1)
+        for part in ("amount", "timing", "note")
+    ),
+    "notes",
+)
+
+_NO_SPLIT = ("", "", "")
+
+
+def _recommendation_row(rec: NutrientRecommendation) -> list:
+    return [
+        rec.crop, rec.nitrogen, rec.phosphorus, rec.potassium, rec.magnesium,
+        rec.sulfur, rec.sodium, CSV_NOTE_SEPARATOR.join(rec.notes),
+    ]
+
+
+def _coded_recommendation_row(rec: CodedRecommendation) -> list:
+    return [
+        rec.crop, rec.nitrogen, rec.phosphorus, rec.potassium, rec.magnesium,
+        rec.sulfur, rec.sodium,
+        CSV_NOTE_SEPARATOR.join([render(code, params) for code, params in rec.notes]),
+    ]
+
+
+def _batch_row(row: RecommendationRow) -> list:
+    # A batch keeps notes as it was given them: text or (code, params).
+    notes = row.notes
+    if notes and type(notes[0]) is tuple:
+        notes = [render(code, params) for code, params in notes]
+    return [
+        row.crop, row.nitrogen, row.phosphorus, row.potassium, row.magnesium,
+        row.sulfur, row.sodium, CSV_NOTE_SEPARATOR.join(notes),
+    ]
+
+
+def _sns_row(result: SNSResult) -> list:
+    return [
+        result.sns_index, result.previous_crop, result.soil_type, result.rainfall,
+        result.method, result.smn, result.crop_n, result.sns_value,
+        CSV_NOTE_SEPARATOR.join(result.notes),
+    ]
+
+
+def _organic_row(org: OrganicNutrients) -> list:
+    return [
+        org.material, org.rate, org.unit, org.total_n, org.available_n,
+        org.p2o5, org.k2o, org.mgo, org.so3, CSV_NOTE_SEPARATOR.join(org.notes),
+    ]
+
+
+def _lime_row(lime: LimeRecommendation) -> list:
+    return [
+        lime.current_ph, lime.target_ph, lime.soil_type, lime.lime_required,
+        CSV_NOTE_SEPARATOR.join(lime.notes),
+    ]
+
+
+def _timing_row(result: NitrogenTimingResult) -> list:
+    splits = result.splits
+    if len(splits) > CSV_MAX_SPLITS:
+        raise ValueError(
+            f"Timing for {result.crop} has {len(splits)} dressings; "
+            f"the CSV layout holds at most {CSV_MAX_SPLITS}"
+        )
+    row = [result.crop, result.total_n, len(splits)]
+    for split in splits:
+        row += (split.amount, split.timing, split.note)
+    row += _NO_SPLIT * (CSV_MAX_SPLITS - len(splits))
+    row.append(CSV_NOTE_SEPARATOR.join(result.notes))
+    return row
+
+
+# type -> (columns, row function)
+_CSV_LAYOUTS = {
+    NutrientRecommendation: (RECOMMENDATION_CSV_COLUMNS, _recommendation_row),
+    CodedRecommendation: (RECOMMENDATION_CSV_COLUMNS, _coded_recommendation_row),
+    FrozenNutrientRecommendation: (RECOMMENDATION_CSV_COLUMNS, _recommendation_row),
+    RecommendationRow: (RECOMMENDATION_CSV_COLUMNS, _batch_row),
+    SNSResult: (SNS_CSV_COLUMNS, _sns_row),
+    FrozenSNSResult: (SNS_CSV_COLUMNS, _sns_row),
+    OrganicNutrients: (ORGANIC_CSV_COLUMNS, _organic_row),
+    FrozenOrganicNutrients: (ORGANIC_CSV_COLUMNS, _organic_row),
+    LimeRecommendation: (LIME_CSV_COLUMNS, _lime_row),
+    NitrogenTimingResult: (TIMING_CSV_COLUMNS, _timing_row),
+    FrozenNitrogenTimingResult: (TIMING_CSV_COLUMNS, _timing_row),
+}
+
+
+def _csv_layout(obj) -> tuple:
+    layout = _CSV_LAYOUTS.get(type(obj))
+    if layout is None:
+        raise TypeError(f"Cannot serialise {type(obj).__name__}")
+    return layout
+
+
+def csv_row(obj) -> list:
+    """Return the CSV cells of one engine result, in its layout's column order.
+
+    These are the rows :func:`write_csv` writes, for callers that add
+    columns of their own.
+
+    Raises:
+        TypeError: If *obj* is not an engine result.
+        ValueError: If a timing result has more than ``CSV_MAX_SPLITS``
+            dressings.
+    """
+    return _csv_layout(obj)[1](obj)
+
+
+def write_csv(results: Iterable, out: IO[str], header: bool = True) -> int:
+    """Write engine results to *out* as CSV, one row each.
+
+    Rows are written through one ``csv.writer`` as they are produced, so
+    *results* may be a generator of any length.  Open files with
+    ``newline=""``; lines end with ``\\n``.
+
+    Args:
+        results: Engine results that share a column layout (a mix of
+            ``NutrientRecommendation`` and ``CodedRecommendation`` is fine).
+        out: Text stream to write to.
+        header: Write the column names first.  No header is written when
+            *results* is empty.
+
+    Returns:
+        Number of data rows written.
+
+    Raises:
+        TypeError: If a result is not an engine result, or its layout
+            differs from the first result's.
+        ValueError: If a timing result has more than ``CSV_MAX_SPLITS``
+            dressings.
+    """
+    writerow = csv.writer(out, lineterminator="\n").writerow
+    n_rows = 0
+    columns = None
+    for obj in results:
+        layout_columns, row = _csv_layout(obj)
+        if layout_columns is not columns:
+            if columns is not None:
+                raise TypeError(
+                    f"Cannot mix {type(obj).__name__} with earlier results in one CSV"
+                )
+            columns = layout_columns
+            if header:
+                writerow(columns)
+        writerow(row(obj))
+        n_rows += 1
+    return n_rows
+
+
+def _csv_text(columns: Iterable, rows: Iterable[Iterable]) -> str:
+    """Return a header and rows as CSV text, without a trailing newline."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return buf.getvalue()[:-1]
+
+
+def _format_csv(obj) -> str:
+    columns, row = _csv_layout(obj)
+    return _csv_text(columns, [row(obj)])
 
 
 # ── Helpers ─────────────────────────────────────────────────────────
@@ -33,11 +375,9 @@ def _box(title: str, rows: list[tuple[str, str]], notes: list[str] | None = None
 
     if notes:
         for note in notes:
-            # Wrap long notes
-            while len(note) > inner_w:
-                lines.append(f"| {note[:inner_w]} |")
-                note = note[inner_w:]
-            lines.append(f"| {note:<{inner_w}} |")
+            # Wrap long notes at the box width, one slice per line
+            for start in range(0, max(len(note), 1), inner_w):
+                lines.append(f"| {note[start:start + inner_w]:<{inner_w}} |")
         lines.append(sep)
 
     return "\n".join(lines)
@@ -46,8 +386,10 @@ def _box(title: str, rows: list[tuple[str, str]], notes: list[str] | None = None
 # ── Nutrient recommendation ────────────────────────────────────────
 
 def format_recommendation(rec: NutrientRecommendation, fmt: str = "table") -> str:
-    if fmt == "json":
-        return json.dumps(asdict(rec), indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps(recommendation_to_dict(rec), fmt)
+    if fmt == "csv":
+        return _format_csv(rec)
 
     rows = [
         ("Nitrogen (N)", f"{rec.nitrogen:.0f} kg/ha"),
@@ -60,13 +402,96 @@ def format_recommendation(rec: NutrientRecommendation, fmt: str = "table") -> st
     return _box(f"Nutrient Recommendations — {rec.crop}", rows, rec.notes)
 
 
+# ── Multi-field report ─────────────────────────────────────────────
+
+REPORT_HEADINGS: tuple[str, ...] = (
+    "Field", "Crop", "N", "P2O5", "K2O", "MgO", "SO3", "Na2O", "Notes",
+)
+
+
+def format_report(
+    recommendations: Sequence[NutrientRecommendation],
+    fields: Sequence | None = None,
+    width: int = 80,
+) -> str:
+    """Format many recommendations as one aligned table with footnotes.
+
+    Each row shows the field, crop and nutrients in kg/ha.  Each distinct
+    note text is printed once below the table, numbered in order of first
+    appearance, and rows refer to their notes by number.
+
+    Args:
+        recommendations: Results with the attributes of
+            ``NutrientRecommendation`` (including ``RecommendationRow``).
+        fields: Field identifiers, one per recommendation; default 1, 2, ...
+        width: Line width for wrapping footnotes.
+
+    Raises:
+        ValueError: If *fields* and *recommendations* differ in length.
+    """
+    if fields is None:
+        fields = range(1, len(recommendations) + 1)
+    elif len(fields) != len(recommendations):
+        raise ValueError(
+            f"Got {len(fields)} field(s) for {len(recommendations)} recommendation(s)"
+        )
+
+    # One pass builds every cell and the footnote numbering, tracking the
+    # widest cell in each column.
+    footnotes: dict[str, int] = {}
+    rows = []
+    widths = [len(h) for h in REPORT_HEADINGS]
+    for field_id, rec in zip(fields, recommendations):
+        notes = rec.notes
+        if notes and type(notes[0]) is tuple:
+            notes = [render(code, params) for code, params in notes]
+        refs = []
+        for note in notes:
+            number = footnotes.get(note)
+            if number is None:
+                number = footnotes[note] = len(footnotes) + 1
+            refs.append(str(number))
+        row = (
+            str(field_id), rec.crop,
+            f"{rec.nitrogen:.0f}", f"{rec.phosphorus:.0f}", f"{rec.potassium:.0f}",
+            f"{rec.magnesium:.0f}", f"{rec.sulfur:.0f}", f"{rec.sodium:.0f}",
+            ",".join(refs),
+        )
+        rows.append(row)
+        widths = [max(w, len(cell)) for w, cell in zip(widths, row)]
+
+    # Text columns are left-aligned, nutrient columns right-aligned.
+    align = ("<", "<", ">", ">", ">", ">", ">", ">", "<")
+    template = "| " + " | ".join(
+        f"{{:{a}{w}}}" for a, w in zip(align, widths)
+    ) + " |"
+    sep = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+
+    lines = ["Nutrient Recommendations (kg/ha)", sep, template.format(*REPORT_HEADINGS), sep]
+    lines.extend(template.format(*row) for row in rows)
+    lines.append(sep)
+
+    if footnotes:
+        lines.append("")
+        lines.append("Notes:")
+        # "[n] " padded to the widest number; wrapped lines hang under the text.
+        label_w = len(str(len(footnotes))) + 3
+        wrapper = textwrap.TextWrapper(width=width, subsequent_indent=" " * label_w)
+        for note, number in footnotes.items():
+            lines.extend(wrapper.wrap(f"{f'[{number}]':<{label_w}}{note}"))
+
+    return "\n".join(lines)
+
+
 # ── Single nutrient ────────────────────────────────────────────────
 
 def format_single_nutrient(
     crop_name: str, nutrient: str, unit: str, value: float, fmt: str = "table"
 ) -> str:
-    if fmt == "json":
-        return json.dumps({"crop": crop_name, "nutrient": nutrient, "value": value, "unit": unit}, indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps({"crop": crop_name, "nutrient": nutrient, "value": value, "unit": unit}, fmt)
+    if fmt == "csv":
+        return _csv_text(("crop", "nutrient", "value", "unit"), [(crop_name, nutrient, value, unit)])
 
     rows = [(nutrient, f"{value:.0f} {unit}")]
     return _box(f"{nutrient} — {crop_name}", rows)
@@ -75,8 +500,10 @@ def format_single_nutrient(
 # ── SNS ─────────────────────────────────────────────────────────────
 
 def format_sns(result: SNSResult, fmt: str = "table") -> str:
-    if fmt == "json":
-        return json.dumps(asdict(result), indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps(sns_to_dict(result), fmt)
+    if fmt == "csv":
+        return _format_csv(result)
 
     rows = [("SNS Index", str(result.sns_index))]
 
@@ -100,8 +527,10 @@ def format_sns(result: SNSResult, fmt: str = "table") -> str:
 # ── Organic materials ──────────────────────────────────────────────
 
 def format_organic(org: OrganicNutrients, fmt: str = "table") -> str:
-    if fmt == "json":
-        return json.dumps(asdict(org), indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps(organic_to_dict(org), fmt)
+    if fmt == "csv":
+        return _format_csv(org)
 
     rows = [
         ("Application rate", f"{org.rate:.1f} {org.unit}/ha"),
@@ -118,8 +547,10 @@ def format_organic(org: OrganicNutrients, fmt: str = "table") -> str:
 # ── Lime ────────────────────────────────────────────────────────────
 
 def format_lime(lime: LimeRecommendation, fmt: str = "table") -> str:
-    if fmt == "json":
-        return json.dumps(asdict(lime), indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps(lime_to_dict(lime), fmt)
+    if fmt == "csv":
+        return _format_csv(lime)
 
     rows = [
         ("Current pH", f"{lime.current_ph:.1f}"),
@@ -133,8 +564,10 @@ def format_lime(lime: LimeRecommendation, fmt: str = "table") -> str:
 # ── Nitrogen timing ─────────────────────────────────────────────────
 
 def format_timing(result: NitrogenTimingResult, fmt: str = "table") -> str:
-    if fmt == "json":
-        return json.dumps(asdict(result), indent=2)
+    if fmt in ("json", "ndjson"):
+        return _dumps(timing_to_dict(result), fmt)
+    if fmt == "csv":
+        return _format_csv(result)
 
     rows = [("Total N", f"{result.total_n:.0f} kg/ha")]
     for i, split in enumerate(result.splits, start=1):
@@ -154,8 +587,13 @@ def format_timing(result: NitrogenTimingResult, fmt: str = "table") -> str:
 def format_crop_list(
     crops: list[dict], fmt: str = "table"
 ) -> str:
+    if fmt == "ndjson":
+        return "\n".join(map(_encode_line, crops))
     if fmt == "json":
         return json.dumps(crops, indent=2)
+    if fmt == "csv":
+        columns = list(crops[0]) if crops else []
+        return _csv_text(columns, ([item[c] for c in columns] for item in crops))
 
     lines: list[str] = []
     # Group by category
@@ -183,8 +621,13 @@ def format_crop_list(
 def format_material_list(
     materials: list[dict], fmt: str = "table"
 ) -> str:
+    if fmt == "ndjson":
+        return "\n".join(map(_encode_line, materials))
     if fmt == "json":
         return json.dumps(materials, indent=2)
+    if fmt == "csv":
+        columns = list(materials[0]) if materials else []
+        return _csv_text(columns, ([item[c] for c in columns] for item in materials))
 
     lines: list[str] = []
     header = "Available Organic Materials"
@@ -1,5 +1,7 @@
 """Data models for RB209 fertiliser recommendations."""
 
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -130,6 +132,22 @@ class NutrientRecommendation:
     notes: list[str] = field(default_factory=list)
 
 
+@dataclass
+class CodedRecommendation:
+    """Full nutrient recommendation with notes left as ``(code, params)``.
+
+    Render a note with :func:`rb209.notes.render`.
+    """
+    crop: str
+    nitrogen: float
+    phosphorus: float
+    potassium: float
+    magnesium: float
+    sulfur: float
+    sodium: float = 0.0
+    notes: list[tuple[int, tuple]] = field(default_factory=list)
+
+
 @dataclass
 class OrganicNutrients:
     """Nutrients supplied by an organic material application."""
@@ -184,3 +202,262 @@ class NitrogenTimingResult:
     total_n: float              # kg N/ha
     splits: list[NitrogenSplit]
     notes: list[str] = field(default_factory=list)
+
+
+# ── Frozen result variants ──────────────────────────────────────────
+#
+# Slotted, immutable copies of the result dataclasses above, for holding
+# many results in memory: no per-instance __dict__, and notes (and timing
+# splits) are tuples.  Build one with from_result(); field names and order
+# match the mutable class, so formatters treat both alike.
+
+@dataclass(frozen=True, slots=True)
+class FrozenNutrientRecommendation:
+    """Immutable :class:`NutrientRecommendation`."""
+    crop: str
+    nitrogen: float
+    phosphorus: float
+    potassium: float
+    magnesium: float
+    sulfur: float
+    sodium: float = 0.0
+    notes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_result(cls, rec: NutrientRecommendation) -> "FrozenNutrientRecommendation":
+        return cls(
+            rec.crop, rec.nitrogen, rec.phosphorus, rec.potassium,
+            rec.magnesium, rec.sulfur, rec.sodium, tuple(rec.notes),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenSNSResult:
+    """Immutable :class:`SNSResult`."""
+    sns_index: int
+    previous_crop: str = ""
+    soil_type: str = ""
+    rainfall: str = ""
+    method: str = "field-assessment"
+    smn: float | None = None
+    crop_n: float | None = None
+    sns_value: float | None = None
+    notes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_result(cls, result: SNSResult) -> "FrozenSNSResult":
+        return cls(
+            result.sns_index, result.previous_crop, result.soil_type, result.rainfall,
+            result.method, result.smn, result.crop_n, result.sns_value, tuple(result.notes),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenOrganicNutrients:
+    """Immutable :class:`OrganicNutrients`."""
+    material: str
+    rate: float
+    unit: str
+    total_n: float
+    available_n: float
+    p2o5: float
+    k2o: float
+    mgo: float
+    so3: float
+    notes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_result(cls, org: OrganicNutrients) -> "FrozenOrganicNutrients":
+        return cls(
+            org.material, org.rate, org.unit, org.total_n, org.available_n,
+            org.p2o5, org.k2o, org.mgo, org.so3, tuple(org.notes),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenNitrogenSplit:
+    """Immutable :class:`NitrogenSplit`."""
+    amount: float
+    timing: str
+    note: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenNitrogenTimingResult:
+    """Immutable :class:`NitrogenTimingResult`."""
+    crop: str
+    total_n: float
+    splits: tuple[FrozenNitrogenSplit, ...]
+    notes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_result(cls, result: NitrogenTimingResult) -> "FrozenNitrogenTimingResult":
+        return cls(
+            result.crop,
+            result.total_n,
+            tuple(FrozenNitrogenSplit(s.amount, s.timing, s.note) for s in result.splits),
+            tuple(result.notes),
+        )
+
+
+# ── Columnar recommendation batch ──────────────────────────────────
+
+RECOMMENDATION_NUTRIENTS: tuple[str, ...] = (
+    "nitrogen", "phosphorus", "potassium", "magnesium", "sulfur", "sodium",
+)
+
+
+class RecommendationBatch:
+    """Struct-of-arrays store for many full nutrient recommendations.
+
+    Each nutrient is an ``array('d')`` column.  Crop names and note lists
+    are dictionary-encoded: ``crop_ids`` (``array('H')``) and ``note_ids``
+    (``array('I')``) index into ``crops`` and ``note_sets``, so a note list
+    shared by many rows is stored once.  Notes keep the form they have on
+    the result: text from ``recommend_all``, or ``(code, params)`` pairs
+    from ``recommend_all_coded``.
+
+    Indexing and iteration give :class:`RecommendationRow` views with the
+    same attributes as a recommendation; nutrient values read back as
+    floats.
+
+    Args:
+        results: ``NutrientRecommendation`` or ``CodedRecommendation``
+            results (or anything with the same attributes) to add.
+    """
+
+    __slots__ = (
+        "crops", "note_sets", "crop_ids", "note_ids", *RECOMMENDATION_NUTRIENTS,
+        "_crop_id", "_note_set_id",
+    )
+
+    def __init__(self, results: Iterable = ()) -> None:
+        self.crops: list[str] = []
+        self.note_sets: list[tuple] = []
+        self.crop_ids = array("H")
+        self.note_ids = array("I")
+        self.nitrogen = array("d")
+        self.phosphorus = array("d")
+        self.potassium = array("d")
+        self.magnesium = array("d")
+        self.sulfur = array("d")
+        self.sodium = array("d")
+        self._crop_id: dict[str, int] = {}
+        self._note_set_id: dict[tuple, int] = {}
+        self.extend(results)
+
+    def append(self, rec) -> None:
+        """Add one recommendation."""
+        self.extend((rec,))
+
+    def extend(self, results: Iterable) -> None:
+        """Add every recommendation in *results*.
+
+        Each row is read and converted in full before any column is
+        touched, so a row that raises (for example a ``None`` nutrient)
+        leaves the batch as it was after the previous row.
+        """
+        crops, crop_id = self.crops, self._crop_id
+        note_sets, note_set_id = self.note_sets, self._note_set_id
+        add_crop, add_notes = self.crop_ids.append, self.note_ids.append
+        add_n, add_p, add_k = self.nitrogen.append, self.phosphorus.append, self.potassium.append
+        add_mg, add_s, add_na = self.magnesium.append, self.sulfur.append, self.sodium.append
+        for rec in results:
+            crop = rec.crop
+            notes = tuple(rec.notes)
+            n, p, k = float(rec.nitrogen), float(rec.phosphorus), float(rec.potassium)
+            mg, s, na = float(rec.magnesium), float(rec.sulfur), float(rec.sodium)
+            cid = crop_id.get(crop)
+            new_crop = cid is None
+            if new_crop:
+                cid = len(crops)
+            nid = note_set_id.get(notes)
+            new_notes = nid is None
+            if new_notes:
+                nid = len(note_sets)
+            # Only these two appends can fail (an id too large for the
+            # column); the id tables are updated once both have succeeded.
+            add_crop(cid)
+            try:
+                add_notes(nid)
+            except OverflowError:
+                self.crop_ids.pop()
+                raise
+            if new_crop:
+                crop_id[crop] = cid
+                crops.append(crop)
+            if new_notes:
+                note_set_id[notes] = nid
+                note_sets.append(notes)
+            add_n(n)
+            add_p(p)
+            add_k(k)
+            add_mg(mg)
+            add_s(s)
+            add_na(na)
+
+    def __len__(self) -> int:
+        return len(self.crop_ids)
+
+    def __getitem__(self, index: int) -> "RecommendationRow":
+        return RecommendationRow(self, range(len(self.crop_ids))[index])
+
+    def __iter__(self) -> Iterator["RecommendationRow"]:
+        for index in range(len(self.crop_ids)):
+            yield RecommendationRow(self, index)
+
+    def nbytes(self) -> int:
+        """Return the bytes held by the columns, excluding the shared
+        ``crops`` and ``note_sets`` tables."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self.crop_ids, self.note_ids, self.nitrogen, self.phosphorus,
+                self.potassium, self.magnesium, self.sulfur, self.sodium,
+            )
+        )
+
+
+class RecommendationRow:
+    """Read-only view of one row of a :class:`RecommendationBatch`."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: RecommendationBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    @property
+    def crop(self) -> str:
+        return self._batch.crops[self._batch.crop_ids[self._index]]
+
+    @property
+    def nitrogen(self) -> float:
+        return self._batch.nitrogen[self._index]
+
+    @property
+    def phosphorus(self) -> float:
+        return self._batch.phosphorus[self._index]
+
+    @property
+    def potassium(self) -> float:
+        return self._batch.potassium[self._index]
+
+    @property
+    def magnesium(self) -> float:
+        return self._batch.magnesium[self._index]
+
+    @property
+    def sulfur(self) -> float:
+        return self._batch.sulfur[self._index]
+
+    @property
+    def sodium(self) -> float:
+        return self._batch.sodium[self._index]
+
+    @property
+    def notes(self) -> tuple:
+        return self._batch.note_sets[self._batch.note_ids[self._index]]
+
+    def __repr__(self) -> str:
+        return f"RecommendationRow({self.crop!r}, row {self._index})"
@@ -0,0 +1,177 @@
+"""Catalogue of the advisory notes attached to ``recommend_all`` results.
+
+Each note has a stable :class:`NoteCode` and positional parameters.  The
+engine builds ``(code, params)`` tuples and renders text only when asked:
+``recommend_all`` renders every note, while ``recommend_all_coded`` leaves
+them coded so batch output can carry codes plus one shared catalogue.
+
+Codes equal the bit positions of :class:`rb209.vector.NoteFlag`, so
+``NoteFlag(1 << code)`` is the flag for a code.  Two codes are backed by
+data tables rather than a template:
+
+* ``CROP_NOTE``, params ``(crop,)``: the crop's entry in ``CROP_INFO``.
+* ``SODIUM``, params ``(key, line)``: line *line* of ``SODIUM_NOTES[key]``.
+"""
+
+from enum import IntEnum
+
+from rb209.data import lazy_import
+from rb209.data.crops import CROP_INFO
+
+_sodium = lazy_import("rb209.data.sodium")
+
+
+class NoteCode(IntEnum):
+    """Stable note identifiers.  Never renumber; only append."""
+    STRAW_REMOVED = 0
+    STRAW_INCORPORATED = 1
+    CROP_NOTE = 2
+    N_FIXING = 3
+    VEG_SEEDBED_CAP = 4
+    ASPARAGUS = 5
+    CELERY_TOP_DRESSING = 6
+    TISSUE_NITRATE = 7
+    LEEKS_CLOSED_PERIOD = 8
+    VEG_K_INDEX_2 = 9
+    NVZ_NMAX = 10
+    POTATO_POTASH_SPLIT = 11
+    SILAGE_POTASH_LIMIT = 12
+    HYPOMAGNESAEMIA = 13
+    CLOVER = 14
+    COMBINE_DRILL_LIMIT = 15
+    YIELD_ADJUSTED = 16
+    BER_ADJUSTED = 17
+    TIMING_HINT = 18
+    SODIUM = 19
+
+
+# Module-level aliases (as the re module does for RegexFlag): reading a
+# module global is much cheaper than an enum class attribute, and the engine
+# builds notes on every call.
+globals().update(NoteCode.__members__)
+
+# str.format templates; positional fields are the note's params.
+TEMPLATES: dict[NoteCode, str] = {
+    NoteCode.STRAW_REMOVED: "K recommendation assumes straw removed.",
+    NoteCode.STRAW_INCORPORATED: "K recommendation assumes straw incorporated.",
+    NoteCode.N_FIXING: "N-fixing crop: no fertiliser nitrogen required.",
+    NoteCode.VEG_SEEDBED_CAP: (
+        "Apply no more than 100 kg N/ha in the seedbed. "
+        "Apply remainder after establishment."
+    ),
+    NoteCode.ASPARAGUS: (
+        "Year 2: apply 120 kg N/ha by end-Feb/early-Mar. "
+        "Year 3+: rate depends on winter rainfall (40–80 kg N/ha); seek FACTS advice."
+    ),
+    NoteCode.CELERY_TOP_DRESSING: "Apply 75–150 kg N/ha top dressing 4–6 weeks after planting.",
+    NoteCode.TISSUE_NITRATE: (
+        "Reduce N for late-season crops to comply with EU/UK tissue-nitrate limits."
+    ),
+    NoteCode.LEEKS_CLOSED_PERIOD: (
+        "Do not apply fertiliser N during the NVZ closed period "
+        "without written FACTS Qualified Adviser recommendation."
+    ),
+    NoteCode.VEG_K_INDEX_2: (
+        "K Index 2 is split into 2- (121–180 mg/l) and 2+ (181–240 mg/l). "
+        "Use --k-upper-half flag if soil K is in the upper half."
+    ),
+    NoteCode.NVZ_NMAX: (
+        "N recommendation ({0:.0f} kg/ha) exceeds the NVZ N-max limit "
+        "({1:.0f} kg/ha) for this crop type. "
+        "The N-max applies as a whole-farm average."
+    ),
+    NoteCode.POTATO_POTASH_SPLIT: (
+        "K2O recommendation ({0:.0f} kg/ha) exceeds 300 kg/ha. "
+        "Apply half in late autumn/winter and half in spring."
+    ),
+    NoteCode.SILAGE_POTASH_LIMIT: (
+        "Limit spring K2O application for 1st cut to 80-90 kg/ha "
+        "to minimise luxury uptake. Apply balance in previous autumn."
+    ),
+    NoteCode.HYPOMAGNESAEMIA: (
+        "Mg Index 0 on grassland: risk of hypomagnesaemia (grass staggers). "
+        "Avoid applying potash in spring. Apply 50-100 kg MgO/ha every 3-4 years."
+    ),
+    NoteCode.CLOVER: (
+        "Mineral N inhibits clover N fixation. If the sward contains "
+        "significant clover, reduce or omit N applications."
+    ),
+    NoteCode.COMBINE_DRILL_LIMIT: (
+        "On sandy soils, do not combine-drill more than 150 kg/ha of N + K2O "
+        "(current total: {0:.0f} kg/ha). Risk of seedling damage."
+    ),
+    NoteCode.YIELD_ADJUSTED: (
+        "Recommendations adjusted for expected yield of {0:.1f} t/ha "
+        "(baseline: {1:.1f} t/ha)."
+    ),
+    NoteCode.BER_ADJUSTED: (
+        "N adjusted for break-even ratio {0:.1f} "
+        "({1:+.0f} kg/ha from default BER 5.0)."
+    ),
+    NoteCode.TIMING_HINT: (
+        "Run 'rb209 timing --crop {0} --total-n {1:.0f}' for "
+        "N application timing guidance."
+    ),
+}
+
+
+# Rendered texts keyed by (code, params).  Seeded with every note whose
+# params come from a finite set, then memoises parametric notes up to
+# _MAX_TEXTS entries (yield and BER notes carry arbitrary floats).
+_texts: dict[tuple[int, tuple], str] = {}
+_MAX_TEXTS = 8192
+
+
+def rendered_texts() -> dict[tuple[int, tuple], str]:
+    """Return the memo of rendered note texts, keyed by ``(code, params)``.
+
+    ``rendered_texts().get(note)`` is the fast path for rendering many
+    coded notes; fall back to :func:`render` on a miss.
+    """
+    if not _texts:
+        for code, template in TEMPLATES.items():
+            if "{" not in template:
+                _texts[(code, ())] = template
+        for crop, info in CROP_INFO.items():
+            if info.get("notes"):
+                _texts[(NoteCode.CROP_NOTE, (crop,))] = info["notes"]
+        for key, lines in _sodium.SODIUM_NOTES.items():
+            for line, text in enumerate(lines):
+                _texts[(NoteCode.SODIUM, (key, line))] = text
+    return _texts
+
+
+def render(code: int, params: tuple = ()) -> str:
+    """Return the text of one note.
+
+    Raises:
+        ValueError: If *code* and *params* do not name a note.
+    """
+    texts = rendered_texts()
+    key = (code, params)
+    text = texts.get(key)
+    if text is not None:
+        return text
+    template = TEMPLATES.get(code)
+    if template is None or "{" not in template:
+        raise ValueError(f"Unknown note {code!r} with params {params!r}")
+    text = template.format(*params)
+    if len(texts) < _MAX_TEXTS:
+        texts[key] = text
+    return text
+
+
+def catalogue() -> dict:
+    """Return everything needed to render coded notes without rb209.
+
+    The result is JSON-serialisable: ``codes`` maps names to codes,
+    ``templates`` maps codes (as strings) to ``str.format`` templates, and
+    ``crop_notes`` and ``sodium_notes`` hold the texts for ``CROP_NOTE`` and
+    ``SODIUM`` notes.
+    """
+    return {
+        "codes": {code.name: code.value for code in NoteCode},
+        "templates": {str(code.value): text for code, text in TEMPLATES.items()},
+        "crop_notes": {crop: info["notes"] for crop, info in CROP_INFO.items() if info.get("notes")},
+        "sodium_notes": {key: list(lines) for key, lines in _sodium.SODIUM_NOTES.items()},
+    }
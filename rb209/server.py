@@ -0,0 +1,173 @@
+"""Long-running JSON-RPC server for the recommendation engine.
+
+Starting a Python process and importing every RB209 table costs far more
+than a single recommendation.  ``rb209 serve`` pays that cost once and then
+answers newline-delimited JSON-RPC 2.0 requests over a Unix socket or a TCP
+port, serving many clients concurrently with asyncio.
+
+Each request is one line::
+
+    {"jsonrpc": "2.0", "id": 1, "method": "recommend_all",
+     "params": {"crop": "winter-wheat-feed", "sns_index": 2, "p_index": 2, "k_index": 1}}
+
+and each response is one line whose ``result`` is the same object that
+``--format json`` prints for the equivalent CLI command.
+"""
+
+import asyncio
+import json
+import sys
+
+from rb209.engine import (
+    calculate_lime,
+    calculate_organic,
+    calculate_sns,
+    nitrogen_timing,
+    recommend_all,
+    recommend_fruit_all,
+)
+from rb209.formatters import to_dict
+
+# Method name -> engine function.  Every function returns a dataclass.
+METHODS = {
+    "recommend_all": recommend_all,
+    "calculate_sns": calculate_sns,
+    "nitrogen_timing": nitrogen_timing,
+    "calculate_organic": calculate_organic,
+    "calculate_lime": calculate_lime,
+    "recommend_fruit_all": recommend_fruit_all,
+}
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Application error: the engine rejected the inputs (ValueError).
+ENGINE_ERROR = -32000
+
+# Longest accepted request line, in bytes.
+MAX_LINE = 1 << 20
+
+
+def _error(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def dispatch(request) -> dict | None:
+    """Run one decoded JSON-RPC request and return the response object.
+
+    Returns ``None`` for notifications (requests without an ``id``), which
+    get no response.
+    """
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error(None, INVALID_REQUEST, "Request must be an object with a 'method' string")
+
+    request_id = request.get("id")
+    is_notification = "id" not in request
+    func = METHODS.get(request["method"])
+    if func is None:
+        valid = ", ".join(METHODS)
+        response = _error(
+            request_id, METHOD_NOT_FOUND,
+            f"Unknown method '{request['method']}'. Valid methods: {valid}",
+        )
+        return None if is_notification else response
+
+    params = request.get("params", {})
+    if isinstance(params, dict) and "trusted" in params:
+        # trusted=True skips the engine's validation; it is for in-process
+        # callers that have checked their inputs, never for remote clients.
+        response = _error(request_id, INVALID_PARAMS, "Parameter 'trusted' is not accepted")
+        return None if is_notification else response
+    try:
+        if isinstance(params, dict):
+            result = func(**params)
+        elif isinstance(params, list):
+            result = func(*params)
+        else:
+            raise TypeError("params must be an object or an array")
+    except TypeError as exc:
+        response = _error(request_id, INVALID_PARAMS, str(exc))
+    except ValueError as exc:
+        response = _error(request_id, ENGINE_ERROR, str(exc))
+    except Exception as exc:
+        # Any other failure is answered, not allowed to end the connection.
+        response = _error(request_id, INTERNAL_ERROR, f"Internal error: {exc!r}")
+    else:
+        response = {"jsonrpc": "2.0", "id": request_id, "result": to_dict(result)}
+    return None if is_notification else response
+
+
+def handle_line(line: bytes | str) -> str | None:
+    """Decode one request line, dispatch it, and return the encoded response.
+
+    Returns ``None`` when no response should be sent.
+    """
+    try:
+        request = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        return json.dumps(_error(None, PARSE_ERROR, f"Parse error: {exc}"))
+    response = dispatch(request)
+    return None if response is None else json.dumps(response)
+
+
+async def _serve_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Line longer than MAX_LINE; the stream cannot be resynchronised.
+                writer.write(json.dumps(_error(None, INVALID_REQUEST, "Request too long")).encode())
+                writer.write(b"\n")
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            response = handle_line(line)
+            if response is not None:
+                writer.write(response.encode())
+                writer.write(b"\n")
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def preload() -> None:
+    """Load every lazily imported table module so no request pays for it."""
+    for name, module in list(sys.modules.items()):
+        if name.startswith("rb209.") and module is not None:
+            vars(module)
+
+
+async def start_server(
+    socket_path: str | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> asyncio.AbstractServer:
+    """Start listening and return the asyncio server.
+
+    Listens on the Unix socket *socket_path* when given, otherwise on
+    *host*:*port* (port 0 picks a free port).  Every table is loaded with
+    :func:`preload` before the socket is bound.
+    """
+    preload()
+    if socket_path is not None:
+        return await asyncio.start_unix_server(_serve_client, path=socket_path, limit=MAX_LINE)
+    return await asyncio.start_server(_serve_client, host=host, port=port, limit=MAX_LINE)
+
+
+async def serve_forever(
+    socket_path: str | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> None:
+    """Start the server and run until cancelled."""
+    server = await start_server(socket_path, host, port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,121 @@
+"""Compiled lookup tables for the recommendation engine.
+
+The RB209 tables in ``rb209.data`` are keyed by tuples such as
+``(crop, sns_index)``, and several nutrients are spread across more than one
+dict that must be probed in a fixed order (soil-specific, then generic, then
+vegetable).  This module resolves those fallback chains once, at import,
+into flat tuples indexed by small integers so that each engine lookup is a
+single indexed read.  Combinations with no table entry are stored as
+``None``.
+
+Values are kept as the original Python numbers (not converted to floats) so
+the engine returns exactly what the source tables hold.
+"""
+
+from rb209.data.crops import CROP_INFO
+from rb209.data.nitrogen import (
+    NITROGEN_RECOMMENDATIONS,
+    NITROGEN_SOIL_SPECIFIC,
+    NITROGEN_VEG_RECOMMENDATIONS,
+)
+from rb209.data.phosphorus import PHOSPHORUS_RECOMMENDATIONS, PHOSPHORUS_VEG_RECOMMENDATIONS
+from rb209.data.potassium import (
+    POTASSIUM_RECOMMENDATIONS,
+    POTASSIUM_STRAW_INCORPORATED,
+    POTASSIUM_STRAW_REMOVED,
+    POTASSIUM_VEG_RECOMMENDATIONS,
+    POTASSIUM_VEG_K2_UPPER,
+)
+from rb209.models import SoilType
+
+# ── Integer codes ───────────────────────────────────────────────────
+
+# Crop slugs in sorted order; a crop's id is its position in this tuple.
+CROPS: tuple[str, ...] = tuple(sorted(CROP_INFO))
+CROP_ID: dict[str, int] = {crop: i for i, crop in enumerate(CROPS)}
+
+# Soil id 0 means "no soil type given"; 1.. follow SoilType declaration order.
+SOIL_TYPES: tuple[str | None, ...] = (None, *(s.value for s in SoilType))
+SOIL_ID: dict[str, int] = {soil: i for i, soil in enumerate(SOIL_TYPES) if soil is not None}
+
+N_CROPS = len(CROPS)
+N_SNS = 7        # SNS index 0-6
+N_SOILS = len(SOIL_TYPES)
+N_INDEX = 5      # P/K/Mg index after clamping to 0-4
+
+
+# ── Nitrogen: [crop_id, sns_index, soil_id] ─────────────────────────
+
+def _resolve_nitrogen(crop: str, sns_index: int, soil_type: str | None) -> float | None:
+    if soil_type is not None:
+        value = NITROGEN_SOIL_SPECIFIC.get((crop, sns_index, soil_type))
+        if value is not None:
+            return value
+    key = (crop, sns_index)
+    if key in NITROGEN_RECOMMENDATIONS:
+        return NITROGEN_RECOMMENDATIONS[key]
+    return NITROGEN_VEG_RECOMMENDATIONS.get(key)
+
+
+NITROGEN: tuple[float | None, ...] = tuple(
+    _resolve_nitrogen(crop, sns, soil)
+    for crop in CROPS
+    for sns in range(N_SNS)
+    for soil in SOIL_TYPES
+)
+
+
+def nitrogen_offset(crop_id: int, sns_index: int, soil_id: int) -> int:
+    """Return the position of ``[crop_id, sns_index, soil_id]`` in NITROGEN."""
+    return (crop_id * N_SNS + sns_index) * N_SOILS + soil_id
+
+
+# ── Phosphorus: [crop_id, clamped p_index] ─────────────────────────
+
+def _resolve_phosphorus(crop: str, p_index: int) -> float | None:
+    key = (crop, p_index)
+    if key in PHOSPHORUS_RECOMMENDATIONS:
+        return PHOSPHORUS_RECOMMENDATIONS[key]
+    return PHOSPHORUS_VEG_RECOMMENDATIONS.get(key)
+
+
+PHOSPHORUS: tuple[float | None, ...] = tuple(
+    _resolve_phosphorus(crop, idx) for crop in CROPS for idx in range(N_INDEX)
+)
+
+
+def phosphorus_offset(crop_id: int, p_index: int) -> int:
+    """Return the position of ``[crop_id, p_index]`` in PHOSPHORUS."""
+    return crop_id * N_INDEX + p_index
+
+
+# ── Potassium: [crop_id, clamped k_index, straw_removed, k_upper_half] ─
+
+def _resolve_potassium(
+    crop: str, k_index: int, straw_removed: bool, k_upper_half: bool,
+) -> float | None:
+    key = (crop, k_index)
+    if k_index == 2 and k_upper_half and crop in POTASSIUM_VEG_K2_UPPER:
+        return POTASSIUM_VEG_K2_UPPER[crop]
+    if CROP_INFO[crop].get("has_straw_option"):
+        table = POTASSIUM_STRAW_REMOVED if straw_removed else POTASSIUM_STRAW_INCORPORATED
+        if key in table:
+            return table[key]
+        return POTASSIUM_RECOMMENDATIONS.get(key)
+    if key in POTASSIUM_RECOMMENDATIONS:
+        return POTASSIUM_RECOMMENDATIONS[key]
+    return POTASSIUM_VEG_RECOMMENDATIONS.get(key)
+
+
+POTASSIUM: tuple[float | None, ...] = tuple(
+    _resolve_potassium(crop, idx, straw, upper)
+    for crop in CROPS
+    for idx in range(N_INDEX)
+    for straw in (False, True)
+    for upper in (False, True)
+)
+
+
+def potassium_offset(crop_id: int, k_index: int, straw_removed: bool, k_upper_half: bool) -> int:
+    """Return the position of ``[crop_id, k_index, straw_removed, k_upper_half]`` in POTASSIUM."""
+    return ((crop_id * N_INDEX + k_index) * 2 + straw_removed) * 2 + k_upper_half
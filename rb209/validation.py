@@ -0,0 +1,216 @@
+"""Up-front validation of engine arguments for batch work.
+
+Every engine entry point validates its own arguments, and ``recommend_all``
+re-validates the crop and indices in each nutrient function it calls.  For a
+batch, check the inputs once with the functions here, then call the engine
+with ``trusted=True`` to skip those checks::
+
+    check_batch(rows, recommend_errors)
+    results = [recommend_all(**row, trusted=True) for row in rows]
+
+Membership tests use the precomputed frozensets below.  Error messages are
+the ones the engine itself would raise, but every problem with an input is
+reported rather than only the first.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+
+from rb209.data import lazy_import
+from rb209.data.crops import CROP_INFO
+from rb209.models import OrganicMaterial, PreviousCrop, Rainfall, SoilType
+
+_yield = lazy_import("rb209.data.yield_adjustments")
+
+CROPS: frozenset[str] = frozenset(CROP_INFO)
+SOIL_TYPES: frozenset[str] = frozenset(s.value for s in SoilType)
+PREVIOUS_CROPS: frozenset[str] = frozenset(p.value for p in PreviousCrop)
+RAINFALL: frozenset[str] = frozenset(r.value for r in Rainfall)
+ORGANIC_MATERIALS: frozenset[str] = frozenset(m.value for m in OrganicMaterial)
+ORGANIC_TIMINGS: frozenset[str] = frozenset({"autumn", "winter", "spring", "summer"})
+
+# At most this many invalid inputs are spelled out in a BatchValidationError
+# message; BatchValidationError.errors always holds all of them.
+MAX_REPORTED = 5
+
+
+class BatchValidationError(ValueError):
+    """Raised by :func:`check_batch` when one or more inputs are invalid.
+
+    Attributes:
+        errors: ``(position, messages)`` for every invalid input, in order.
+        total: Number of inputs checked.
+    """
+
+    def __init__(self, errors: list[tuple[int, list[str]]], total: int) -> None:
+        self.errors = errors
+        self.total = total
+        shown = "; ".join(
+            f"input {pos}: {', '.join(messages)}" for pos, messages in errors[:MAX_REPORTED]
+        )
+        more = len(errors) - MAX_REPORTED
+        if more > 0:
+            shown += f"; and {more} more"
+        super().__init__(f"{len(errors)} of {total} input(s) are invalid: {shown}")
+
+
+def _index_error(name: str, value, max_val: int) -> str | None:
+    if type(value) is not int or not 0 <= value <= max_val:
+        return f"{name} must be an integer between 0 and {max_val}, got {value!r}"
+    return None
+
+
+def _choice_error(label: str, value, valid: frozenset[str], order: Iterable[str]) -> str | None:
+    if value not in valid:
+        return f"Unknown {label} '{value}'. Valid options: {', '.join(order)}"
+    return None
+
+
+def recommend_errors(
+    crop: str,
+    sns_index: int,
+    p_index: int,
+    k_index: int,
+    mg_index: int = 2,
+    straw_removed: bool = True,
+    soil_type: str | None = None,
+    expected_yield: float | None = None,
+    ber: float | None = None,
+    k_upper_half: bool = False,
+) -> list[str]:
+    """Return every problem with a set of ``recommend_all`` arguments.
+
+    Arguments match :func:`rb209.engine.recommend_all`.  An empty list
+    means the arguments may be passed with ``trusted=True``.
+    """
+    # Fast path for the common, valid case.
+    if (
+        crop in CROPS
+        and type(sns_index) is int and 0 <= sns_index <= 6
+        and type(p_index) is int and 0 <= p_index <= 9
+        and type(k_index) is int and 0 <= k_index <= 9
+        and type(mg_index) is int and 0 <= mg_index <= 9
+        and (soil_type is None or soil_type in SOIL_TYPES)
+        and expected_yield is None and ber is None
+    ):
+        return []
+
+    errors = []
+    if crop not in CROPS:
+        errors.append(f"Unknown crop '{crop}'. Valid crops: {', '.join(sorted(CROPS))}")
+    for name, value, max_val in (
+        ("SNS index", sns_index, 6), ("P index", p_index, 9),
+        ("K index", k_index, 9), ("Mg index", mg_index, 9),
+    ):
+        error = _index_error(name, value, max_val)
+        if error:
+            errors.append(error)
+    if soil_type is not None:
+        error = _choice_error("soil type", soil_type, SOIL_TYPES, (s.value for s in SoilType))
+        if error:
+            errors.append(error)
+    for name, value in (("expected_yield", expected_yield), ("ber", ber)):
+        if value is not None and (type(value) is bool or not isinstance(value, (int, float))):
+            errors.append(f"{name} must be a number, got {value!r}")
+    if expected_yield is not None and crop in CROPS and crop not in _yield.YIELD_ADJUSTMENTS:
+        valid = ", ".join(sorted(_yield.YIELD_ADJUSTMENTS))
+        errors.append(
+            f"No yield adjustment data for crop '{crop}'. Supported crops: {valid}"
+        )
+    return errors
+
+
+def sns_errors(
+    previous_crop: str,
+    soil_type: str,
+    rainfall: str,
+    grass_history: dict | None = None,
+) -> list[str]:
+    """Return every problem with a set of ``calculate_sns`` arguments.
+
+    Only the three arguments skipped by ``calculate_sns(..., trusted=True)``
+    are checked; *grass_history* is always validated by the engine.
+    """
+    errors = []
+    for label, value, valid, enum in (
+        ("previous crop", previous_crop, PREVIOUS_CROPS, PreviousCrop),
+        ("soil type", soil_type, SOIL_TYPES, SoilType),
+        ("rainfall category", rainfall, RAINFALL, Rainfall),
+    ):
+        error = _choice_error(label, value, valid, (m.value for m in enum))
+        if error:
+            errors.append(error)
+    return errors
+
+
+def organic_errors(
+    material: str,
+    rate: float,
+    timing: str | None = None,
+    incorporated: bool = False,
+    soil_type: str | None = None,
+) -> list[str]:
+    """Return every problem with a set of ``calculate_organic`` arguments."""
+    errors = []
+    error = _choice_error(
+        "organic material", material, ORGANIC_MATERIALS, (m.value for m in OrganicMaterial),
+    )
+    if error:
+        errors.append(error)
+    if type(rate) is bool or not isinstance(rate, (int, float)):
+        errors.append(f"rate must be a number, got {rate!r}")
+    elif rate < 0:
+        errors.append("Application rate must be non-negative")
+    if timing is not None:
+        error = _choice_error(
+            "timing", timing, ORGANIC_TIMINGS, ("autumn", "winter", "spring", "summer"),
+        )
+        if error:
+            errors.append(error)
+    if soil_type is not None:
+        error = _choice_error("soil type", soil_type, SOIL_TYPES, (s.value for s in SoilType))
+        if error:
+            errors.append(error)
+    return errors
+
+
+def validate_batch(
+    inputs: Iterable[Mapping],
+    check: Callable[..., list[str]],
+) -> list[tuple[int, list[str]]]:
+    """Check keyword-argument mappings with *check* and collect the failures.
+
+    Args:
+        inputs: One mapping of keyword arguments per engine call.
+        check: :func:`recommend_errors`, :func:`sns_errors` or
+            :func:`organic_errors`.
+
+    Returns:
+        ``(position, messages)`` for each invalid input, in input order.  A
+        missing or unexpected keyword is reported as an error, not raised.
+    """
+    failures = []
+    for pos, kwargs in enumerate(inputs):
+        try:
+            errors = check(**kwargs)
+        except TypeError as exc:
+            errors = [str(exc)]
+        if errors:
+            failures.append((pos, errors))
+    return failures
+
+
+def check_batch(inputs: Iterable[Mapping], check: Callable[..., list[str]]) -> None:
+    """Raise :class:`BatchValidationError` unless every input passes *check*.
+
+    Args:
+        inputs: One mapping of keyword arguments per engine call.  Pass a
+            sequence, not an iterator, if the inputs are used afterwards.
+        check: As for :func:`validate_batch`.
+
+    Raises:
+        BatchValidationError: Listing every invalid input.
+    """
+    inputs = list(inputs)
+    failures = validate_batch(inputs, check)
+    if failures:
+        raise BatchValidationError(failures, len(inputs))
@@ -0,0 +1,1153 @@
+"""Columnar engine — recommendations for many field inputs at once.
+
+Functions here take columns (any sequence, including ``array.array`` or
+NumPy arrays) and return ``array.array`` columns, so scenario models can
+evaluate millions of combinations without building a
+``NutrientRecommendation`` per row.  Output arrays support the buffer
+protocol and can be wrapped without copying, e.g. ``numpy.frombuffer``.
+
+All table lookups go through the integer-indexed tables in
+``rb209.tables``; per-crop constants (yield factors, BER group, note flags)
+are compiled once at import.  Advisory notes are returned as
+:class:`NoteFlag` bit sets rather than strings.
+"""
+
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from enum import IntFlag
+from functools import partial
+
+from rb209.data.ber import BER_BREAKPOINTS, CROP_BER_GROUP
+from rb209.data.crops import CROP_INFO
+from rb209.data.lime import LIME_FACTORS, MAX_SINGLE_APPLICATION, TARGET_PH
+from rb209.data.magnesium import MAGNESIUM_RECOMMENDATIONS, VEG_MAGNESIUM_RECOMMENDATIONS
+from rb209.data.nitrogen import NVZ_NMAX
+from rb209.data.sns import (
+    GRASS_LEY_SNS,
+    LEY_AGE_ID,
+    LEY_AGES,
+    LEY_MANAGEMENT_ID,
+    LEY_MANAGEMENTS,
+    LEY_N_INTENSITIES,
+    LEY_N_INTENSITY_ID,
+    LEY_RAINFALL_ID,
+    LEY_SOIL_ID,
+    SNS_LOOKUP,
+    SNS_VALUE_BOUNDS,
+    VEG_SMN_BOUNDS,
+    VEG_SNS_LOOKUP,
+    VEG_SNS_ORGANIC_ADVISORY,
+    grass_ley_offset,
+)
+from rb209.data.sodium import (
+    SODIUM_FLAT_RATES,
+    SODIUM_GRASSLAND_CROPS,
+    SODIUM_GRASSLAND_RATE,
+    SODIUM_NOTES,
+    SODIUM_RECOMMENDATIONS,
+)
+from rb209.data.organic import (
+    AVAILABLE_N_GRID,
+    ORGANIC_MATERIAL_INFO,
+    ORGANIC_TIMINGS,
+    TIMING_SOIL_CATEGORIES,
+    TIMING_SOIL_CATEGORY,
+)
+from rb209.data.sulfur import SULFUR_RECOMMENDATIONS
+from rb209.data.timing import NITROGEN_TIMING_RULES
+from rb209.data.yield_adjustments import YIELD_ADJUSTMENTS
+from rb209.engine import _interpolate_ber, calculate_lime
+from rb209.models import (
+    PREVIOUS_CROP_N_CATEGORY,
+    NResidueCategory,
+    OrganicMaterial,
+    PreviousCrop,
+    Rainfall,
+    SoilType,
+    VegPreviousCrop,
+    VegSoilType,
+)
+from rb209.tables import (
+    CROP_ID,
+    CROPS,
+    NITROGEN,
+    PHOSPHORUS,
+    POTASSIUM,
+    SOIL_ID,
+    SOIL_TYPES,
+    nitrogen_offset,
+    phosphorus_offset,
+    potassium_offset,
+)
+
+NAN = float("nan")
+
+
+class NoteFlag(IntFlag):
+    """Advisory notes that ``recommend_all`` would attach, one bit each."""
+    STRAW_REMOVED = 1 << 0
+    STRAW_INCORPORATED = 1 << 1
+    CROP_NOTE = 1 << 2
+    N_FIXING = 1 << 3
+    VEG_SEEDBED_CAP = 1 << 4
+    ASPARAGUS = 1 << 5
+    CELERY_TOP_DRESSING = 1 << 6
+    TISSUE_NITRATE = 1 << 7
+    LEEKS_CLOSED_PERIOD = 1 << 8
+    VEG_K_INDEX_2 = 1 << 9
+    NVZ_NMAX = 1 << 10
+    POTATO_POTASH_SPLIT = 1 << 11
+    SILAGE_POTASH_LIMIT = 1 << 12
+    HYPOMAGNESAEMIA = 1 << 13
+    CLOVER = 1 << 14
+    COMBINE_DRILL_LIMIT = 1 << 15
+    YIELD_ADJUSTED = 1 << 16
+    BER_ADJUSTED = 1 << 17
+    TIMING_HINT = 1 << 18
+    SODIUM = 1 << 19
+
+
+# ── Per-crop constants ──────────────────────────────────────────────
+
+_N_FIXING_CROPS = frozenset({"peas", "field-beans", "veg-peas-market", "veg-beans-broad"})
+_VEG_SEEDBED_CAP_CROPS = frozenset({
+    "veg-beans-dwarf", "veg-radish", "veg-sweetcorn", "veg-beetroot",
+    "veg-swedes", "veg-turnips-parsnips", "veg-carrots", "veg-coriander",
+})
+_TISSUE_NITRATE_CROPS = frozenset({"veg-lettuce-whole", "veg-lettuce-baby", "veg-rocket"})
+_SODIUM_INDEX_CROPS = frozenset(c for (c, _) in SODIUM_RECOMMENDATIONS)
+
+
+def _static_flags(crop: str) -> int:
+    """Return note flags that depend only on the crop."""
+    info = CROP_INFO[crop]
+    flags = 0
+    if info.get("notes"):
+        flags |= NoteFlag.CROP_NOTE
+    if crop == "veg-asparagus":
+        flags |= NoteFlag.ASPARAGUS
+    if crop == "veg-celery-seedbed":
+        flags |= NoteFlag.CELERY_TOP_DRESSING
+    if crop in _TISSUE_NITRATE_CROPS:
+        flags |= NoteFlag.TISSUE_NITRATE
+    if crop == "veg-leeks":
+        flags |= NoteFlag.LEEKS_CLOSED_PERIOD
+    return int(flags)
+
+
+_CATEGORY = tuple(CROP_INFO[c]["category"] for c in CROPS)
+_IS_VEG = tuple(cat == "vegetables" for cat in _CATEGORY)
+_HAS_STRAW = tuple(bool(CROP_INFO[c].get("has_straw_option")) for c in CROPS)
+_CLOVER_RISK = tuple(bool(CROP_INFO[c].get("clover_risk")) for c in CROPS)
+_STATIC_FLAGS = tuple(_static_flags(c) for c in CROPS)
+_SULFUR = tuple(SULFUR_RECOMMENDATIONS.get(c) for c in CROPS)
+_NVZ_NMAX = tuple(NVZ_NMAX.get(c) for c in CROPS)
+_N_FIXING = tuple(c in _N_FIXING_CROPS for c in CROPS)
+_SEEDBED_CAP = tuple(c in _VEG_SEEDBED_CAP_CROPS for c in CROPS)
+_IS_POTATO = tuple(c.startswith("potatoes-") for c in CROPS)
+_HAS_TIMING = tuple(c in NITROGEN_TIMING_RULES for c in CROPS)
+_BER_GROUP = tuple(CROP_BER_GROUP.get(c) for c in CROPS)
+_YIELD = tuple(YIELD_ADJUSTMENTS.get(c) for c in CROPS)
+_GRASS_SILAGE = CROP_ID["grass-silage"]
+_LIGHT = SOIL_ID["light"]
+_MAGNESIUM = tuple(MAGNESIUM_RECOMMENDATIONS[i] for i in range(5))
+_VEG_MAGNESIUM = tuple(VEG_MAGNESIUM_RECOMMENDATIONS[i] for i in range(5))
+
+
+def _sodium_row(crop: str) -> tuple[float, ...]:
+    """Sodium by clamped K index (0-4) for one crop, as recommend_sodium."""
+    if crop in _SODIUM_INDEX_CROPS:
+        return tuple(SODIUM_RECOMMENDATIONS.get((crop, k), 0.0) for k in range(5))
+    if crop in SODIUM_FLAT_RATES:
+        return (SODIUM_FLAT_RATES[crop],) * 5
+    if crop in SODIUM_GRASSLAND_CROPS:
+        return (SODIUM_GRASSLAND_RATE,) * 5
+    return (0.0,) * 5
+
+
+def _sodium_notes_apply(crop: str, na: float) -> bool:
+    """Mirror the sodium note selection in recommend_all."""
+    if na > 0:
+        if crop in SODIUM_NOTES:
+            return True
+        return CROP_INFO[crop]["category"] == "grassland" and "grassland" in SODIUM_NOTES
+    return crop in SODIUM_NOTES
+
+
+_SODIUM = tuple(_sodium_row(c) for c in CROPS)
+# [crop_id][clamped k] -> whether sodium notes are attached.
+_SODIUM_NOTE = tuple(
+    tuple(_sodium_notes_apply(c, na) for na in row) for c, row in zip(CROPS, _SODIUM)
+)
+
+
+# Plain-int copies of the flags: IntFlag arithmetic is slow in the row loop.
+_F_BER_ADJUSTED = NoteFlag.BER_ADJUSTED.value
+_F_CLOVER = NoteFlag.CLOVER.value
+_F_COMBINE_DRILL_LIMIT = NoteFlag.COMBINE_DRILL_LIMIT.value
+_F_HYPOMAGNESAEMIA = NoteFlag.HYPOMAGNESAEMIA.value
+_F_NVZ_NMAX = NoteFlag.NVZ_NMAX.value
+_F_N_FIXING = NoteFlag.N_FIXING.value
+_F_POTATO_POTASH_SPLIT = NoteFlag.POTATO_POTASH_SPLIT.value
+_F_SILAGE_POTASH_LIMIT = NoteFlag.SILAGE_POTASH_LIMIT.value
+_F_SODIUM = NoteFlag.SODIUM.value
+_F_STRAW_INCORPORATED = NoteFlag.STRAW_INCORPORATED.value
+_F_STRAW_REMOVED = NoteFlag.STRAW_REMOVED.value
+_F_TIMING_HINT = NoteFlag.TIMING_HINT.value
+_F_VEG_K_INDEX_2 = NoteFlag.VEG_K_INDEX_2.value
+_F_VEG_SEEDBED_CAP = NoteFlag.VEG_SEEDBED_CAP.value
+_F_YIELD_ADJUSTED = NoteFlag.YIELD_ADJUSTED.value
+
+
+# ── Column helpers ──────────────────────────────────────────────────
+
+def _column(name: str, values, n: int, default):
+    """Return *values* as a sequence of length *n*.
+
+    ``None`` gives *default* for every row; a scalar is repeated.
+    """
+    if values is None:
+        return (default,) * n
+    if isinstance(values, (str, bytes)) or not hasattr(values, "__len__"):
+        return (values,) * n
+    if len(values) != n:
+        raise ValueError(f"Column '{name}' has {len(values)} rows, expected {n}")
+    return values
+
+
+def _crop_ids(crops) -> list[int]:
+    ids = []
+    for row, crop in enumerate(crops):
+        if isinstance(crop, str):
+            crop_id = CROP_ID.get(crop)
+            if crop_id is None:
+                raise ValueError(f"Unknown crop '{crop}' at row {row}")
+        else:
+            crop_id = int(crop)
+            if not 0 <= crop_id < len(CROPS):
+                raise ValueError(f"Unknown crop id {crop_id} at row {row}")
+        ids.append(crop_id)
+    return ids
+
+
+def _soil_id(row: int, soil) -> int:
+    if soil is None:
+        return 0
+    if isinstance(soil, str):
+        soil_id = SOIL_ID.get(soil)
+        if soil_id is None:
+            valid = ", ".join(s for s in SOIL_TYPES if s)
+            raise ValueError(f"Unknown soil type '{soil}' at row {row}. Valid options: {valid}")
+        return soil_id
+    soil_id = int(soil)
+    if not 0 <= soil_id < len(SOIL_TYPES):
+        raise ValueError(f"Unknown soil id {soil_id} at row {row}")
+    return soil_id
+
+
+def _index(name: str, row: int, value, max_val: int) -> int:
+    try:
+        index = int(value)
+    except (TypeError, ValueError, OverflowError):
+        index = None
+    if index is None or index != value or not 0 <= index <= max_val:
+        raise ValueError(
+            f"{name} must be an integer between 0 and {max_val}, got {value!r} at row {row}"
+        )
+    return index
+
+
+def _optional(value) -> float | None:
+    """Treat None and NaN as "not given"."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _adjust(value: float, delta: float) -> float:
+    """Apply an adjustment floored at zero, leaving missing (NaN) values alone."""
+    return value if math.isnan(value) else max(0.0, value + delta)
+
+
+# ── Full recommendation ────────────────────────────────────────────
+
+def recommend_all_array(
+    crop,
+    sns_index,
+    p_index,
+    k_index,
+    mg_index=None,
+    straw_removed=None,
+    soil_type=None,
+    expected_yield=None,
+    ber=None,
+    k_upper_half=None,
+) -> dict[str, array]:
+    """Columnar equivalent of ``recommend_all``.
+
+    Args:
+        crop: Column of crop slugs or crop ids from ``rb209.tables.CROP_ID``.
+        sns_index: Column of SNS indices (0-6).
+        p_index: Column of soil P indices (0-9).
+        k_index: Column of soil K indices (0-9).
+        mg_index: Column of soil Mg indices (0-9); default 2.
+        straw_removed: Column of booleans; default True.
+        soil_type: Column of soil type strings or ids from
+            ``rb209.tables.SOIL_ID`` (``None``/0 for unspecified).
+        expected_yield: Column of expected yields (t/ha); NaN or ``None``
+            means no yield adjustment for that row.
+        ber: Column of break-even ratios; NaN or ``None`` means default.
+        k_upper_half: Column of booleans; default False.
+
+    Every optional argument may also be given as a single scalar that
+    applies to all rows.
+
+    Returns:
+        Dict of ``array('d')`` columns ``nitrogen``, ``phosphorus``,
+        ``potassium``, ``magnesium``, ``sulfur`` and ``sodium``, plus
+        ``notes``: an ``array('L')`` of :class:`NoteFlag` bit sets.  A
+        nutrient with no table entry for a row is NaN.
+
+    Raises:
+        ValueError: If a column has the wrong length, a crop or soil type
+            is unknown, an index is out of range, or a row requests a yield
+            adjustment for a crop without yield data.
+    """
+    crop_ids = _crop_ids(crop)
+    n_rows = len(crop_ids)
+    sns_col = _column("sns_index", sns_index, n_rows, None)
+    p_col = _column("p_index", p_index, n_rows, None)
+    k_col = _column("k_index", k_index, n_rows, None)
+    mg_col = _column("mg_index", mg_index, n_rows, 2)
+    straw_col = _column("straw_removed", straw_removed, n_rows, True)
+    soil_col = _column("soil_type", soil_type, n_rows, None)
+    yield_col = _column("expected_yield", expected_yield, n_rows, None)
+    ber_col = _column("ber", ber, n_rows, None)
+    upper_col = _column("k_upper_half", k_upper_half, n_rows, False)
+
+    out_n = array("d", [0.0]) * n_rows
+    out_p = array("d", [0.0]) * n_rows
+    out_k = array("d", [0.0]) * n_rows
+    out_mg = array("d", [0.0]) * n_rows
+    out_s = array("d", [0.0]) * n_rows
+    out_na = array("d", [0.0]) * n_rows
+    out_notes = array("L", [0]) * n_rows
+
+    ber_cache: dict[tuple[str, float], float] = {}
+
+    for row in range(n_rows):
+        cid = crop_ids[row]
+        sns = _index("SNS index", row, sns_col[row], 6)
+        p_idx = _index("P index", row, p_col[row], 9)
+        k_idx = _index("K index", row, k_col[row], 9)
+        mg_idx = _index("Mg index", row, mg_col[row], 9)
+        straw = bool(straw_col[row])
+        soil_id = _soil_id(row, soil_col[row])
+        ey = _optional(yield_col[row])
+        ber_value = _optional(ber_col[row])
+        cp = p_idx if p_idx < 4 else 4
+        ck = k_idx if k_idx < 4 else 4
+
+        n = NITROGEN[nitrogen_offset(cid, sns, soil_id)]
+        p = PHOSPHORUS[phosphorus_offset(cid, cp)]
+        k = POTASSIUM[potassium_offset(cid, ck, straw, bool(upper_col[row]))]
+        n = NAN if n is None else n
+        p = NAN if p is None else p
+        k = NAN if k is None else k
+
+        flags = _STATIC_FLAGS[cid]
+
+        if ey is not None:
+            adj = _YIELD[cid]
+            if adj is None:
+                raise ValueError(
+                    f"No yield adjustment data for crop '{CROPS[cid]}' at row {row}"
+                )
+            capped = min(ey, adj["max_yield"]) if "max_yield" in adj else ey
+            dy = capped - adj["baseline_yield"]
+            n = _adjust(n, dy * adj["n_adjust_per_t"])
+            p = _adjust(p, dy * adj["p_adjust_per_t"])
+            k = _adjust(k, dy * adj["k_adjust_per_t"])
+            flags |= _F_YIELD_ADJUSTED
+
+        group = _BER_GROUP[cid]
+        if ber_value is not None and group is not None:
+            key = (group, ber_value)
+            ber_adj = ber_cache.get(key)
+            if ber_adj is None:
+                ber_adj = ber_cache[key] = _interpolate_ber(group, ber_value)
+            n = _adjust(n, ber_adj)
+            flags |= _F_BER_ADJUSTED
+
+        s = _SULFUR[cid]
+        na = _SODIUM[cid][ck]
+        category = _CATEGORY[cid]
+
+        if _HAS_STRAW[cid]:
+            flags |= _F_STRAW_REMOVED if straw else _F_STRAW_INCORPORATED
+        if n == 0 and _N_FIXING[cid]:
+            flags |= _F_N_FIXING
+        if n > 0 and _SEEDBED_CAP[cid]:
+            flags |= _F_VEG_SEEDBED_CAP
+        if _IS_VEG[cid] and k_idx == 2:
+            flags |= _F_VEG_K_INDEX_2
+        limit = _NVZ_NMAX[cid]
+        if limit is not None and n > limit:
+            flags |= _F_NVZ_NMAX
+        if _IS_POTATO[cid] and k > 300:
+            flags |= _F_POTATO_POTASH_SPLIT
+        if cid == _GRASS_SILAGE and k > 90:
+            flags |= _F_SILAGE_POTASH_LIMIT
+        if category == "grassland" and mg_idx == 0 and k > 0:
+            flags |= _F_HYPOMAGNESAEMIA
+        if _CLOVER_RISK[cid] and n > 0:
+            flags |= _F_CLOVER
+        if soil_id == _LIGHT and (n + k) > 150 and category == "arable":
+            flags |= _F_COMBINE_DRILL_LIMIT
+        if n > 0 and _HAS_TIMING[cid]:
+            flags |= _F_TIMING_HINT
+        if _SODIUM_NOTE[cid][ck]:
+            flags |= _F_SODIUM
+
+        out_n[row] = n
+        out_p[row] = p
+        out_k[row] = k
+        out_mg[row] = (_VEG_MAGNESIUM if _IS_VEG[cid] else _MAGNESIUM)[mg_idx if mg_idx < 4 else 4]
+        out_s[row] = NAN if s is None else s
+        out_na[row] = na
+        out_notes[row] = flags
+
+    return {
+        "nitrogen": out_n,
+        "phosphorus": out_p,
+        "potassium": out_k,
+        "magnesium": out_mg,
+        "sulfur": out_s,
+        "sodium": out_na,
+        "notes": out_notes,
+    }
+
+
+# ── BER price sensitivity ──────────────────────────────────────────
+
+# Per group: breakpoints, their adjustments, and per-segment
+# (b_lo, b_hi - b_lo, adj_lo, adj_hi - adj_lo) for interpolation.
+_BER_SEGMENTS = {
+    group: (bers, adjs, tuple(
+        (bers[i], bers[i + 1] - bers[i], adjs[i], adjs[i + 1] - adjs[i])
+        for i in range(len(bers) - 1)
+    ))
+    for group, (bers, adjs) in BER_BREAKPOINTS.items()
+}
+
+
+def ber_curve(crop: str, ber_values) -> array:
+    """Return the N adjustment (kg N/ha) for each break-even ratio in *ber_values*.
+
+    Gives the same values as the adjustment ``recommend_nitrogen`` applies
+    for each ratio: linear interpolation in Tables 4.25/4.26, clamped at
+    the table ends.  The adjusted recommendation is ``max(0, N + adjustment)``.
+
+    Args:
+        crop: Crop value string.  Must be a crop with BER data (wheat or
+            barley).
+        ber_values: Break-even ratios; any sequence of numbers.  NaN gives
+            no adjustment.
+
+    Returns:
+        ``array('d')`` of adjustments, one per ratio.
+
+    Raises:
+        ValueError: If the crop is unknown or has no BER data.
+    """
+    if crop not in CROP_INFO:
+        valid = ", ".join(sorted(CROP_INFO))
+        raise ValueError(f"Unknown crop '{crop}'. Valid crops: {valid}")
+    group = CROP_BER_GROUP.get(crop)
+    if group is None:
+        valid = ", ".join(sorted(CROP_BER_GROUP))
+        raise ValueError(f"No BER adjustment data for crop '{crop}'. Supported crops: {valid}")
+
+    bers, adjs, segments = _BER_SEGMENTS[group]
+    first, last = bers[0], bers[-1]
+    adj_first, adj_last = adjs[0], adjs[-1]
+    out = []
+    append = out.append
+    for ber in ber_values:
+        ber = float(ber)
+        if ber <= first:
+            append(adj_first)
+        elif ber >= last:
+            append(adj_last)
+        elif ber != ber:
+            append(0.0)
+        else:
+            b_lo, width, adj_lo, rise = segments[bisect_right(bers, ber) - 1]
+            append(adj_lo + (ber - b_lo) / width * rise)
+    return array("d", out)
+
+
+# ── SNS (Tables 4.3-4.6) ────────────────────────────────────────────
+
+# Integer codes for SNS columns: a value's code is its position here.
+PREVIOUS_CROPS: tuple[str, ...] = tuple(p.value for p in PreviousCrop)
+SNS_SOILS: tuple[str, ...] = tuple(s.value for s in SoilType)
+RAINFALL: tuple[str, ...] = tuple(r.value for r in Rainfall)
+SNS_METHODS: tuple[str, ...] = ("field-assessment", "combined")
+
+_PREVIOUS_CROP_ID = {v: i for i, v in enumerate(PREVIOUS_CROPS)}
+_SNS_SOIL_ID = {v: i for i, v in enumerate(SNS_SOILS)}
+_RAINFALL_ID = {v: i for i, v in enumerate(RAINFALL)}
+_N_RESIDUE = tuple(c.value for c in NResidueCategory)
+_N_SNS_SOILS = len(SNS_SOILS)
+_N_RAINFALL = len(RAINFALL)
+
+# [SNS soil code] -> Table 4.6 soil code (None for organic soils).
+_LEY_SOIL = tuple(LEY_SOIL_ID.get(soil) for soil in SNS_SOILS)
+# [rainfall code] -> Table 4.6 rainfall code.
+_LEY_RAINFALL = tuple(LEY_RAINFALL_ID[rain] for rain in RAINFALL)
+
+# [previous crop code] -> N residue category code.
+_RESIDUE = bytes(
+    _N_RESIDUE.index(PREVIOUS_CROP_N_CATEGORY[PreviousCrop(p)].value) for p in PREVIOUS_CROPS
+)
+# [(residue * soils + soil) * rainfalls + rainfall] -> SNS index.
+_FIELD_SNS = bytes(
+    SNS_LOOKUP[(residue, soil, rain)]
+    for residue in _N_RESIDUE
+    for soil in SNS_SOILS
+    for rain in RAINFALL
+)
+
+
+def _codes(label: str, values, n: int, options: tuple[str, ...], ids: dict[str, int]) -> list[int]:
+    """Return a column of value strings or codes as a list of codes."""
+    column = _column(label, values, n, None)
+    codes = list(map(ids.get, column))
+    if None not in codes:
+        return codes
+
+    # Integer codes, or an invalid value to report.
+    codes = []
+    for row, value in enumerate(column):
+        if isinstance(value, str):
+            code = ids.get(value)
+            if code is None:
+                valid = ", ".join(options)
+                raise ValueError(f"Unknown {label} '{value}' at row {row}. Valid options: {valid}")
+        else:
+            if value is None:
+                raise ValueError(f"Missing {label} at row {row}")
+            code = int(value)
+            if not 0 <= code < len(options):
+                raise ValueError(f"Unknown {label} code {code} at row {row}")
+        codes.append(code)
+    return codes
+
+
+def calculate_sns_many(
+    previous_crop,
+    soil_type,
+    rainfall,
+    ley_age=None,
+    n_intensity=None,
+    management=None,
+    year=None,
+) -> dict[str, array]:
+    """Columnar equivalent of ``calculate_sns``.
+
+    Args:
+        previous_crop: Column of previous crop values or codes (positions
+            in :data:`PREVIOUS_CROPS`).
+        soil_type: Column of soil types or codes (:data:`SNS_SOILS`).
+        rainfall: Column of rainfall categories or codes (:data:`RAINFALL`).
+        ley_age: Optional column of grass ley ages ("1-2yr" / "3-5yr").
+            Rows where it is ``None`` have no grass history.
+        n_intensity: Column of ley N intensities; required for rows with a
+            ley age.
+        management: Column of ley managements; required for rows with a
+            ley age.
+        year: Column of years after ploughing out (1-3); default 2.
+
+    ``soil_type``, ``rainfall`` and the grass-history arguments may also be
+    given as a single value for all rows.  For rows with grass history the
+    Table 4.6 index is combined with the field assessment by taking the
+    higher of the two, as ``calculate_sns(grass_history=...)`` does.
+
+    Returns:
+        Dict of ``array('B')`` columns: ``sns_index``, and ``method`` as a
+        code into :data:`SNS_METHODS`.
+
+    Raises:
+        ValueError: If a column has the wrong length or a value is unknown,
+            or a grass-history row is invalid for Table 4.6.
+    """
+    n_rows = len(previous_crop)
+    prev = _codes("previous crop", previous_crop, n_rows, PREVIOUS_CROPS, _PREVIOUS_CROP_ID)
+    soils = _codes("soil type", soil_type, n_rows, SNS_SOILS, _SNS_SOIL_ID)
+    rains = _codes("rainfall category", rainfall, n_rows, RAINFALL, _RAINFALL_ID)
+
+    table = _FIELD_SNS
+    residue = _RESIDUE
+    out_sns = array("B", bytes(
+        table[(residue[p] * _N_SNS_SOILS + s) * _N_RAINFALL + r]
+        for p, s, r in zip(prev, soils, rains)
+    ))
+    out_method = array("B", bytes(n_rows))
+    if ley_age is None:
+        return {"sns_index": out_sns, "method": out_method}
+
+    combined = SNS_METHODS.index("combined")
+    ley = _ley_sns(n_rows, ley_age, n_intensity, management, soils, rains, year, 2)
+    for row, ley_sns in enumerate(ley):
+        if ley_sns is None:
+            continue
+        if ley_sns > out_sns[row]:
+            out_sns[row] = ley_sns
+        out_method[row] = combined
+    return {"sns_index": out_sns, "method": out_method}
+
+
+def _ley_codes(label: str, column, ids: dict[str, int], options: tuple[str, ...],
+               rows: list[int]) -> list[int | None]:
+    """Codes for a Table 4.6 column; only *rows* (those with a ley age) must be valid."""
+    codes = list(map(ids.get, column))
+    for row in rows:
+        if codes[row] is None:
+            raise ValueError(f"{label} must be one of {options}, got '{column[row]}' at row {row}")
+    return codes
+
+
+def _ley_sns(
+    n_rows: int, ley_age, n_intensity, management, soils: list[int], rains: list[int],
+    year, default_year: int,
+) -> list[int | None]:
+    """Table 4.6 SNS index per row, or None where the row has no ley age."""
+    age_col = _column("ley_age", ley_age, n_rows, None)
+    rows = [row for row, age in enumerate(age_col) if age is not None]
+    ages = _ley_codes("ley_age", age_col, LEY_AGE_ID, LEY_AGES, rows)
+    intensities = _ley_codes(
+        "n_intensity", _column("n_intensity", n_intensity, n_rows, None),
+        LEY_N_INTENSITY_ID, LEY_N_INTENSITIES, rows,
+    )
+    managements = _ley_codes(
+        "management", _column("management", management, n_rows, None),
+        LEY_MANAGEMENT_ID, LEY_MANAGEMENTS, rows,
+    )
+    year_col = _column("year", year, n_rows, default_year)
+
+    table = GRASS_LEY_SNS
+    out: list[int | None] = [None] * n_rows
+    for row in rows:
+        soil = _LEY_SOIL[soils[row]]
+        if soil is None:
+            raise ValueError(
+                f"Table 4.6 does not cover organic soils (row {row}). "
+                "Use the SMN measurement method for these soils."
+            )
+        y = year_col[row]
+        if y is None:
+            y = default_year
+        elif y not in (1, 2, 3):
+            raise ValueError(f"year must be 1, 2, or 3, got {y} at row {row}")
+        out[row] = table[grass_ley_offset(
+            ages[row], intensities[row], managements[row], soil, _LEY_RAINFALL[rains[row]], y,
+        )]
+    return out
+
+
+def calculate_grass_ley_sns_many(
+    ley_age,
+    n_intensity,
+    management,
+    soil_type,
+    rainfall,
+    year=None,
+) -> array:
+    """Columnar equivalent of ``calculate_grass_ley_sns`` (Table 4.6).
+
+    Args:
+        ley_age: Column of ley ages ("1-2yr" / "3-5yr").
+        n_intensity: Column of ley N intensities ("low" / "high").
+        management: Column of ley managements ("cut", "grazed",
+            "1-cut-then-grazed").
+        soil_type: Column of soil types or codes (:data:`SNS_SOILS`);
+            organic soils are not covered by Table 4.6.
+        rainfall: Column of rainfall categories or codes (:data:`RAINFALL`).
+        year: Column of years after ploughing out (1-3); default 1.
+
+    Every argument after ``ley_age`` may also be a single value for all
+    rows.
+
+    Returns:
+        ``array('B')`` of SNS indices, one per row.
+
+    Raises:
+        ValueError: If a column has the wrong length or a value is invalid.
+    """
+    n_rows = len(ley_age)
+    soils = _codes("soil type", soil_type, n_rows, SNS_SOILS, _SNS_SOIL_ID)
+    rains = _codes("rainfall category", rainfall, n_rows, RAINFALL, _RAINFALL_ID)
+    values = _ley_sns(n_rows, ley_age, n_intensity, management, soils, rains, year, 1)
+    if None in values:
+        raise ValueError(f"Missing ley_age at row {values.index(None)}")
+    return array("B", values)
+
+
+# ── Vegetable SNS (Tables 6.2-6.4 and 6.6) ─────────────────────────
+
+VEG_PREVIOUS_CROPS: tuple[str, ...] = tuple(p.value for p in VegPreviousCrop)
+VEG_SOILS: tuple[str, ...] = tuple(s.value for s in VegSoilType)
+VEG_RAINFALL: tuple[str, ...] = ("low", "moderate", "high")
+VEG_SNS_METHODS: tuple[str, ...] = (
+    "veg-field-assessment", "veg-field-assessment-advisory", "veg-smn",
+)
+_VEG_FIELD, _VEG_ADVISORY, _VEG_SMN = range(3)
+
+_VEG_PREVIOUS_CROP_ID = {v: i for i, v in enumerate(VEG_PREVIOUS_CROPS)}
+_VEG_SOIL_ID = {v: i for i, v in enumerate(VEG_SOILS)}
+_VEG_RAINFALL_ID = {v: i for i, v in enumerate(VEG_RAINFALL)}
+_N_VEG_SOILS = len(VEG_SOILS)
+_N_VEG_RAINFALL = len(VEG_RAINFALL)
+_NO_VEG_SNS = 0xFF
+
+# [(previous crop * soils + soil) * rainfalls + rainfall] -> SNS index, or
+# _NO_VEG_SNS for advisory soils and combinations without data.
+_VEG_SNS = bytes(
+    VEG_SNS_LOOKUP.get((prev, soil, rain), _NO_VEG_SNS)
+    for prev in VEG_PREVIOUS_CROPS
+    for soil in VEG_SOILS
+    for rain in VEG_RAINFALL
+)
+# [soil code] -> representative advisory index, or None for mineral soils.
+_VEG_ADVISORY_SNS = tuple(
+    VEG_SNS_ORGANIC_ADVISORY[soil][1] if soil in VEG_SNS_ORGANIC_ADVISORY else None
+    for soil in VEG_SOILS
+)
+
+
+def veg_sns_many(
+    previous_crop,
+    soil_type,
+    rainfall,
+    smn=None,
+    depth_cm=None,
+) -> dict[str, array]:
+    """Vegetable SNS indices for a planting schedule, one row per planting.
+
+    Rows with an SMN measurement are converted with Table 6.6, as
+    ``smn_to_sns_index_veg``; the others use Tables 6.2-6.4, as
+    ``calculate_veg_sns``.  Organic and peat soils give the representative
+    advisory index and are flagged rather than annotated with notes.
+
+    Args:
+        previous_crop: Column of vegetable previous crops or codes
+            (:data:`VEG_PREVIOUS_CROPS`).
+        soil_type: Column of vegetable soil types or codes (:data:`VEG_SOILS`).
+        rainfall: Column of rainfall categories or codes (:data:`VEG_RAINFALL`).
+        smn: Optional column of SMN measurements (kg N/ha); ``None`` or NaN
+            means no measurement for that row.
+        depth_cm: Sampling depth (30, 60 or 90) for rows with an SMN
+            measurement.
+
+    All arguments after ``previous_crop`` may also be a single value for all
+    rows.
+
+    Returns:
+        Dict of ``array('B')`` columns: ``sns_index``; ``method``, a code into
+        :data:`VEG_SNS_METHODS`; and ``advisory``, 1 where the index is an
+        organic/peat advisory estimate that needs FACTS advice.
+
+    Raises:
+        ValueError: If a column has the wrong length, a value is invalid, or
+            a row has no Tables 6.2-6.4 entry.
+    """
+    n_rows = len(previous_crop)
+    prevs = _codes("vegetable previous crop", previous_crop, n_rows,
+                   VEG_PREVIOUS_CROPS, _VEG_PREVIOUS_CROP_ID)
+    soils = _codes("vegetable soil type", soil_type, n_rows, VEG_SOILS, _VEG_SOIL_ID)
+    rains = _codes("rainfall", rainfall, n_rows, VEG_RAINFALL, _VEG_RAINFALL_ID)
+    smn_col = _column("smn", smn, n_rows, None)
+    depth_col = _column("depth_cm", depth_cm, n_rows, None)
+
+    out_sns = array("B", bytes(n_rows))
+    out_method = array("B", bytes(n_rows))
+    out_advisory = array("B", bytes(n_rows))
+    table = _VEG_SNS
+    smn_bounds = VEG_SMN_BOUNDS
+    for row in range(n_rows):
+        value = smn_col[row]
+        # value == value is False for NaN, which means "not measured".
+        if value is not None and value == value:
+            if value < 0:
+                raise ValueError(f"SMN must be non-negative, got {value} at row {row}")
+            bounds = smn_bounds.get(depth_col[row])
+            if bounds is None:
+                raise ValueError(f"depth_cm must be 30, 60, or 90, got {depth_col[row]} at row {row}")
+            out_sns[row] = bisect_left(bounds, value)
+            out_method[row] = _VEG_SMN
+            continue
+        soil = soils[row]
+        advisory = _VEG_ADVISORY_SNS[soil]
+        if advisory is not None:
+            out_sns[row] = advisory
+            out_method[row] = out_advisory[row] = _VEG_ADVISORY
+            continue
+        index = table[(prevs[row] * _N_VEG_SOILS + soil) * _N_VEG_RAINFALL + rains[row]]
+        if index == _NO_VEG_SNS:
+            raise ValueError(
+                f"No vegetable SNS data for previous_crop='{VEG_PREVIOUS_CROPS[prevs[row]]}', "
+                f"soil_type='{VEG_SOILS[soil]}', rainfall='{VEG_RAINFALL[rains[row]]}' at row {row}"
+            )
+        out_sns[row] = index
+    return {"sns_index": out_sns, "method": out_method, "advisory": out_advisory}
+
+
+# ── SMN to SNS index (Tables 4.10 and 6.6) ─────────────────────────
+#
+# Both tables are bisected with bisect_left over their compiled upper bounds
+# (value <= bound gives that bound's index).  When the caller passes a NumPy
+# array, and NumPy is therefore already imported, numpy.searchsorted does the
+# same search in one call; rb209 itself never imports NumPy.  A NaN value gets
+# index 6, as from the scalar functions: searchsorted sorts NaN after every
+# bound, and the pure path sets those rows after bisecting.
+
+def _ndarray(values):
+    """Return *values* as a float NumPy array if it already is a NumPy array."""
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(values, np.ndarray):
+        return np, values.astype(float, copy=False)
+    return None, None
+
+
+def _bad_measurement(label: str, values, start: int = 0) -> ValueError:
+    for row, value in enumerate(values, start):
+        if type(value) is bool or not isinstance(value, (int, float)):
+            return ValueError(f"{label} must be a number, got {value!r} at row {row}")
+        if value < 0:
+            return ValueError(f"{label} must be non-negative, got {value} at row {row}")
+    raise AssertionError("no invalid measurement")
+
+
+def _measurements(label: str, values) -> tuple[list, list[int]]:
+    """Return *values* as a list, and the rows that are NaN, after checking
+    the other values are non-negative numbers."""
+    values = list(values)
+    nan_rows = []
+    try:
+        # The sum is NaN if any value is NaN; min() is unreliable with NaN,
+        # so only then are the NaN rows found and left out of the check.
+        total = sum(values)
+        checked = values
+        if total != total:
+            nan_rows = [row for row, value in enumerate(values) if value != value]
+            checked = [value for value in values if value == value]
+        valid = not checked or min(checked) >= 0
+    except TypeError:
+        valid = False
+    if not valid:
+        raise _bad_measurement(label, values)
+    return values, nan_rows
+
+
+def sns_value_to_index_many(sns_value) -> array:
+    """SNS indices for a column of SNS values, as ``sns_value_to_index``.
+
+    Args:
+        sns_value: Column of Soil Nitrogen Supply values (kg N/ha), e.g. SMN
+            plus crop N for each sample.
+
+    Returns:
+        ``array('B')`` of SNS indices (0-6), using Table 4.10.  A NaN value
+        gives index 6, as ``sns_value_to_index`` does.
+
+    Raises:
+        ValueError: If a value is negative or not a number.
+    """
+    np, values = _ndarray(sns_value)
+    if np is not None:
+        bad = np.flatnonzero(values < 0)
+        if bad.size:
+            row = int(bad[0])
+            raise _bad_measurement("SNS value", values[row:row + 1].tolist(), row)
+        return array("B", np.searchsorted(SNS_VALUE_BOUNDS, values).astype(np.uint8).tobytes())
+    values, nan_rows = _measurements("SNS value", sns_value)
+    out = array("B", list(map(partial(bisect_left, SNS_VALUE_BOUNDS), values)))
+    for row in nan_rows:
+        out[row] = 6
+    return out
+
+
+def smn_to_sns_index_veg_many(smn, depth_cm) -> array:
+    """Vegetable SNS indices for a column of SMN results, as ``smn_to_sns_index_veg``.
+
+    Args:
+        smn: Column of Soil Mineral Nitrogen values (kg N/ha).
+        depth_cm: Sampling depth (30, 60 or 90), for all rows or per row.
+
+    Returns:
+        ``array('B')`` of SNS indices (0-6), using Table 6.6.  A NaN value
+        gives index 6, as ``smn_to_sns_index_veg`` does.
+
+    Raises:
+        ValueError: If a column has the wrong length, an SMN value is
+            negative or not a number, or a depth is not in Table 6.6.
+    """
+    n_rows = len(smn)
+    depths = _column("depth_cm", depth_cm, n_rows, None)
+    np, values = _ndarray(smn)
+    if np is not None:
+        bad = np.flatnonzero(values < 0)
+        if bad.size:
+            row = int(bad[0])
+            raise _bad_measurement("SMN", values[row:row + 1].tolist(), row)
+        depths = np.asarray(depths)
+        out = np.empty(n_rows, dtype=np.uint8)
+        seen = np.zeros(n_rows, dtype=bool)
+        for depth, bounds in VEG_SMN_BOUNDS.items():
+            rows = depths == depth
+            out[rows] = np.searchsorted(bounds, values[rows])
+            seen |= rows
+        if not seen.all():
+            row = int(np.flatnonzero(~seen)[0])
+            raise ValueError(f"depth_cm must be 30, 60, or 90, got {depths[row]!r} at row {row}")
+        return array("B", out.tobytes())
+
+    values, nan_rows = _measurements("SMN", smn)
+    if not isinstance(depth_cm, (str, bytes)) and not hasattr(depth_cm, "__len__"):
+        bounds = VEG_SMN_BOUNDS.get(depth_cm)
+        if bounds is None:
+            raise ValueError(f"depth_cm must be 30, 60, or 90, got {depth_cm!r}")
+        out = array("B", list(map(partial(bisect_left, bounds), values)))
+    else:
+        out = array("B", bytes(n_rows))
+        for row, (value, depth) in enumerate(zip(values, depths)):
+            bounds = VEG_SMN_BOUNDS.get(depth)
+            if bounds is None:
+                raise ValueError(f"depth_cm must be 30, 60, or 90, got {depth!r} at row {row}")
+            out[row] = bisect_left(bounds, value)
+    for row in nan_rows:
+        out[row] = 6
+    return out
+
+
+# ── Organic manure grid (Section 2) ─────────────────────────────────
+
+ORGANIC_MATERIALS: tuple[str, ...] = tuple(m.value for m in OrganicMaterial)
+ORGANIC_GRID_FIELDS: tuple[str, ...] = ("total_n", "available_n", "p2o5", "k2o", "mgo", "so3")
+_ORGANIC_SOILS = (None, *(s.value for s in SoilType))
+_SOIL_CATEGORY_ID = {cat: i for i, cat in enumerate(TIMING_SOIL_CATEGORIES)}
+
+
+def _organic_axis(label: str, values, valid, shown) -> tuple:
+    values = tuple(values)
+    for value in values:
+        if value not in valid:
+            raise ValueError(f"Unknown {label} '{value}'. Valid options: {', '.join(shown)}")
+    return values
+
+
+def organic_grid(
+    rates,
+    materials=None,
+    timings=None,
+    incorporated=(False, True),
+    soil_types=None,
+) -> dict[str, array]:
+    """Nutrients from every combination of organic application, as ``calculate_organic``.
+
+    The result covers the cross-product of the five axes, in C order over
+    ``(material, timing, incorporated, soil_type, rate)``, so row
+    ``(((m * T + t) * I + i) * S + s) * R + r`` is ``calculate_organic(
+    materials[m], rates[r], timings[t], incorporated[i], soil_types[s])``.
+    Each nutrient is rounded once per material and rate, and available N
+    once per distinct factor and rate; the rest of the grid is filled by
+    repeating those runs.
+
+    Args:
+        rates: Application rates (t/ha or m3/ha), e.g. ``range(0, 51)``.
+        materials: Organic materials; default every :data:`ORGANIC_MATERIALS`.
+        timings: Application timings; ``None`` in the axis uses the flat
+            available-N coefficient.  Default ``None`` then every timing.
+        incorporated: Incorporation options; default ``(False, True)``.
+        soil_types: Soil types (``None`` for the default medium/heavy
+            category); default every soil type.
+
+    Returns:
+        Dict of ``array('d')`` columns named as :data:`ORGANIC_GRID_FIELDS`.
+        ``available_n`` is NaN where RB209 gives no timing factor (summer
+        incorporation, or a timing for a material without a timing table),
+        where ``calculate_organic`` raises.
+
+    Raises:
+        ValueError: If a rate is negative or an axis value is invalid.
+    """
+    rates = [float(rate) for rate in rates]
+    for rate in rates:
+        if not rate >= 0:
+            raise ValueError(f"Application rate must be non-negative, got {rate}")
+    materials = _organic_axis(
+        "organic material", ORGANIC_MATERIALS if materials is None else materials,
+        ORGANIC_MATERIAL_INFO, ORGANIC_MATERIALS,
+    )
+    timings = _organic_axis(
+        "timing", (None, *ORGANIC_TIMINGS) if timings is None else timings,
+        (None, *ORGANIC_TIMINGS), ORGANIC_TIMINGS,
+    )
+    incorporated = tuple(incorporated)
+    for value in incorporated:
+        if type(value) is not bool:
+            raise ValueError(f"incorporated must be true or false, got {value!r}")
+    soil_types = _organic_axis(
+        "soil type", _ORGANIC_SOILS[1:] if soil_types is None else soil_types,
+        _ORGANIC_SOILS, _ORGANIC_SOILS[1:],
+    )
+
+    # Slot of each (timing, incorporated, soil) block in AVAILABLE_N_GRID.
+    slots = [
+        ((0 if timing is None else ORGANIC_TIMINGS.index(timing) + 1) * 2
+         + _SOIL_CATEGORY_ID[TIMING_SOIL_CATEGORY.get(soil or "", "medium_heavy")]) * 2
+        + inc
+        for timing in timings for inc in incorporated for soil in soil_types
+    ]
+    n_blocks = len(slots)
+    columns = {name: array("d") for name in ORGANIC_GRID_FIELDS}
+    available = columns["available_n"]
+    for material in materials:
+        info = ORGANIC_MATERIAL_INFO[material]
+        for name in ("total_n", "p2o5", "k2o", "mgo", "so3"):
+            per_unit = info[name]
+            columns[name].extend([round(per_unit * rate, 1) for rate in rates] * n_blocks)
+        grid = AVAILABLE_N_GRID[material]
+        runs: dict[int, list[float]] = {}
+        for slot in slots:
+            run = runs.get(slot)
+            if run is None:
+                per_unit = grid[slot]
+                run = runs[slot] = [round(per_unit * rate, 1) for rate in rates]
+            available.extend(run)
+    return columns
+
+
+# ── Lime planning ──────────────────────────────────────────────────
+
+def _lime_error(row: int, current_ph, target_ph, soil_type, land_use) -> ValueError:
+    """Return ``calculate_lime``'s error for an invalid row, naming the row."""
+    try:
+        calculate_lime(current_ph, target_ph, soil_type, land_use)
+    except ValueError as exc:
+        return ValueError(f"{exc} at row {row}")
+    raise AssertionError("row is valid")
+
+
+def _valid_ph(current_ph: float, target_ph: float) -> bool:
+    return 3.0 <= current_ph <= 9.0 and 4.0 <= target_ph <= 8.5
+
+
+def lime_plan_many(
+    current_ph,
+    soil_type,
+    land_use=None,
+    target_ph=None,
+    crop=None,
+    area_ha=None,
+    max_dose: float = MAX_SINGLE_APPLICATION,
+) -> dict[str, array]:
+    """Lime requirements and split-dressing schedules for many fields.
+
+    Requirements match ``calculate_lime``.  A requirement above *max_dose*
+    is split into annual dressings of *max_dose* with the remainder in the
+    final year, so field *i* gets ``max_dose`` t/ha in each of its first
+    ``years[i] - 1`` years and ``final_dose[i]`` t/ha in the last.
+
+    Args:
+        current_ph: Column of current soil pH values; its length is the
+            number of fields.
+        soil_type: Column of soil types ("light", "medium", "heavy",
+            "organic").
+        land_use: Column of land uses ("arable", "grassland"), used where
+            *target_ph* is ``None``.
+        target_ph: Column of explicit target pH values, or ``None``.
+        crop: Column of crops (or ``None``) grown next.
+        area_ha: Column of field areas; default 1 ha each, which makes
+            ``tonnage_by_year`` a sum of t/ha.
+        max_dose: Largest single application (t/ha); must be positive and
+            finite.  Default the RB209 maximum of 7.5.
+
+    All arguments after ``current_ph`` may also be a single value for all
+    fields.
+
+    Returns:
+        Dict of per-field columns ``lime_required`` and ``final_dose``
+        (``array('d')``, t CaCO3/ha), ``years`` (``array('H')``, 0 where no
+        lime is needed) and ``before_potatoes`` (``array('B')``, 1 where
+        lime is needed and the next crop is potatoes, so the dressing
+        should be timed away from the potato crop), plus
+        ``tonnage_by_year``: total tonnes to haul in each year of the plan.
+
+    Raises:
+        ValueError: If a column has the wrong length, *max_dose* is not
+            positive and finite, or a field's inputs are invalid (the message
+            names the row).
+    """
+    # An infinite dose would make every final_dose inf - inf = NaN.
+    if not 0 < max_dose < math.inf:
+        raise ValueError(f"max_dose must be positive and finite, got {max_dose}")
+    n_rows = len(current_ph)
+    soils = _column("soil_type", soil_type, n_rows, None)
+    land_uses = _column("land_use", land_use, n_rows, None)
+    targets = _column("target_ph", target_ph, n_rows, None)
+    crops = _column("crop", crop, n_rows, None)
+    areas = _column("area_ha", area_ha, n_rows, 1.0)
+
+    factors = list(map(LIME_FACTORS.get, soils))
+    targets = [
+        TARGET_PH.get(use) if target is None else target
+        for target, use in zip(targets, land_uses)
+    ]
+    if None in factors or None in targets:
+        row = next(i for i, (f, t) in enumerate(zip(factors, targets)) if f is None or t is None)
+        raise _lime_error(row, current_ph[row], targets[row], soils[row], land_uses[row])
+    # Any NaN or out-of-range pH makes the chained comparison false.
+    if not all(map(_valid_ph, current_ph, targets)):
+        row = next(i for i, ph in enumerate(map(_valid_ph, current_ph, targets)) if not ph)
+        raise _lime_error(row, current_ph[row], targets[row], soils[row], land_uses[row])
+
+    required = array("d", [
+        round((target - ph) * factor, 1) if ph < target else 0.0
+        for ph, target, factor in zip(current_ph, targets, factors)
+    ])
+    years = array("H", [int(-(-need // max_dose)) for need in required])
+    final_dose = array("d", [
+        round(need - (n_years - 1) * max_dose, 1) if n_years else 0.0
+        for need, n_years in zip(required, years)
+    ])
+    before_potatoes = array("B", [
+        need > 0 and c is not None and c.startswith("potatoes-")
+        for need, c in zip(required, crops)
+    ])
+
+    # full_area[y]: area of fields whose plan lasts y + 1 years; every year
+    # before a field's last takes a full dose.
+    n_years = max(years, default=0)
+    full_area = [0.0] * n_years
+    final_tonnes = [0.0] * n_years
+    for y, dose, area in zip(years, final_dose, areas):
+        if y:
+            full_area[y - 1] += area
+            final_tonnes[y - 1] += dose * area
+    tonnage = array("d", bytes(8 * n_years))
+    later_area = 0.0
+    for year in range(n_years - 1, -1, -1):
+        tonnage[year] = round(max_dose * later_area + final_tonnes[year], 1)
+        later_area += full_area[year]
+    return {
+        "lime_required": required,
+        "years": years,
+        "final_dose": final_dose,
+        "before_potatoes": before_potatoes,
+        "tonnage_by_year": tonnage,
+    }
@@ -0,0 +1,405 @@
+"""Tests for batch processing of field files."""
+
+import csv
+import io
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from rb209.batch import (
+    ORGANIC_OUTPUT_COLUMNS,
+    RECOMMEND_OUTPUT_COLUMNS,
+    SMN_OUTPUT_COLUMNS,
+    TIMING_OUTPUT_COLUMNS,
+    detect_format,
+    iter_rows,
+    organic_rows,
+    parse_organic_row,
+    parse_recommend_row,
+    parse_timing_row,
+    recommend_rows,
+    smn_rows,
+    timing_csv_row,
+    timing_rows,
+    write_report,
+    write_results,
+)
+from rb209.engine import (
+    calculate_organic,
+    calculate_smn_sns,
+    nitrogen_timing,
+    recommend_all,
+    smn_to_sns_index_veg,
+)
+from rb209.formatters import TIMING_CSV_COLUMNS, organic_to_dict, timing_to_dict, write_csv
+
+_REPO_ROOT = pathlib.Path(__file__).parents[1]
+
+_CSV = """field,crop,sns_index,p_index,k_index,mg_index,straw_removed,soil_type,expected_yield,ber,k_upper_half
+F1,winter-wheat-feed,2,2,1,,,,,,
+F2,winter-wheat-feed,2,2,1,0,false,light,9.5,4,
+F3,not-a-crop,2,2,1,,,,,,
+F4,veg-carrots,1,2,2,,,,,,true
+"""
+
+
+def _run(text: str, fmt: str) -> tuple[list[dict], list[dict]]:
+    out = io.StringIO()
+    err = io.StringIO()
+    write_results(recommend_rows(iter_rows(io.StringIO(text), fmt)), out, err)
+    ok = [json.loads(line) for line in out.getvalue().splitlines()]
+    bad = [json.loads(line) for line in err.getvalue().splitlines()]
+    return ok, bad
+
+
+class TestDetectFormat(unittest.TestCase):
+    def test_csv(self):
+        self.assertEqual(detect_format("fields.CSV"), "csv")
+
+    def test_jsonl(self):
+        self.assertEqual(detect_format("fields.jsonl"), "jsonl")
+        self.assertEqual(detect_format("fields.ndjson"), "jsonl")
+
+    def test_unknown_raises(self):
+        with self.assertRaises(ValueError):
+            detect_format("fields.txt")
+
+
+class TestParseRecommendRow(unittest.TestCase):
+    def test_blank_optional_columns_omitted(self):
+        kwargs = parse_recommend_row(
+            {"crop": "spring-barley", "sns_index": "1", "p_index": "2",
+             "k_index": "3", "mg_index": "", "ber": " "}
+        )
+        self.assertEqual(
+            kwargs,
+            {"crop": "spring-barley", "sns_index": 1, "p_index": 2, "k_index": 3},
+        )
+
+    def test_typed_json_values(self):
+        kwargs = parse_recommend_row(
+            {"crop": "winter-wheat-feed", "sns_index": 2, "p_index": 2,
+             "k_index": 1, "straw_removed": False, "expected_yield": 10}
+        )
+        self.assertIs(kwargs["straw_removed"], False)
+        self.assertEqual(kwargs["expected_yield"], 10.0)
+
+    def test_missing_required(self):
+        with self.assertRaises(ValueError) as ctx:
+            parse_recommend_row({"crop": "peas", "sns_index": "1"})
+        self.assertIn("p_index", str(ctx.exception))
+
+    def test_bad_integer(self):
+        with self.assertRaises(ValueError):
+            parse_recommend_row(
+                {"crop": "peas", "sns_index": "x", "p_index": "1", "k_index": "1"}
+            )
+
+    def test_bad_boolean(self):
+        with self.assertRaises(ValueError):
+            parse_recommend_row(
+                {"crop": "peas", "sns_index": "1", "p_index": "1",
+                 "k_index": "1", "straw_removed": "maybe"}
+            )
+
+
+class TestBatchRecommend(unittest.TestCase):
+    def test_csv_matches_recommend_all(self):
+        ok, bad = _run(_CSV, "csv")
+        self.assertEqual([r["field"] for r in ok], ["F1", "F2", "F4"])
+        expected = recommend_all(
+            "winter-wheat-feed", 2, 2, 1, mg_index=0, straw_removed=False,
+            soil_type="light", expected_yield=9.5, ber=4.0,
+        )
+        self.assertEqual(ok[1]["nitrogen"], expected.nitrogen)
+        self.assertEqual(ok[1]["potassium"], expected.potassium)
+        self.assertEqual(ok[1]["notes"], expected.notes)
+
+    def test_bad_row_does_not_abort(self):
+        ok, bad = _run(_CSV, "csv")
+        self.assertEqual(len(bad), 1)
+        self.assertEqual(bad[0]["row"], 3)
+        self.assertEqual(bad[0]["field"], "F3")
+        self.assertIn("Unknown crop", bad[0]["error"])
+
+    def test_jsonl_input(self):
+        text = "\n".join([
+            json.dumps({"field": 1, "crop": "spring-barley", "sns_index": 1,
+                        "p_index": 1, "k_index": 1}),
+            "",
+            "{not json",
+            "[1, 2]",
+        ])
+        ok, bad = _run(text, "jsonl")
+        self.assertEqual(len(ok), 1)
+        self.assertEqual(ok[0]["field"], 1)
+        self.assertEqual(ok[0]["nitrogen"], 120)
+        self.assertEqual([b["row"] for b in bad], [2, 3])
+
+    def test_rows_are_streamed(self):
+        # The runner must consume its input lazily, one row at a time.
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield i + 1, {"crop": "peas", "sns_index": 0, "p_index": 0, "k_index": 0}, None
+
+        results = recommend_rows(rows())
+        next(results)
+        self.assertEqual(consumed, [0])
+
+    def test_csv_output(self):
+        out = io.StringIO()
+        err = io.StringIO()
+        results = recommend_rows(iter_rows(io.StringIO(_CSV), "csv"))
+        self.assertEqual(write_results(results, out, err, RECOMMEND_OUTPUT_COLUMNS), (3, 1))
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(tuple(rows[0]), RECOMMEND_OUTPUT_COLUMNS)
+        self.assertEqual([r["field"] for r in rows], ["F1", "F2", "F4"])
+        self.assertEqual([r["row"] for r in rows], ["1", "2", "4"])
+        expected = recommend_all("winter-wheat-feed", 2, 2, 1)
+        self.assertEqual(float(rows[0]["nitrogen"]), expected.nitrogen)
+        self.assertEqual(rows[0]["notes"].split(" | "), expected.notes)
+        self.assertEqual(json.loads(err.getvalue())["field"], "F3")
+
+    def test_report_output(self):
+        out = io.StringIO()
+        err = io.StringIO()
+        results = recommend_rows(iter_rows(io.StringIO(_CSV), "csv"))
+        self.assertEqual(write_report(results, out, err), (3, 1))
+        rows = [line for line in out.getvalue().splitlines() if line.startswith("| F")][1:]
+        self.assertEqual([row.split()[1] for row in rows], ["F1", "F2", "F4"])
+        self.assertIn("Notes:", out.getvalue())
+        self.assertEqual(json.loads(err.getvalue())["field"], "F3")
+
+
+class TestCLIBatchRecommend(unittest.TestCase):
+    def test_cli_writes_output_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = pathlib.Path(tmp, "fields.csv")
+            src.write_text(_CSV)
+            out = pathlib.Path(tmp, "out.jsonl")
+            err = pathlib.Path(tmp, "err.jsonl")
+            result = subprocess.run(
+                [sys.executable, "-m", "rb209", "batch-recommend",
+                 "--input", str(src), "--output", str(out), "--errors", str(err)],
+                capture_output=True, text=True, cwd=_REPO_ROOT,
+            )
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("3 row(s) succeeded, 1 row(s) failed", result.stderr)
+            self.assertEqual(len(out.read_text().splitlines()), 3)
+            self.assertEqual(len(err.read_text().splitlines()), 1)
+
+    def test_cli_stdin_requires_format(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "batch-recommend", "--input", "-"],
+            input="", capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("input format", result.stderr)
+
+    def test_cli_csv_rejects_note_codes(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "batch-recommend", "--input", "-",
+             "--input-format", "csv", "--output-format", "csv", "--notes", "codes"],
+            input=_CSV, capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--output-format jsonl", result.stderr)
+
+
+class TestTimingRows(unittest.TestCase):
+    _CSV = (
+        "field,crop,total_n,soil_type\n"
+        "F1,winter-wheat-feed,200,\n"
+        "F2,potatoes-maincrop,180,light\n"
+        "F3,winter-wheat-feed,,\n"
+    )
+
+    def test_parse_timing_row(self):
+        self.assertEqual(
+            parse_timing_row({"crop": " peas ", "total_n": "0", "soil_type": ""}),
+            {"crop": "peas", "total_n": 0.0},
+        )
+        with self.assertRaisesRegex(ValueError, "total_n must be a number"):
+            parse_timing_row({"crop": "peas", "total_n": "lots"})
+
+    def test_matches_nitrogen_timing(self):
+        results = list(timing_rows(iter_rows(io.StringIO(self._CSV), "csv")))
+        self.assertEqual([r[1] for r in results], ["F1", "F2", "F3"])
+        self.assertEqual(results[0][2], timing_to_dict(nitrogen_timing("winter-wheat-feed", 200)))
+        self.assertEqual(
+            results[1][2], timing_to_dict(nitrogen_timing("potatoes-maincrop", 180, "light")),
+        )
+        self.assertIsNone(results[2][2])
+        self.assertIn("total_n", results[2][3])
+
+    def test_csv_output_matches_write_csv(self):
+        out = io.StringIO()
+        err = io.StringIO()
+        results = timing_rows(iter_rows(io.StringIO(self._CSV), "csv"))
+        self.assertEqual(
+            write_results(results, out, err, TIMING_OUTPUT_COLUMNS, timing_csv_row), (2, 1),
+        )
+        expected = io.StringIO()
+        write_csv([
+            nitrogen_timing("winter-wheat-feed", 200.0),
+            nitrogen_timing("potatoes-maincrop", 180.0, "light"),
+        ], expected)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], ",".join(TIMING_OUTPUT_COLUMNS))
+        self.assertEqual(TIMING_OUTPUT_COLUMNS[2:], TIMING_CSV_COLUMNS)
+        self.assertEqual(
+            [line.split(",", 2)[2] for line in lines[1:]],
+            expected.getvalue().splitlines()[1:],
+        )
+        self.assertEqual([line.split(",", 2)[:2] for line in lines[1:]], [["1", "F1"], ["2", "F2"]])
+
+
+class TestOrganicRows(unittest.TestCase):
+    _CSV = (
+        "field,material,rate,timing,incorporated,soil_type\n"
+        "A,pig-slurry,30,autumn,yes,light\n"
+        "B,cattle-fym,25,,,\n"
+        "C,cattle-fym,-1,,,\n"
+    )
+
+    def test_parse_organic_row(self):
+        self.assertEqual(
+            parse_organic_row({"material": "pig-slurry", "rate": "30", "incorporated": "no"}),
+            {"material": "pig-slurry", "rate": 30.0, "incorporated": False},
+        )
+        with self.assertRaisesRegex(ValueError, "Missing required column"):
+            parse_organic_row({"material": "pig-slurry"})
+
+    def test_matches_calculate_organic(self):
+        results = list(organic_rows(iter_rows(io.StringIO(self._CSV), "csv")))
+        self.assertEqual(
+            results[0][2],
+            organic_to_dict(calculate_organic("pig-slurry", 30, "autumn", True, "light")),
+        )
+        self.assertEqual(results[1][2], organic_to_dict(calculate_organic("cattle-fym", 25)))
+        self.assertIn("non-negative", results[2][3])
+
+    def test_csv_output(self):
+        out = io.StringIO()
+        err = io.StringIO()
+        results = organic_rows(iter_rows(io.StringIO(self._CSV), "csv"))
+        self.assertEqual(write_results(results, out, err, ORGANIC_OUTPUT_COLUMNS), (2, 1))
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(tuple(rows[0]), ORGANIC_OUTPUT_COLUMNS)
+        self.assertEqual(float(rows[1]["total_n"]), calculate_organic("cattle-fym", 25).total_n)
+
+
+class TestCLIBatchTimingOrganic(unittest.TestCase):
+    def test_cli_batch_timing(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "batch-timing", "--input", "-",
+             "--input-format", "csv", "--workers", "2"],
+            input=TestTimingRows._CSV, capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("2 row(s) succeeded, 1 row(s) failed", result.stderr)
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["field"] for r in records], ["F1", "F2"])
+
+    def test_cli_batch_timing_csv(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "batch-timing", "--input", "-",
+             "--input-format", "csv", "--output-format", "csv"],
+            input=TestTimingRows._CSV, capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 1)
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+        self.assertEqual([r["field"] for r in rows], ["F1", "F2"])
+        self.assertEqual(rows[1]["dressings"], "2")
+        self.assertEqual(rows[1]["dressing_3_amount"], "")
+
+    def test_cli_batch_organic(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "batch-organic", "--input", "-",
+             "--input-format", "jsonl", "--workers", "2"],
+            input='{"field": "B", "material": "cattle-fym", "rate": 25}\n',
+            capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        record = json.loads(result.stdout)
+        self.assertEqual(record["field"], "B")
+        self.assertEqual(record["available_n"], calculate_organic("cattle-fym", 25).available_n)
+
+
+class TestSmnRows(unittest.TestCase):
+    def _run(self, text: str, **kwargs) -> list:
+        return list(smn_rows(iter_rows(io.StringIO(text), "csv"), **kwargs))
+
+    def test_arable_matches_calculate_smn_sns(self):
+        samples = [(smn, crop_n) for smn in (0, 45, 60, 60.5, 99, 150, 300) for crop_n in (0, 20)]
+        text = "field,smn,crop_n\n" + "".join(f"S{i},{a},{b}\n" for i, (a, b) in enumerate(samples))
+        results = self._run(text, chunk_size=4)
+        self.assertEqual([r[0] for r in results], list(range(1, len(samples) + 1)))
+        for (_, field, record, error), (smn, crop_n) in zip(results, samples):
+            self.assertIsNone(error)
+            self.assertEqual(record["sns_index"], calculate_smn_sns(smn, crop_n).sns_index)
+            self.assertEqual(record["sns_value"], smn + crop_n)
+
+    def test_veg_depths(self):
+        text = "field,smn,depth_cm\nA,35,30\nB,35,\nC,35,90\n"
+        results = self._run(text, table="veg", depth_cm=60)
+        self.assertEqual(
+            [r[2]["sns_index"] for r in results],
+            [smn_to_sns_index_veg(35, d) for d in (30, 60, 90)],
+        )
+
+    def test_errors_keep_order(self):
+        text = "field,smn,depth_cm\nA,35,30\nB,-1,30\nC,35,45\nD,35,\nE,20,60\n"
+        results = self._run(text, table="veg")
+        self.assertEqual([r[0] for r in results], [1, 2, 3, 4, 5])
+        self.assertEqual([r[3] is None for r in results], [True, False, False, False, True])
+        self.assertIn("non-negative", results[1][3])
+        self.assertIn("got 45", results[2][3])
+        self.assertIn("depth_cm", results[3][3])
+
+    def test_nan_rejected(self):
+        # Unlike sns_value_to_index_many, which maps NaN to index 6.
+        results = self._run("field,smn,crop_n\nA,nan,0\nB,40,NaN\nC,40,0\n")
+        self.assertEqual([r[3] is None for r in results], [False, False, True])
+        self.assertIn("smn must be a number, got 'nan'", results[0][3])
+        self.assertIn("crop_n must be a number, got 'NaN'", results[1][3])
+
+    def test_invalid_table(self):
+        with self.assertRaisesRegex(ValueError, "Valid options: arable, veg"):
+            self._run("smn\n1\n", table="fruit")
+
+
+class TestCLISmnBatch(unittest.TestCase):
+    def test_cli_streams_samples(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "smn-batch", "--input", "-",
+             "--input-format", "jsonl", "--table", "veg", "--depth", "30"],
+            input='{"field": "P1", "smn": 35}\n{"field": "P2", "smn": 500}\n',
+            capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["sns_index"] for r in records], [3, 6])
+        self.assertEqual(records[0]["field"], "P1")
+
+    def test_cli_csv_output(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "smn-batch", "--input", "-",
+             "--input-format", "csv", "--output-format", "csv"],
+            input="field,smn,crop_n\nP1,60,20\n",
+            capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.splitlines()
+        self.assertEqual(lines[0], ",".join(SMN_OUTPUT_COLUMNS["arable"]))
+        self.assertEqual(lines[1], f"1,P1,smn,60.0,20.0,80.0,{calculate_smn_sns(60, 20).sns_index}")
+
+
+if __name__ == "__main__":
+    unittest.main()
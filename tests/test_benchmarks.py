@@ -0,0 +1,56 @@
+"""Smoke test for the benchmark runner."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import fork_memory
+from benchmarks.cases import build_cases, case_names
+from benchmarks.run import compare, main
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_case_has_calls(self):
+        cases = build_cases(stride=50)
+        self.assertEqual([c.name for c in cases], case_names())
+        for case in cases:
+            self.assertTrue(case.calls, case.name)
+
+    def test_quick_run_writes_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "results.json")
+            with contextlib.redirect_stderr(io.StringIO()):
+                main(["--quick", "--only", "calculate_lime", "--only", "format_lime.json",
+                      "--out", out])
+            with open(out) as f:
+                report = json.load(f)
+        self.assertEqual(set(report["results"]), {"calculate_lime", "format_lime.json"})
+        result = report["results"]["calculate_lime"]
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertGreater(result["alloc_peak_bytes"], 0)
+        self.assertIn("calculate_lime", compare(report, report))
+
+
+@unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup"), "needs Linux smaps_rollup")
+class TestForkMemory(unittest.TestCase):
+    def test_quick_run_reports_every_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "fork.json")
+            with contextlib.redirect_stderr(io.StringIO()):
+                fork_memory.main(["--workers", "1", "--stride", "500", "--out", out])
+            with open(out) as f:
+                report = json.load(f)
+        self.assertEqual(set(report["results"]), set(fork_memory.MODES))
+        for result in report["results"].values():
+            for phase in ("parent", "before", "after"):
+                self.assertGreater(result[phase]["rss"], 0)
+                self.assertEqual(
+                    set(result[phase]), {"rss", "pss", "shared", "private"},
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,14 @@
 """Tests for Phase 4 — break-even ratio (BER) adjustments."""
 
 import json
+import math
 import pathlib
 import subprocess
 import sys
 import unittest
 
 from rb209.engine import recommend_all, recommend_nitrogen
+from rb209.vector import ber_curve
 
 _REPO_ROOT = pathlib.Path(__file__).parents[1]
 
@@ -209,5 +211,29 @@ class TestBERCLI(unittest.TestCase):
         self.assertIn("80", result.stdout)
 
 
+class TestBERCurve(unittest.TestCase):
+    def test_matches_recommend_nitrogen(self):
+        bers = [0.5, 2.0, 2.5, 3.7, 5.0, 6.25, 9.0, 10.0, 14.0]
+        for crop in ("winter-wheat-feed", "spring-barley"):
+            base = recommend_nitrogen(crop, 1)
+            curve = ber_curve(crop, bers)
+            self.assertEqual(len(curve), len(bers))
+            for ber, adj in zip(bers, curve):
+                self.assertEqual(max(0.0, base + adj), recommend_nitrogen(crop, 1, ber=ber))
+
+    def test_table_values_and_clamping(self):
+        curve = ber_curve("winter-wheat-feed", [1.0, 2.0, 4.5, 5.0, 9.0, 12.0])
+        self.assertEqual(list(curve), [30.0, 30.0, 5.0, 0.0, -25.0, -30.0])
+
+    def test_nan_gives_no_adjustment(self):
+        self.assertEqual(ber_curve("winter-barley", [math.nan])[0], 0.0)
+
+    def test_crop_without_ber_data(self):
+        with self.assertRaises(ValueError):
+            ber_curve("sugar-beet", [3.0])
+        with self.assertRaises(ValueError):
+            ber_curve("not-a-crop", [3.0])
+
+
 if __name__ == "__main__":
     unittest.main()
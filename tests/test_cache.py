@@ -0,0 +1,73 @@
+"""Tests for the memoised recommendation cache."""
+
+import unittest
+
+from rb209.cache import RecommendationCache
+from rb209.engine import recommend_all
+
+
+class TestRecommendationCache(unittest.TestCase):
+    def test_same_result_as_engine(self):
+        cache = RecommendationCache()
+        args = ("winter-wheat-feed", 2, 2, 1)
+        kwargs = {"soil_type": "light", "expected_yield": 9.0, "ber": 4.0}
+        self.assertEqual(cache.recommend_all(*args, **kwargs), recommend_all(*args, **kwargs))
+        self.assertEqual(cache.recommend_all(*args, **kwargs), recommend_all(*args, **kwargs))
+
+    def test_hits_and_misses(self):
+        cache = RecommendationCache()
+        cache.recommend_all("spring-barley", 1, 1, 1)
+        cache.recommend_all("spring-barley", 1, 1, 1)
+        cache.recommend_all("spring-barley", 2, 1, 1)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 2, 2))
+        self.assertAlmostEqual(stats.hit_rate, 1 / 3)
+
+    def test_returned_notes_are_copies(self):
+        cache = RecommendationCache()
+        first = cache.recommend_all("winter-wheat-feed", 2, 2, 1)
+        first.notes.append("corrupted")
+        first.nitrogen = -1
+        second = cache.recommend_all("winter-wheat-feed", 2, 2, 1)
+        self.assertNotIn("corrupted", second.notes)
+        self.assertEqual(second.nitrogen, 150)
+
+    def test_lru_eviction(self):
+        cache = RecommendationCache(maxsize=2)
+        cache.recommend_all("peas", 0, 0, 0)
+        cache.recommend_all("peas", 1, 0, 0)
+        cache.recommend_all("peas", 0, 0, 0)   # refresh sns 0
+        cache.recommend_all("peas", 2, 0, 0)   # evicts sns 1
+        self.assertEqual(cache.stats().evictions, 1)
+        cache.recommend_all("peas", 0, 0, 0)
+        self.assertEqual(cache.stats().hits, 2)
+        cache.recommend_all("peas", 1, 0, 0)
+        self.assertEqual(cache.stats().misses, 4)
+
+    def test_errors_not_cached(self):
+        cache = RecommendationCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.recommend_all("not-a-crop", 0, 0, 0)
+        self.assertEqual(cache.stats().size, 0)
+
+    def test_bool_index_still_rejected(self):
+        cache = RecommendationCache()
+        cache.recommend_all("peas", 1, 1, 1)
+        with self.assertRaises(ValueError):
+            cache.recommend_all("peas", True, 1, 1)
+
+    def test_clear(self):
+        cache = RecommendationCache()
+        cache.recommend_all("peas", 0, 0, 0)
+        cache.clear()
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (0, 0, 0))
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            RecommendationCache(maxsize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for the precomputed recommendation cube."""
+
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from rb209.cube import MISSING, RecommendationCube, compile_cube
+from rb209.engine import recommend_all
+from rb209.vector import NoteFlag
+
+_CROPS = ["fruit-pear", "grass-grazed", "potatoes-maincrop", "sugar-beet",
+          "veg-celery-seedbed", "winter-wheat-feed"]
+
+
+class TestCube(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls._tmp.name, "test.cube")
+        cls.n_records = compile_cube(cls.path, crops=_CROPS)
+        cls.cube = RecommendationCube(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cube.close()
+        cls._tmp.cleanup()
+
+    def test_record_count(self):
+        self.assertEqual(self.n_records, len(_CROPS) * 7 * 5 * 6 * 5 * 2 * 5)
+        self.assertEqual(self.cube.crops, tuple(sorted(_CROPS)))
+
+    def test_matches_recommend_all(self):
+        grid = itertools.product(
+            _CROPS, range(7), (0, 2, 4, 9), range(10), (0, 1, 5),
+            (True, False), (None, "light", "heavy"), (False, True),
+        )
+        for crop, sns, p, k, mg, straw, soil, upper in grid:
+            record = self.cube.lookup(crop, sns, p, k, mg, straw, soil, k_upper_half=upper)
+            try:
+                rec = recommend_all(crop, sns, p, k, mg, straw, soil, k_upper_half=upper)
+            except ValueError:
+                self.assertIn(MISSING, record[:3])
+                continue
+            expected = (rec.nitrogen, rec.phosphorus, rec.potassium,
+                        rec.magnesium, rec.sulfur, rec.sodium)
+            self.assertEqual(record[:6], expected, (crop, sns, p, k, mg, straw, soil, upper))
+
+    def test_note_flags(self):
+        record = self.cube.lookup("grass-grazed", 0, 2, 0, mg_index=0)
+        self.assertIn(NoteFlag.HYPOMAGNESAEMIA, NoteFlag(record[6]))
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            self.cube.lookup("spring-barley", 0, 0, 0)
+        with self.assertRaises(ValueError):
+            self.cube.lookup("sugar-beet", 7, 0, 0)
+        with self.assertRaises(ValueError):
+            self.cube.lookup("sugar-beet", 0, -1, 0)
+        with self.assertRaises(ValueError):
+            self.cube.lookup("sugar-beet", 0, 0, 0, soil_type="clay")
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self._tmp.name, "not.cube")
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        with self.assertRaises(ValueError):
+            RecommendationCube(path)
+
+    def test_cli(self):
+        path = os.path.join(self._tmp.name, "cli.cube")
+        result = subprocess.run(
+            [sys.executable, "-m", "rb209", "compile-cube", "--out", path, "--crop", "peas"],
+            capture_output=True, text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Wrote 10500 records", result.stderr)
+        with RecommendationCube(path) as cube:
+            self.assertEqual(cube.lookup("peas", 0, 2, 2)[0], recommend_all("peas", 0, 2, 2).nitrogen)
+
+
+if __name__ == "__main__":
+    unittest.main()
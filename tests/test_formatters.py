@@ -0,0 +1,211 @@
+"""Tests for the JSON, NDJSON and CSV formatters."""
+
+import csv
+import io
+import json
+import unittest
+from dataclasses import asdict
+
+from rb209.engine import (
+    calculate_lime,
+    calculate_organic,
+    calculate_sns,
+    calculate_smn_sns,
+    nitrogen_timing,
+    recommend_all,
+    recommend_all_coded,
+)
+from rb209.data.timing import NITROGEN_TIMING_RULES
+from rb209.formatters import (
+    CSV_MAX_SPLITS,
+    TIMING_CSV_COLUMNS,
+    format_crop_list,
+    format_lime,
+    format_material_list,
+    format_organic,
+    format_recommendation,
+    format_report,
+    format_sns,
+    format_timing,
+    format_single_nutrient,
+    to_dict,
+    write_csv,
+    write_ndjson,
+)
+from rb209.models import NitrogenSplit, NitrogenTimingResult, RecommendationBatch
+from rb209.notes import render
+
+
+def _results() -> list:
+    return [
+        recommend_all("winter-wheat-feed", 2, 2, 1, expected_yield=9.5),
+        recommend_all_coded("veg-celery-seedbed", 1, 2, 2),
+        calculate_sns("cereals", "medium", "high"),
+        calculate_smn_sns(80.0, 15.0),
+        calculate_organic("pig-slurry", 30.0, "spring", True, "light"),
+        calculate_lime(5.2, None, "heavy", "arable", "potatoes-maincrop"),
+        nitrogen_timing("winter-wheat-feed", 220.0),
+    ]
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.recs = [
+            recommend_all("winter-wheat-feed", 2, 2, 1),
+            recommend_all("peas", 3, 1, 1),
+            recommend_all("winter-wheat-feed", 2, 2, 1),
+        ]
+
+    def test_one_aligned_table(self):
+        lines = format_report(self.recs, ["North", "South", "Long Field"]).splitlines()
+        table = [line for line in lines if line.startswith(("|", "+"))]
+        self.assertEqual(len(table), 3 + len(self.recs) + 1)
+        self.assertEqual(len({len(line) for line in table}), 1)
+        self.assertIn("| Long Field | Winter Wheat (feed) | 150 |", table[-2])
+
+    def test_footnotes_deduplicated(self):
+        text = format_report(self.recs, width=1000)
+        notes = list(dict.fromkeys(self.recs[0].notes + self.recs[1].notes))
+        for note in notes:
+            self.assertEqual(text.count(note), 1)
+        self.assertEqual(text.count("| 1,2,3 "), 2)
+        self.assertEqual(text.count("\n["), len(notes))
+
+    def test_footnotes_wrap(self):
+        text = format_report(self.recs, width=40)
+        footnotes = text.split("Notes:\n")[1].splitlines()
+        self.assertTrue(all(len(line) <= 40 for line in footnotes))
+        self.assertTrue(any(line.startswith("    ") for line in footnotes))
+
+    def test_coded_and_batch_rows(self):
+        coded = [recommend_all_coded("peas", 3, 1, 1)]
+        self.assertEqual(format_report(coded), format_report(self.recs[1:2]))
+        self.assertEqual(format_report(RecommendationBatch(self.recs)), format_report(self.recs))
+
+    def test_field_count_mismatch(self):
+        with self.assertRaises(ValueError):
+            format_report(self.recs, ["A"])
+
+
+def _csv_text(results: list) -> str:
+    out = io.StringIO()
+    write_csv(results, out)
+    return out.getvalue()
+
+
+class TestSerialisers(unittest.TestCase):
+    def test_match_asdict(self):
+        for result in _results():
+            self.assertEqual(to_dict(result), asdict(result), type(result).__name__)
+
+    def test_json_output_unchanged(self):
+        pairs = [
+            (format_recommendation, recommend_all("peas", 3, 1, 1)),
+            (format_sns, calculate_sns("cereals", "light", "low")),
+            (format_organic, calculate_organic("cattle-fym", 25)),
+            (format_lime, calculate_lime(5.8, 6.5, "medium")),
+            (format_timing, nitrogen_timing("winter-wheat-feed", 180.0)),
+        ]
+        for formatter, result in pairs:
+            self.assertEqual(formatter(result, "json"), json.dumps(asdict(result), indent=2))
+
+    def test_unknown_type(self):
+        with self.assertRaises(TypeError):
+            to_dict({"crop": "peas"})
+
+
+class TestNdjson(unittest.TestCase):
+    def test_single_line(self):
+        result = recommend_all("winter-wheat-feed", 2, 2, 1)
+        line = format_recommendation(result, "ndjson")
+        self.assertNotIn("\n", line)
+        self.assertEqual(json.loads(line), asdict(result))
+        self.assertLess(len(line), len(format_recommendation(result, "json")))
+
+    def test_write_ndjson(self):
+        results = _results()
+        out = io.StringIO()
+        self.assertEqual(write_ndjson(iter(results), out), len(results))
+        lines = out.getvalue().splitlines()
+        expected = [json.loads(json.dumps(asdict(r))) for r in results]
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_lists_one_item_per_line(self):
+        materials = [{"value": "cattle-fym", "name": "Cattle FYM", "unit": "t"}] * 3
+        self.assertEqual(len(format_material_list(materials, "ndjson").splitlines()), 3)
+
+
+class TestCsv(unittest.TestCase):
+    def _rows(self, text: str) -> list[dict]:
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_single_result(self):
+        rec = recommend_all("winter-wheat-feed", 2, 2, 1)
+        text = format_recommendation(rec, "csv")
+        self.assertFalse(text.endswith("\n"))
+        (row,) = self._rows(text)
+        self.assertEqual(row["crop"], rec.crop)
+        self.assertEqual(float(row["potassium"]), rec.potassium)
+        self.assertEqual(row["notes"].split(" | "), rec.notes)
+
+    def test_columns_match_serialisers(self):
+        for result in _results():
+            if isinstance(result, NitrogenTimingResult):
+                continue
+            (row,) = self._rows(_csv_text([result]))
+            self.assertEqual(list(row), list(to_dict(result)), type(result).__name__)
+
+    def test_none_is_empty(self):
+        (row,) = self._rows(format_sns(calculate_sns("cereals", "medium", "high"), "csv"))
+        self.assertEqual((row["smn"], row["crop_n"], row["sns_value"]), ("", "", ""))
+
+    def test_coded_notes_rendered(self):
+        coded = recommend_all_coded("veg-celery-seedbed", 1, 2, 2)
+        (row,) = self._rows(_csv_text([coded]))
+        self.assertEqual(row["notes"].split(" | "), [render(*note) for note in coded.notes])
+
+    def test_timing_layout(self):
+        result = nitrogen_timing("winter-wheat-feed", 220.0)
+        (row,) = self._rows(format_timing(result, "csv"))
+        self.assertEqual(tuple(row), TIMING_CSV_COLUMNS)
+        self.assertEqual(int(row["dressings"]), len(result.splits))
+        for i, split in enumerate(result.splits, start=1):
+            self.assertEqual(float(row[f"dressing_{i}_amount"]), split.amount)
+            self.assertEqual(row[f"dressing_{i}_timing"], split.timing)
+        self.assertEqual(row[f"dressing_{CSV_MAX_SPLITS}_amount"], "")
+
+    def test_max_splits_covers_every_rule(self):
+        most = max(len(r["splits"]) for rules in NITROGEN_TIMING_RULES.values() for r in rules)
+        self.assertEqual(most, CSV_MAX_SPLITS)
+        result = NitrogenTimingResult("x", 6.0, [NitrogenSplit(1.0, "t")] * (CSV_MAX_SPLITS + 1))
+        with self.assertRaises(ValueError):
+            format_timing(result, "csv")
+
+    def test_write_csv_streams(self):
+        def results():
+            for n in range(0, 300, 10):
+                yield nitrogen_timing("winter-wheat-feed", float(n))
+
+        out = io.StringIO()
+        self.assertEqual(write_csv(results(), out), 30)
+        rows = self._rows(out.getvalue())
+        self.assertEqual([float(r["total_n"]) for r in rows], list(range(0, 300, 10)))
+
+    def test_write_csv_mixed_types(self):
+        recs = [recommend_all("peas", 1, 1, 1), recommend_all_coded("peas", 1, 1, 1)]
+        self.assertEqual(write_csv(recs, io.StringIO()), 2)
+        with self.assertRaises(TypeError):
+            write_csv([recs[0], calculate_sns("cereals", "light", "low")], io.StringIO())
+        self.assertEqual(write_csv([], io.StringIO()), 0)
+
+    def test_lists_and_single_nutrient(self):
+        crops = [{"value": "peas", "name": "Peas", "category": "arable"}]
+        self.assertEqual(format_crop_list(crops, "csv"), "value,name,category\npeas,Peas,arable")
+        self.assertEqual(
+            format_single_nutrient("Peas", "Nitrogen (N)", "kg/ha", 0, "csv"),
+            "crop,nutrient,value,unit\nPeas,Nitrogen (N),0,kg/ha",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for freezing the data tables before fork.
+
+Freezing is process-wide and cannot be undone, so each test runs in a
+fresh interpreter.
+"""
+
+import pathlib
+import subprocess
+import sys
+import unittest
+
+_REPO_ROOT = pathlib.Path(__file__).parents[1]
+
+_SCRIPT = """
+import gc, itertools
+from types import MappingProxyType
+import rb209.data.crops, rb209.data.timing, rb209.notes, rb209.vector
+from rb209.data import freeze_tables
+from rb209.engine import calculate_organic, nitrogen_timing, recommend_all, recommend_fruit_all
+
+def results():
+    out = [recommend_all(c, s, 2, 1, soil_type=soil) for c, s, soil in itertools.product(
+        ("winter-wheat-feed", "peas", "veg-leeks", "grass-silage"), range(7), (None, "light"))]
+    out += [nitrogen_timing("winter-wheat-feed", float(n)) for n in range(0, 300, 20)]
+    out += [calculate_organic("pig-slurry", 30.0, "spring", True, "light")]
+    out += [recommend_fruit_all("fruit-strawberry-main", "clay", 2, 2, 2, sns_index=2)]
+    return repr(out)
+
+expected = results()
+assert freeze_tables() > 40
+assert results() == expected
+
+crop_info = rb209.data.crops.CROP_INFO
+assert type(crop_info) is MappingProxyType
+assert type(crop_info["peas"]) is MappingProxyType
+assert rb209.notes.CROP_INFO is crop_info
+assert type(rb209.data.timing.NITROGEN_TIMING_RULES["winter-wheat-feed"]) is tuple
+try:
+    crop_info["peas"]["name"] = "x"
+except TypeError:
+    pass
+else:
+    raise AssertionError("table still mutable")
+assert gc.get_freeze_count() > 0
+print("ok")
+"""
+
+
+class TestFreezeTables(unittest.TestCase):
+    def test_frozen_tables_give_same_results(self):
+        result = subprocess.run(
+            [sys.executable, "-c", _SCRIPT],
+            capture_output=True, text=True, cwd=_REPO_ROOT,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
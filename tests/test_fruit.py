@@ -1,7 +1,9 @@
 """Tests for Section 7 fruit, vine and hop recommendations."""
 
+import itertools
 import unittest
 
+from rb209.data.crops import CROP_INFO
 from rb209.models import FruitSoilCategory, OrchardManagement
 from rb209.data.fruit import (
     FRUIT_PREPLANT_PKM,
@@ -13,11 +15,13 @@ from rb209.data.fruit import (
     FRUIT_STRAWBERRY_PKM,
     FRUIT_HOPS_NITROGEN,
     FRUIT_HOPS_PKM,
+    FRUIT_RESOLVER,
 )
 from rb209.engine import (
     recommend_fruit_nitrogen,
     recommend_fruit_pkm,
     recommend_fruit_all,
+    recommend_fruit_many,
     recommend_sulfur,
 )
 
@@ -521,5 +525,65 @@ class TestErrorHandling(unittest.TestCase):
             )
 
 
+class TestFruitResolver(unittest.TestCase):
+    """16. Compiled per-crop resolver."""
+
+    def test_covers_every_fruit_crop(self):
+        fruit = {crop for crop, info in CROP_INFO.items() if info["category"] == "fruit"}
+        self.assertEqual(set(FRUIT_RESOLVER), fruit)
+
+    def test_pkm_rows_match_tables(self):
+        kind, _, (p, k, mg) = FRUIT_RESOLVER["fruit-hops"]
+        self.assertEqual(kind, "hops")
+        self.assertEqual(p[9], FRUIT_HOPS_PKM[("phosphate", 5)])
+        self.assertEqual(k[3], FRUIT_HOPS_PKM[("potash", 3)])
+        _, _, (p, k, mg) = FRUIT_RESOLVER["fruit-vine"]
+        self.assertEqual(k[7], FRUIT_SOFT_PKM[("fruit-vine", "potash", 4)])
+        _, _, (p, k, mg) = FRUIT_RESOLVER["hops-preplant"]
+        self.assertEqual(mg[0], FRUIT_PREPLANT_PKM[("hops", "magnesium", 0)])
+
+    def test_strawberry_clay_is_other_mineral(self):
+        _, table, _ = FRUIT_RESOLVER["fruit-strawberry-ever"]
+        self.assertIs(table["clay"], table["other-mineral"])
+        self.assertEqual(
+            table["clay"][2], FRUIT_STRAWBERRY_NITROGEN[("fruit-strawberry-ever", "other-mineral", 2)],
+        )
+
+
+class TestRecommendFruitMany(unittest.TestCase):
+    """17. Batch recommendations for orchard blocks."""
+
+    def test_matches_recommend_fruit_all(self):
+        crops = sorted(FRUIT_RESOLVER)
+        rows = [
+            {"crop": crop, "soil_category": soil, "p_index": p, "k_index": k, "mg_index": 2,
+             "orchard_management": "overall-grass", "sns_index": 3}
+            for crop, soil, p, k in itertools.product(
+                crops, ["deep-silt", "clay", "other-mineral"], [0, 4, 9], [0, 1, 6],
+            )
+        ]
+        self.assertEqual(
+            recommend_fruit_many(rows), [recommend_fruit_all(**row) for row in rows],
+        )
+
+    def test_error_names_row(self):
+        rows = [
+            {"crop": "fruit-hops", "soil_category": "clay", "p_index": 0, "k_index": 0, "mg_index": 0},
+            {"crop": "fruit-hops", "soil_category": "light-sand", "p_index": 0, "k_index": 0,
+             "mg_index": 0},
+        ]
+        with self.assertRaisesRegex(ValueError, "light sand soils .* at row 1"):
+            recommend_fruit_many(rows)
+        rows[1] = dict(rows[0], k_index=10)
+        with self.assertRaisesRegex(ValueError, "K index .* at row 1"):
+            recommend_fruit_many(rows)
+
+    def test_sns_index_type_checked_per_row(self):
+        base = {"crop": "fruit-strawberry-main", "soil_category": "clay",
+                "p_index": 0, "k_index": 0, "mg_index": 0}
+        with self.assertRaisesRegex(ValueError, "non-negative integer, got True at row 1"):
+            recommend_fruit_many([dict(base, sns_index=1), dict(base, sns_index=True)])
+
+
 if __name__ == "__main__":
     unittest.main()
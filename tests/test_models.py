@@ -0,0 +1,145 @@
+"""Tests for the frozen result variants and RecommendationBatch."""
+
+import csv
+import dataclasses
+import io
+import json
+import sys
+import unittest
+
+from rb209.engine import (
+    calculate_organic,
+    calculate_sns,
+    calculate_smn_sns,
+    nitrogen_timing,
+    recommend_all,
+    recommend_all_coded,
+)
+from rb209.formatters import to_dict, write_csv, write_ndjson
+from rb209.models import (
+    FrozenNitrogenTimingResult,
+    FrozenNutrientRecommendation,
+    FrozenOrganicNutrients,
+    FrozenSNSResult,
+    RecommendationBatch,
+)
+
+
+def _json(obj) -> object:
+    return json.loads(json.dumps(to_dict(obj)))
+
+
+def _recommendations(fn=recommend_all) -> list:
+    return [
+        fn("winter-wheat-feed", 2, 2, 1),
+        fn("winter-wheat-feed", 2, 2, 1, expected_yield=9.5, ber=3.0),
+        fn("peas", 3, 1, 1),
+        fn("veg-celery-seedbed", 1, 2, 2, soil_type="light"),
+        fn("winter-wheat-feed", 2, 2, 1),
+    ]
+
+
+class TestFrozenVariants(unittest.TestCase):
+    def test_match_mutable_results(self):
+        pairs = [
+            (FrozenNutrientRecommendation, recommend_all("winter-wheat-feed", 2, 2, 1)),
+            (FrozenSNSResult, calculate_sns("cereals", "medium", "high")),
+            (FrozenSNSResult, calculate_smn_sns(80.0, 15.0)),
+            (FrozenOrganicNutrients, calculate_organic("pig-slurry", 30.0, "spring", True)),
+            (FrozenNitrogenTimingResult, nitrogen_timing("winter-wheat-feed", 220.0)),
+        ]
+        for cls, result in pairs:
+            frozen = cls.from_result(result)
+            self.assertEqual(
+                [f.name for f in dataclasses.fields(frozen)],
+                [f.name for f in dataclasses.fields(result)],
+            )
+            self.assertEqual(_json(frozen), _json(result), cls.__name__)
+            self.assertIsInstance(frozen.notes, tuple)
+
+    def test_immutable_and_slotted(self):
+        frozen = FrozenNutrientRecommendation.from_result(recommend_all("peas", 3, 1, 1))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            frozen.nitrogen = 10.0
+        self.assertFalse(hasattr(frozen, "__dict__"))
+        self.assertEqual(hash(frozen), hash(dataclasses.replace(frozen)))
+
+    def test_timing_splits_frozen(self):
+        frozen = FrozenNitrogenTimingResult.from_result(nitrogen_timing("winter-wheat-feed", 220.0))
+        self.assertIsInstance(frozen.splits, tuple)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            frozen.splits[0].amount = 1.0
+
+    def test_smaller_than_mutable(self):
+        rec = recommend_all("winter-wheat-feed", 2, 2, 1)
+        frozen = FrozenNutrientRecommendation.from_result(rec)
+        mutable = sys.getsizeof(rec) + sys.getsizeof(rec.__dict__) + sys.getsizeof(rec.notes)
+        self.assertLess(sys.getsizeof(frozen) + sys.getsizeof(frozen.notes), mutable)
+
+
+class TestRecommendationBatch(unittest.TestCase):
+    def test_rows_match_results(self):
+        for fn in (recommend_all, recommend_all_coded):
+            results = _recommendations(fn)
+            batch = RecommendationBatch(results)
+            self.assertEqual(len(batch), len(results))
+            for row, rec in zip(batch, results):
+                self.assertEqual(row.crop, rec.crop)
+                self.assertEqual(row.nitrogen, rec.nitrogen)
+                self.assertEqual(row.sodium, rec.sodium)
+                self.assertEqual(row.notes, tuple(rec.notes))
+                self.assertEqual(_json(row), _json(rec))
+
+    def test_dictionary_encoding(self):
+        results = _recommendations()
+        batch = RecommendationBatch(results)
+        self.assertEqual(batch.crops, list(dict.fromkeys(r.crop for r in results)))
+        self.assertEqual(len(batch.note_sets), 4)
+        self.assertEqual(batch.note_ids[0], batch.note_ids[4])
+        self.assertEqual(batch.nbytes(), len(batch) * (2 + 4 + 6 * 8))
+
+    def test_indexing(self):
+        results = _recommendations()
+        batch = RecommendationBatch()
+        batch.append(results[0])
+        batch.extend(iter(results[1:]))
+        self.assertEqual(batch[-1].crop, results[-1].crop)
+        self.assertEqual(batch[3].potassium, results[3].potassium)
+        with self.assertRaises(IndexError):
+            batch[len(results)]
+
+    def test_failed_row_leaves_batch_unchanged(self):
+        results = _recommendations()
+        batch = RecommendationBatch(results[:1])
+        bad = dataclasses.replace(results[1], crop="New Crop", nitrogen=None, notes=["New note"])
+        with self.assertRaises(TypeError):
+            batch.extend([results[2], bad])
+        self.assertEqual(len(batch), 2)
+        for column in (batch.note_ids, batch.nitrogen, batch.phosphorus, batch.sodium):
+            self.assertEqual(len(column), 2)
+        self.assertEqual(batch[1].phosphorus, results[2].phosphorus)
+        self.assertNotIn("New Crop", batch.crops)
+        self.assertNotIn(("New note",), batch.note_sets)
+
+    def test_formatters_accept_rows(self):
+        for fn in (recommend_all, recommend_all_coded):
+            results = _recommendations(fn)
+            batch = RecommendationBatch(results)
+            out = io.StringIO()
+            self.assertEqual(write_ndjson(batch, out), len(results))
+            self.assertEqual(
+                [json.loads(line) for line in out.getvalue().splitlines()],
+                [_json(rec) for rec in results],
+            )
+            from_batch, from_results = io.StringIO(), io.StringIO()
+            write_csv(batch, from_batch)
+            write_csv(results, from_results)
+            # Nutrients read back as floats; notes render the same.
+            self.assertEqual(
+                [row["notes"] for row in csv.DictReader(io.StringIO(from_batch.getvalue()))],
+                [row["notes"] for row in csv.DictReader(io.StringIO(from_results.getvalue()))],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
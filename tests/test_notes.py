@@ -0,0 +1,91 @@
+"""Tests for the coded note catalogue."""
+
+import io
+import itertools
+import json
+import unittest
+
+from rb209.batch import iter_rows, recommend_rows, write_note_catalogue
+from rb209.data.crops import CROP_INFO
+from rb209.engine import recommend_all, recommend_all_coded
+from rb209.notes import TEMPLATES, NoteCode, catalogue, render
+from rb209.vector import NoteFlag
+
+
+def _render_from_catalogue(cat: dict, note: list) -> str:
+    """Render a ``[code, *params]`` note using only the JSON catalogue."""
+    code, *params = note
+    if code == cat["codes"]["CROP_NOTE"]:
+        return cat["crop_notes"][params[0]]
+    if code == cat["codes"]["SODIUM"]:
+        return cat["sodium_notes"][params[0]][params[1]]
+    return cat["templates"][str(code)].format(*params)
+
+
+class TestNoteCodes(unittest.TestCase):
+    def test_codes_match_note_flags(self):
+        for code in NoteCode:
+            self.assertEqual(NoteFlag(1 << code).name, code.name)
+
+    def test_every_template_has_a_code(self):
+        for code in TEMPLATES:
+            self.assertIsInstance(code, NoteCode)
+
+    def test_unknown_note_raises(self):
+        with self.assertRaises(ValueError):
+            render(NoteCode.CROP_NOTE, ("not-a-crop",))
+        with self.assertRaises(ValueError):
+            render(99)
+
+
+class TestCodedRecommendation(unittest.TestCase):
+    def test_rendered_notes_match_recommend_all(self):
+        grid = itertools.product(
+            sorted(CROP_INFO), [0, 3, 6], [0, 2], [0, 2, 4], [0, 2], [True, False],
+            [None, "light"],
+        )
+        for crop, sns, p, k, mg, straw, soil in grid:
+            if CROP_INFO[crop]["category"] == "fruit":
+                continue
+            args = (crop, sns, p, k, mg, straw, soil)
+            try:
+                text = recommend_all(*args)
+            except ValueError:
+                continue
+            coded = recommend_all_coded(*args)
+            self.assertEqual([render(*note) for note in coded.notes], text.notes, args)
+            self.assertEqual(coded.nitrogen, text.nitrogen)
+
+    def test_parametric_notes(self):
+        args = ("winter-wheat-feed", 2, 2, 1)
+        kwargs = {"expected_yield": 9.5, "ber": 3.0}
+        text = recommend_all(*args, **kwargs)
+        coded = recommend_all_coded(*args, **kwargs)
+        codes = [code for code, _ in coded.notes]
+        self.assertIn(NoteCode.YIELD_ADJUSTED, codes)
+        self.assertIn(NoteCode.BER_ADJUSTED, codes)
+        self.assertEqual([render(*note) for note in coded.notes], text.notes)
+
+
+class TestCatalogue(unittest.TestCase):
+    def test_catalogue_renders_every_note(self):
+        cat = json.loads(json.dumps(catalogue()))
+        for crop in ("winter-wheat-feed", "veg-celery-seedbed", "sugar-beet", "peas"):
+            text = recommend_all(crop, 1, 0, 0, 0, soil_type="light")
+            coded = recommend_all_coded(crop, 1, 0, 0, 0, soil_type="light")
+            rendered = [_render_from_catalogue(cat, [c, *p]) for c, p in coded.notes]
+            self.assertEqual(rendered, text.notes)
+
+    def test_batch_codes_mode(self):
+        src = "crop,sns_index,p_index,k_index\nveg-celery-seedbed,1,2,2\n"
+        out = io.StringIO()
+        write_note_catalogue(out)
+        cat = json.loads(out.getvalue())["note_catalogue"]
+        results = list(recommend_rows(iter_rows(io.StringIO(src), "csv"), note_codes=True))
+        record = results[0][2]
+        rendered = [_render_from_catalogue(cat, note) for note in record["notes"]]
+        self.assertEqual(rendered, recommend_all("veg-celery-seedbed", 1, 2, 2).notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 """Tests for organic material calculations."""
 
+import itertools
+import math
 import unittest
 
 from rb209.engine import calculate_organic
+from rb209.vector import ORGANIC_GRID_FIELDS, ORGANIC_MATERIALS, organic_grid
 
 
 class TestOrganic(unittest.TestCase):
@@ -60,5 +63,42 @@ class TestOrganic(unittest.TestCase):
         self.assertIn("waterlogged", combined)
 
 
+class TestOrganicGrid(unittest.TestCase):
+    def test_matches_calculate_organic(self):
+        rates = [0, 0.5, 1 / 3, 7, 25, 50]
+        timings = (None, "autumn", "summer")
+        incorporated = (False, True)
+        soils = (None, "light", "heavy")
+        grid = organic_grid(rates, timings=timings, soil_types=soils)
+        combos = itertools.product(ORGANIC_MATERIALS, timings, incorporated, soils, rates)
+        for row, (material, timing, inc, soil, rate) in enumerate(combos):
+            try:
+                expected = calculate_organic(material, rate, timing, inc, soil)
+            except ValueError:
+                self.assertTrue(math.isnan(grid["available_n"][row]))
+                self.assertEqual(grid["total_n"][row], calculate_organic(material, rate).total_n)
+                continue
+            for field in ORGANIC_GRID_FIELDS:
+                self.assertEqual(grid[field][row], getattr(expected, field), (material, field))
+        self.assertEqual(len(grid["so3"]), row + 1)
+
+    def test_default_axes(self):
+        grid = organic_grid([10], materials=["pig-slurry"])
+        # 5 timings (with None) x 2 incorporation options x 4 soil types.
+        self.assertEqual(len(grid["available_n"]), 40)
+
+    def test_invalid_axes(self):
+        with self.assertRaisesRegex(ValueError, "non-negative"):
+            organic_grid([-1])
+        with self.assertRaisesRegex(ValueError, "Unknown organic material 'mud'"):
+            organic_grid([1], materials=["mud"])
+        with self.assertRaisesRegex(ValueError, "Unknown timing 'monsoon'"):
+            organic_grid([1], timings=["monsoon"])
+        with self.assertRaisesRegex(ValueError, "Unknown soil type 'sandy'"):
+            organic_grid([1], soil_types=["sandy"])
+        with self.assertRaisesRegex(ValueError, "incorporated"):
+            organic_grid([1], incorporated=["yes"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for the multi-process batch executor."""
+
+import io
+import unittest
+
+from rb209.batch import (
+    iter_rows,
+    organic_row,
+    organic_rows,
+    recommend_row,
+    recommend_rows,
+    timing_row,
+    timing_rows,
+)
+from rb209.parallel import default_workers, map_ordered
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+class TestMapOrdered(unittest.TestCase):
+    def test_in_process(self):
+        self.assertEqual(list(map_ordered(_square, range(5), workers=1)), [0, 1, 4, 9, 16])
+
+    def test_multi_process_keeps_order(self):
+        result = list(map_ordered(_square, range(1000), workers=2, chunk_size=7))
+        self.assertEqual(result, [x * x for x in range(1000)])
+
+    def test_empty_input(self):
+        self.assertEqual(list(map_ordered(_square, [], workers=2)), [])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(map_ordered(_square, range(3), workers=2, chunk_size=0))
+
+    def test_default_workers_positive(self):
+        self.assertGreaterEqual(default_workers(), 1)
+
+
+class TestParallelRecommend(unittest.TestCase):
+    def _rows(self):
+        lines = ["field,crop,sns_index,p_index,k_index"]
+        crops = ["winter-wheat-feed", "spring-barley", "bad-crop", "potatoes-maincrop"]
+        for i in range(200):
+            lines.append(f"F{i},{crops[i % 4]},{i % 7},{i % 5},{i % 5}")
+        return iter_rows(io.StringIO("\n".join(lines)), "csv")
+
+    def test_matches_single_process(self):
+        serial = list(recommend_rows(self._rows(), workers=1))
+        parallel = list(recommend_rows(self._rows(), workers=3, chunk_size=16))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sum(1 for r in serial if r[3] is not None), 50)
+
+    def test_worker_result_is_compact_tuple(self):
+        row_number, field_id, values, error = recommend_row(
+            (1, {"field": "A", "crop": "peas", "sns_index": 0, "p_index": 0, "k_index": 0}, None)
+        )
+        self.assertIsNone(error)
+        self.assertIsInstance(values, tuple)
+        self.assertIsInstance(values[-1], tuple)
+
+
+class TestParallelTimingOrganic(unittest.TestCase):
+    def _rows(self, header, make_row):
+        lines = [header] + [make_row(i) for i in range(200)]
+        return iter_rows(io.StringIO("\n".join(lines)), "csv")
+
+    def test_timing_matches_single_process(self):
+        crops = ["winter-wheat-feed", "potatoes-maincrop", "bad-crop", "winter-oilseed-rape"]
+
+        def make_row(i):
+            return f"F{i},{crops[i % 4]},{i * 2},{'light' if i % 3 else ''}"
+
+        header = "field,crop,total_n,soil_type"
+        serial = list(timing_rows(self._rows(header, make_row), workers=1))
+        parallel = list(timing_rows(self._rows(header, make_row), workers=3, chunk_size=16))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sum(1 for r in serial if r[3] is not None), 50)
+
+    def test_organic_matches_single_process(self):
+        materials = ["cattle-fym", "pig-slurry", "bad-material", "poultry-litter"]
+
+        def make_row(i):
+            timing = "autumn" if materials[i % 4] == "pig-slurry" else ""
+            return f"F{i},{materials[i % 4]},{i % 40},{timing},{i % 2}"
+
+        header = "field,material,rate,timing,incorporated"
+        serial = list(organic_rows(self._rows(header, make_row), workers=1))
+        parallel = list(organic_rows(self._rows(header, make_row), workers=3, chunk_size=16))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sum(1 for r in serial if r[3] is not None), 50)
+
+    def test_worker_results_are_compact_tuples(self):
+        _, _, timing, _ = timing_row((1, {"crop": "winter-wheat-feed", "total_n": 200}, None))
+        _, _, organic, _ = organic_row((1, {"material": "cattle-fym", "rate": 25}, None))
+        self.assertIsInstance(timing[2][0], tuple)
+        self.assertIsInstance(timing[-1], tuple)
+        self.assertIsInstance(organic[-1], tuple)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Tests for the JSON-RPC server."""
+
+import asyncio
+import json
+import os
+import sys
+import types
+import tempfile
+import unittest
+from dataclasses import asdict
+
+from rb209.engine import calculate_lime, calculate_sns, recommend_all
+from rb209.formatters import format_recommendation
+from rb209.server import (
+    ENGINE_ERROR,
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    dispatch,
+    handle_line,
+    start_server,
+)
+
+_WHEAT = {"crop": "winter-wheat-feed", "sns_index": 2, "p_index": 2, "k_index": 1}
+
+
+class TestDispatch(unittest.TestCase):
+    def test_recommend_all_matches_json_formatter(self):
+        response = dispatch({"jsonrpc": "2.0", "id": 1, "method": "recommend_all", "params": _WHEAT})
+        rec = recommend_all(**_WHEAT)
+        self.assertEqual(response["id"], 1)
+        self.assertEqual(response["result"], json.loads(format_recommendation(rec, "json")))
+
+    def test_positional_params(self):
+        response = dispatch({"id": "a", "method": "calculate_lime", "params": [6.0, 6.5, "medium"]})
+        self.assertEqual(response["result"], asdict(calculate_lime(6.0, 6.5, "medium")))
+
+    def test_calculate_sns(self):
+        params = {"previous_crop": "cereals", "soil_type": "medium", "rainfall": "medium"}
+        response = dispatch({"id": 2, "method": "calculate_sns", "params": params})
+        self.assertEqual(response["result"], asdict(calculate_sns(**params)))
+
+    def test_engine_error(self):
+        response = dispatch({"id": 3, "method": "recommend_all", "params": dict(_WHEAT, crop="nope")})
+        self.assertEqual(response["error"]["code"], ENGINE_ERROR)
+        self.assertIn("Unknown crop", response["error"]["message"])
+
+    def test_invalid_params(self):
+        response = dispatch({"id": 4, "method": "recommend_all", "params": {"crop": "peas"}})
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+
+    def test_trusted_rejected(self):
+        for params in (dict(_WHEAT, sns_index=7, trusted=True), dict(_WHEAT, crop="nope", trusted=True),
+                       dict(_WHEAT, trusted=False)):
+            response = dispatch({"id": 6, "method": "recommend_all", "params": params})
+            self.assertEqual(response["id"], 6)
+            self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+            self.assertIn("trusted", response["error"]["message"])
+
+    def test_internal_error(self):
+        params = {"previous_crop": "cereals", "soil_type": "medium", "rainfall": "medium",
+                  "grass_history": {}}
+        response = dispatch({"id": 7, "method": "calculate_sns", "params": params})
+        self.assertEqual(response["id"], 7)
+        self.assertEqual(response["error"]["code"], INTERNAL_ERROR)
+
+    def test_unknown_method(self):
+        response = dispatch({"id": 5, "method": "shutdown"})
+        self.assertEqual(response["error"]["code"], METHOD_NOT_FOUND)
+
+    def test_invalid_request(self):
+        self.assertEqual(dispatch([1, 2])["error"]["code"], INVALID_REQUEST)
+
+    def test_notification_gets_no_response(self):
+        self.assertIsNone(dispatch({"method": "recommend_all", "params": _WHEAT}))
+
+    def test_parse_error(self):
+        response = json.loads(handle_line(b"{not json"))
+        self.assertEqual(response["error"]["code"], PARSE_ERROR)
+
+
+class TestServer(unittest.TestCase):
+    async def _exchange(self, connect, lines):
+        reader, writer = await connect()
+        for line in lines:
+            writer.write(json.dumps(line).encode() + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    def test_tcp_concurrent_clients(self):
+        async def run():
+            server = await start_server(port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                def connect():
+                    return asyncio.open_connection("127.0.0.1", port)
+                clients = [
+                    self._exchange(connect, [
+                        {"id": i * 10 + j, "method": "recommend_all",
+                         "params": dict(_WHEAT, sns_index=j)}
+                        for j in range(3)
+                    ])
+                    for i in range(4)
+                ]
+                return await asyncio.gather(*clients)
+
+        results = asyncio.run(run())
+        for i, responses in enumerate(results):
+            for j, response in enumerate(responses):
+                self.assertEqual(response["id"], i * 10 + j)
+                expected = asdict(recommend_all(**dict(_WHEAT, sns_index=j)))
+                self.assertEqual(response["result"], expected)
+
+    def test_start_server_preloads_tables(self):
+        async def run():
+            server = await start_server(port=0)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(run())
+        lazy = [
+            name for name, module in sys.modules.items()
+            if name.startswith("rb209.") and module is not None
+            and type(module) is not types.ModuleType
+        ]
+        self.assertEqual(lazy, [])
+
+    def test_connection_survives_internal_error(self):
+        async def run():
+            server = await start_server(port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await self._exchange(
+                    lambda: asyncio.open_connection("127.0.0.1", port),
+                    [
+                        {"id": 1, "method": "calculate_sns",
+                         "params": {"previous_crop": "cereals", "soil_type": "medium",
+                                    "rainfall": "medium", "grass_history": {}}},
+                        {"id": 2, "method": "recommend_all", "params": _WHEAT},
+                    ],
+                )
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first["error"]["code"], INTERNAL_ERROR)
+        self.assertEqual(second["result"]["nitrogen"], recommend_all(**_WHEAT).nitrogen)
+
+    @unittest.skipUnless(hasattr(asyncio, "open_unix_connection"), "Unix sockets unavailable")
+    def test_unix_socket(self):
+        async def run(path):
+            server = await start_server(socket_path=path)
+            async with server:
+                return await self._exchange(
+                    lambda: asyncio.open_unix_connection(path),
+                    [{"id": 1, "method": "recommend_all", "params": _WHEAT}],
+                )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            responses = asyncio.run(run(os.path.join(tmp, "rb209.sock")))
+        self.assertEqual(responses[0]["result"]["nitrogen"], recommend_all(**_WHEAT).nitrogen)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,43 @@
 """Tests for SNS calculation."""
 
+import itertools
 import unittest
 
-from rb209.engine import calculate_smn_sns, calculate_sns, sns_value_to_index
+from rb209.data.sns import GRASS_LEY_SNS_LOOKUP
+from rb209.engine import (
+    calculate_grass_ley_sns,
+    calculate_smn_sns,
+    calculate_sns,
+    sns_value_to_index,
+)
+from rb209.vector import calculate_grass_ley_sns_many
+
+_LEY_GRID = list(itertools.product(
+    ["1-2yr", "3-5yr"], ["low", "high"], ["cut", "grazed", "1-cut-then-grazed"],
+    ["light", "medium", "heavy"], ["low", "medium", "high"], [1, 2, 3],
+))
+
+
+def _reference_ley_sns(ley_age, n_intensity, management, soil_type, rainfall, year):
+    """Table 4.6 lookup as calculate_grass_ley_sns did before it was enumerated."""
+    if soil_type == "light":
+        soil_cat = "light"
+    elif soil_type == "medium":
+        soil_cat = "medium"
+    else:
+        soil_cat = "heavy-low" if rainfall == "low" else "heavy-medium-high"
+
+    if ley_age == "3-5yr" and n_intensity == "high" and management == "grazed":
+        ley_row = "high-n-grazed-35yr"
+    elif (
+        (n_intensity == "high" and management == "grazed")
+        or (ley_age == "3-5yr" and n_intensity == "low" and management == "grazed")
+        or (ley_age == "3-5yr" and n_intensity == "high" and management == "1-cut-then-grazed")
+    ):
+        ley_row = "high-n-grazed-or-mixed"
+    else:
+        ley_row = "low-n-or-cut"
+    return GRASS_LEY_SNS_LOOKUP[(soil_cat, ley_row)][year - 1]
 
 
 class TestSNS(unittest.TestCase):
@@ -128,5 +163,34 @@ class TestCalculateSMN(unittest.TestCase):
         self.assertEqual(result.rainfall, "")
 
 
+class TestGrassLeyTable(unittest.TestCase):
+    def test_function_matches_reference_everywhere(self):
+        for args in _LEY_GRID:
+            self.assertEqual(
+                calculate_grass_ley_sns(*args).sns_index, _reference_ley_sns(*args), args,
+            )
+
+    def test_vectorised_matches_reference_everywhere(self):
+        out = calculate_grass_ley_sns_many(*zip(*_LEY_GRID))
+        self.assertEqual(list(out), [_reference_ley_sns(*args) for args in _LEY_GRID])
+
+    def test_vectorised_scalars_and_default_year(self):
+        out = calculate_grass_ley_sns_many(["3-5yr", "1-2yr"], "high", "grazed", "heavy", "low")
+        self.assertEqual(list(out), [
+            calculate_grass_ley_sns("3-5yr", "high", "grazed", "heavy", "low").sns_index,
+            calculate_grass_ley_sns("1-2yr", "high", "grazed", "heavy", "low").sns_index,
+        ])
+
+    def test_vectorised_errors(self):
+        with self.assertRaisesRegex(ValueError, "organic soils"):
+            calculate_grass_ley_sns_many(["1-2yr"], "low", "cut", "organic", "low")
+        with self.assertRaisesRegex(ValueError, "at row 1"):
+            calculate_grass_ley_sns_many(["1-2yr", "6yr"], "low", "cut", "light", "low")
+        with self.assertRaisesRegex(ValueError, "year must be 1, 2, or 3"):
+            calculate_grass_ley_sns_many(["1-2yr"], "low", "cut", "light", "low", [4])
+        with self.assertRaisesRegex(ValueError, "Missing ley_age at row 0"):
+            calculate_grass_ley_sns_many([None], "low", "cut", "light", "low")
+
+
 if __name__ == "__main__":
     unittest.main()
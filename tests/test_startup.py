@@ -0,0 +1,101 @@
+"""Startup budget: the CLI must not load tables it does not use."""
+
+import json
+import re
+import subprocess
+import sys
+import unittest
+
+# Ceiling on the cumulative ``-X importtime`` of the top-level rb209 imports
+# for ``rb209 --help``, as a multiple of ``import json`` measured the same way
+# on the same machine.  Typical runs are 3-4x.  Both sides take the fastest of
+# a few runs, and the margin absorbs load on a shared machine.
+IMPORT_BUDGET_RATIO = 8
+_IMPORT_RUNS = 3
+
+_HEAVY = (
+    "rb209.data.fruit",
+    "rb209.data.nitrogen",
+    "rb209.data.sns",
+    "rb209.data.timing",
+    "rb209.data.yield_adjustments",
+    "rb209.tables",
+)
+
+# Runs the CLI in-process, then reports which rb209 modules were executed.
+# Modules bound by rb209.data.lazy_import but never used are still
+# importlib.util._LazyModule instances.
+_LOADED_SCRIPT = """
+import contextlib, io, json, sys, types
+from rb209.cli import main
+with contextlib.redirect_stdout(io.StringIO()):
+    main(sys.argv[1:])
+print(json.dumps(sorted(
+    name for name, module in sys.modules.items()
+    if name.startswith("rb209") and type(module) is types.ModuleType
+)))
+"""
+
+
+def _loaded_modules(*args: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _LOADED_SCRIPT, *args],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout))
+
+
+def _import_time_us(args: list[str], pattern: str) -> int:
+    """Fastest total cumulative ``-X importtime`` microseconds of the
+    top-level imports matching *pattern*, over several runs of *args*."""
+    line_re = re.compile(rf"import time:\s+\d+ \|\s+(\d+) \| ({pattern})$")
+    totals = []
+    for _ in range(_IMPORT_RUNS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *args], capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        totals.append(sum(
+            int(m.group(1)) for m in map(line_re.match, result.stderr.splitlines()) if m
+        ))
+    return min(totals)
+
+
+class TestStartup(unittest.TestCase):
+    def test_list_materials_loads_no_engine_tables(self):
+        loaded = _loaded_modules("list-materials")
+        self.assertIn("rb209.data.organic", loaded)
+        self.assertNotIn("rb209.engine", loaded)
+        for name in _HEAVY:
+            self.assertNotIn(name, loaded)
+
+    def test_lime_loads_only_lime_table(self):
+        loaded = _loaded_modules(
+            "lime", "--current-ph", "6.0", "--target-ph", "6.5", "--soil-type", "medium",
+        )
+        self.assertIn("rb209.data.lime", loaded)
+        for name in _HEAVY:
+            self.assertNotIn(name, loaded)
+
+    def test_recommend_loads_compiled_tables(self):
+        loaded = _loaded_modules(
+            "recommend", "--crop", "winter-wheat-feed",
+            "--sns-index", "2", "--p-index", "2", "--k-index", "1",
+        )
+        self.assertIn("rb209.tables", loaded)
+        self.assertNotIn("rb209.data.fruit", loaded)
+        self.assertNotIn("rb209.data.organic", loaded)
+
+    def test_import_budget(self):
+        baseline = _import_time_us(["-c", "import json"], r"json")
+        rb209 = _import_time_us(["-m", "rb209", "--help"], r"rb209\S*")
+        self.assertGreater(baseline, 0)
+        self.assertLess(
+            rb209, IMPORT_BUDGET_RATIO * baseline,
+            f"rb209 imports took {rb209} us, json {baseline} us",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
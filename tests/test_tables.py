@@ -0,0 +1,129 @@
+"""Differential tests: compiled lookup tables vs the source dict tables."""
+
+import unittest
+
+from rb209.data.crops import CROP_INFO
+from rb209.data.nitrogen import (
+    NITROGEN_RECOMMENDATIONS,
+    NITROGEN_SOIL_SPECIFIC,
+    NITROGEN_VEG_RECOMMENDATIONS,
+)
+from rb209.data.phosphorus import PHOSPHORUS_RECOMMENDATIONS, PHOSPHORUS_VEG_RECOMMENDATIONS
+from rb209.data.potassium import (
+    POTASSIUM_RECOMMENDATIONS,
+    POTASSIUM_STRAW_INCORPORATED,
+    POTASSIUM_STRAW_REMOVED,
+    POTASSIUM_VEG_RECOMMENDATIONS,
+    POTASSIUM_VEG_K2_UPPER,
+)
+from rb209.engine import recommend_nitrogen, recommend_phosphorus, recommend_potassium
+from rb209.tables import (
+    CROP_ID,
+    CROPS,
+    NITROGEN,
+    PHOSPHORUS,
+    POTASSIUM,
+    SOIL_ID,
+    SOIL_TYPES,
+    nitrogen_offset,
+    phosphorus_offset,
+    potassium_offset,
+)
+
+_MISSING = object()
+
+
+def _probe(key, *tables):
+    """Return the value for *key* from the first table that holds it."""
+    for table in tables:
+        if key in table:
+            return table[key]
+    return _MISSING
+
+
+class TestCodes(unittest.TestCase):
+    def test_every_crop_has_an_id(self):
+        self.assertEqual(set(CROP_ID), set(CROP_INFO))
+        for crop, crop_id in CROP_ID.items():
+            self.assertEqual(CROPS[crop_id], crop)
+
+    def test_soil_zero_is_unspecified(self):
+        self.assertIsNone(SOIL_TYPES[0])
+        self.assertNotIn(None, SOIL_ID)
+        self.assertEqual(SOIL_ID["light"], 1)
+
+
+class TestNitrogenTable(unittest.TestCase):
+    def test_matches_fallback_chain(self):
+        for crop in CROPS:
+            for sns in range(7):
+                for soil in SOIL_TYPES:
+                    generic = _probe((crop, sns), NITROGEN_RECOMMENDATIONS, NITROGEN_VEG_RECOMMENDATIONS)
+                    if soil is not None:
+                        expected = NITROGEN_SOIL_SPECIFIC.get((crop, sns, soil), generic)
+                    else:
+                        expected = generic
+                    soil_id = 0 if soil is None else SOIL_ID[soil]
+                    value = NITROGEN[nitrogen_offset(CROP_ID[crop], sns, soil_id)]
+                    if expected is _MISSING:
+                        self.assertIsNone(value, (crop, sns, soil))
+                    else:
+                        self.assertEqual(value, expected, (crop, sns, soil))
+                        self.assertIs(type(value), type(expected))
+
+    def test_missing_data_raises(self):
+        # Fruit crops have no arable/vegetable N table entries.
+        with self.assertRaises(ValueError):
+            recommend_nitrogen("fruit-pear", 2)
+
+    def test_soil_specific_value(self):
+        self.assertEqual(recommend_nitrogen("winter-wheat-feed", 0, soil_type="light"), 180)
+
+
+class TestPhosphorusTable(unittest.TestCase):
+    def test_matches_fallback_chain(self):
+        for crop in CROPS:
+            for idx in range(5):
+                expected = _probe((crop, idx), PHOSPHORUS_RECOMMENDATIONS, PHOSPHORUS_VEG_RECOMMENDATIONS)
+                value = PHOSPHORUS[phosphorus_offset(CROP_ID[crop], idx)]
+                if expected is _MISSING:
+                    self.assertIsNone(value, (crop, idx))
+                else:
+                    self.assertEqual(value, expected, (crop, idx))
+
+    def test_clamped_index(self):
+        self.assertEqual(
+            recommend_phosphorus("winter-wheat-feed", 9),
+            recommend_phosphorus("winter-wheat-feed", 4),
+        )
+
+
+class TestPotassiumTable(unittest.TestCase):
+    def test_matches_fallback_chain(self):
+        for crop in CROPS:
+            for idx in range(5):
+                for straw in (False, True):
+                    for upper in (False, True):
+                        key = (crop, idx)
+                        if idx == 2 and upper and crop in POTASSIUM_VEG_K2_UPPER:
+                            expected = POTASSIUM_VEG_K2_UPPER[crop]
+                        elif CROP_INFO[crop].get("has_straw_option"):
+                            straw_table = POTASSIUM_STRAW_REMOVED if straw else POTASSIUM_STRAW_INCORPORATED
+                            expected = _probe(key, straw_table, POTASSIUM_RECOMMENDATIONS)
+                        else:
+                            expected = _probe(key, POTASSIUM_RECOMMENDATIONS, POTASSIUM_VEG_RECOMMENDATIONS)
+                        value = POTASSIUM[potassium_offset(CROP_ID[crop], idx, straw, upper)]
+                        if expected is _MISSING:
+                            self.assertIsNone(value, (crop, idx, straw, upper))
+                        else:
+                            self.assertEqual(value, expected, (crop, idx, straw, upper))
+
+    def test_straw_incorporated(self):
+        self.assertEqual(recommend_potassium("winter-barley", 0, straw_removed=False), 65)
+
+    def test_k2_upper_half(self):
+        self.assertEqual(recommend_potassium("veg-celery-seedbed", 2, k_upper_half=True), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,58 @@
 """Tests for Phase 2 — Nitrogen Timing and Split Dressings."""
 
+import json
 import unittest
 
-from rb209.engine import nitrogen_timing
-from rb209.models import NitrogenTimingResult, NitrogenSplit
+from rb209.data.crops import CROP_INFO
+from rb209.data.timing import NITROGEN_TIMING_RULES
+from rb209.engine import nitrogen_timing, nitrogen_timing_many
+from rb209.models import NitrogenTimingResult, NitrogenSplit, SoilType
+
+_SINGLE = "As a single dressing at the optimum time for the crop."
+
+
+def _reference_timing(crop, total_n, soil_type):
+    """``(amounts, timings, notes)`` as nitrogen_timing gave them before its
+    rules were indexed: a scan for the first rule that matches."""
+    rules = NITROGEN_TIMING_RULES.get(crop)
+    if rules is None:
+        return [round(total_n)], [_SINGLE], [
+            f"No specific timing guidance for {crop}. Apply as a single dressing."
+        ]
+    for rule in rules:
+        if not rule.get("min_n", 0) <= total_n <= rule.get("max_n", float("inf")):
+            continue
+        if "soil_types" in rule and soil_type not in rule["soil_types"]:
+            continue
+        break
+    else:
+        return [round(total_n)], [_SINGLE], []
+    amounts = []
+    for split in rule["splits"][:-1]:
+        if "fixed_amount" in split:
+            remaining = round(total_n) - sum(amounts)
+            amounts.append(max(0, min(int(split["fixed_amount"]), remaining)))
+        else:
+            amounts.append(round(split["fraction"] * total_n))
+    amounts.append(round(total_n) - sum(amounts))
+    return amounts, [split["timing"] for split in rule["splits"]], list(rule.get("notes", []))
+
+
+def _timing_grid():
+    """Every crop and soil at each rule threshold, either side of it, and
+    at round amounts up to 400 kg N/ha."""
+    for crop in CROP_INFO:
+        thresholds = {
+            rule[key] for rule in NITROGEN_TIMING_RULES.get(crop, ())
+            for key in ("min_n", "max_n") if key in rule
+        }
+        amounts = sorted(
+            {n + d for n in thresholds for d in (-0.5, 0, 0.5) if n + d >= 0}
+            | set(range(0, 401, 25))
+        )
+        for soil in (None, *(s.value for s in SoilType)):
+            for n in amounts:
+                yield crop, float(n), soil
 
 
 class TestNitrogenTimingWinterBarley(unittest.TestCase):
@@ -254,5 +303,48 @@ class TestNitrogenTimingEdgeCases(unittest.TestCase):
                 self.assertEqual(total, round(n), msg=f"Split sum mismatch for {crop} @ {n}")
 
 
+class TestTimingIndex(unittest.TestCase):
+    def test_rules_are_plain_data(self):
+        json.dumps(NITROGEN_TIMING_RULES)
+
+    def test_matches_reference_scan(self):
+        rows = list(_timing_grid())
+        for row, single, many in zip(rows, map(nitrogen_timing, *zip(*rows)),
+                                     nitrogen_timing_many(rows)):
+            amounts, timings, notes = _reference_timing(*row)
+            self.assertEqual([s.amount for s in single.splits], amounts, row)
+            self.assertEqual([s.timing for s in single.splits], timings, row)
+            self.assertEqual(single.notes, notes, row)
+            self.assertEqual(many, single, row)
+
+    def test_gap_between_thresholds_falls_back(self):
+        # winter-wheat-feed rules end at 120 and start again at 121.
+        result = nitrogen_timing("winter-wheat-feed", 120.5)
+        self.assertEqual(len(result.splits), 1)
+        self.assertIn("single dressing", result.splits[0].timing)
+
+
+class TestNitrogenTimingMany(unittest.TestCase):
+    def test_matches_single_calls(self):
+        rows = [
+            ("winter-wheat-feed", 180.0, None),
+            ("potatoes-maincrop", 210.0, "light"),
+            ("potatoes-maincrop", 210.0, "heavy"),
+            ("grass-silage", 320.0, None),
+            ("sugar-beet", 120.0, "medium"),
+        ]
+        self.assertEqual(nitrogen_timing_many(rows), [nitrogen_timing(*row) for row in rows])
+
+    def test_empty(self):
+        self.assertEqual(nitrogen_timing_many([]), [])
+
+    def test_error_names_row(self):
+        rows = [("winter-wheat-feed", 100.0, None), ("winter-wheat-feed", -1.0, None)]
+        with self.assertRaisesRegex(ValueError, "at row 1"):
+            nitrogen_timing_many(rows)
+        with self.assertRaisesRegex(ValueError, "Unknown soil type 'sandy'"):
+            nitrogen_timing_many([("winter-wheat-feed", 100.0, "sandy")])
+
+
 if __name__ == "__main__":
     unittest.main()
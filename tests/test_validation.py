@@ -0,0 +1,139 @@
+"""Tests for up-front batch validation and the engine's trusted mode."""
+
+import itertools
+import unittest
+
+from rb209.cache import RecommendationCache
+from rb209.data.crops import CROP_INFO
+from rb209.engine import calculate_organic, calculate_sns, recommend_all
+from rb209.models import OrganicMaterial, PreviousCrop, Rainfall, SoilType
+from rb209.validation import (
+    BatchValidationError,
+    check_batch,
+    organic_errors,
+    recommend_errors,
+    sns_errors,
+    validate_batch,
+)
+
+
+class TestRecommendErrors(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(recommend_errors("winter-wheat-feed", 2, 2, 1), [])
+        self.assertEqual(
+            recommend_errors("winter-wheat-feed", 2, 2, 1, soil_type="light",
+                             expected_yield=9.5, ber=4.0),
+            [],
+        )
+
+    def test_first_error_matches_engine(self):
+        for args in (
+            ("not-a-crop", 2, 2, 1),
+            ("winter-wheat-feed", 7, 2, 1),
+            ("winter-wheat-feed", 2, -1, 1),
+            ("winter-wheat-feed", 2, 2, True),
+            ("winter-wheat-feed", 2, 2, 1, 10),
+            ("winter-wheat-feed", 2, 2, 1, 2, True, "sandy"),
+        ):
+            with self.assertRaises(ValueError) as ctx:
+                recommend_all(*args)
+            self.assertEqual(recommend_errors(*args)[0], str(ctx.exception), args)
+
+    def test_reports_every_problem(self):
+        errors = recommend_errors("not-a-crop", 9, 2, 1.0, soil_type="sandy")
+        self.assertEqual(len(errors), 4)
+
+    def test_yield_data_required(self):
+        errors = recommend_errors("peas", 2, 2, 1, expected_yield=4.0)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("No yield adjustment data", errors[0])
+
+
+class TestOtherErrors(unittest.TestCase):
+    def test_sns(self):
+        self.assertEqual(sns_errors("cereals", "medium", "high"), [])
+        errors = sns_errors("turnips", "sandy", "medium")
+        self.assertEqual(len(errors), 2)
+        with self.assertRaises(ValueError) as ctx:
+            calculate_sns("turnips", "sandy", "medium")
+        self.assertEqual(errors[0], str(ctx.exception))
+
+    def test_organic(self):
+        self.assertEqual(organic_errors("cattle-fym", 25.0, "autumn", True, "light"), [])
+        self.assertEqual(
+            organic_errors("cattle-fym", -1.0), ["Application rate must be non-negative"],
+        )
+        self.assertEqual(len(organic_errors("mud", "lots", "monsoon")), 3)
+
+
+class TestBatch(unittest.TestCase):
+    def test_validate_batch_positions(self):
+        inputs = [
+            {"crop": "winter-wheat-feed", "sns_index": 2, "p_index": 2, "k_index": 1},
+            {"crop": "not-a-crop", "sns_index": 2, "p_index": 2, "k_index": 1},
+            {"crop": "winter-wheat-feed", "sns_index": 2},
+        ]
+        failures = validate_batch(inputs, recommend_errors)
+        self.assertEqual([pos for pos, _ in failures], [1, 2])
+
+    def test_check_batch_raises(self):
+        inputs = [{"previous_crop": "turnips", "soil_type": "medium", "rainfall": "high"}] * 8
+        with self.assertRaises(BatchValidationError) as ctx:
+            check_batch(inputs, sns_errors)
+        self.assertIsInstance(ctx.exception, ValueError)
+        self.assertEqual(len(ctx.exception.errors), 8)
+        self.assertIn("8 of 8 input(s) are invalid", str(ctx.exception))
+        self.assertIn("and 3 more", str(ctx.exception))
+
+    def test_check_batch_passes(self):
+        check_batch([{"material": "pig-slurry", "rate": 30.0}], organic_errors)
+
+
+class TestTrustedMode(unittest.TestCase):
+    def test_recommend_all_matches(self):
+        crops = sorted(c for c, info in CROP_INFO.items() if info["category"] != "fruit")
+        grid = itertools.product(
+            crops, [0, 3, 6], [0, 2, 9], [0, 2, 5], [0, 3], [True, False],
+            [None, "light", "organic"],
+        )
+        for args in grid:
+            try:
+                expected = recommend_all(*args, k_upper_half=True)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    recommend_all(*args, k_upper_half=True, trusted=True)
+                continue
+            self.assertEqual(recommend_all(*args, k_upper_half=True, trusted=True), expected)
+
+    def test_adjustments_match(self):
+        args = ("winter-wheat-feed", 2, 2, 1)
+        kwargs = {"soil_type": "heavy", "expected_yield": 10.5, "ber": 3.5}
+        self.assertEqual(
+            recommend_all(*args, **kwargs, trusted=True), recommend_all(*args, **kwargs),
+        )
+
+    def test_calculate_sns_matches(self):
+        for args in itertools.product(
+            [p.value for p in PreviousCrop], [s.value for s in SoilType],
+            [r.value for r in Rainfall],
+        ):
+            self.assertEqual(calculate_sns(*args, trusted=True), calculate_sns(*args))
+
+    def test_calculate_organic_matches(self):
+        for material in OrganicMaterial:
+            self.assertEqual(
+                calculate_organic(material.value, 20.0, trusted=True),
+                calculate_organic(material.value, 20.0),
+            )
+
+    def test_cache_keeps_trusted_results_apart(self):
+        cache = RecommendationCache()
+        cache.recommend_all("winter-wheat-feed", 2, 2, 1, trusted=True)
+        cache.recommend_all("winter-wheat-feed", 2, 2, 1)
+        self.assertEqual(cache.stats().misses, 2)
+        cache.recommend_all("winter-wheat-feed", 2, 2, 1, trusted=True)
+        self.assertEqual(cache.stats().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,391 @@
+"""Tests for the columnar (vectorised) engine."""
+
+import importlib.util
+import itertools
+import math
+import unittest
+from array import array
+
+from rb209.engine import (
+    calculate_lime,
+    calculate_sns,
+    calculate_veg_sns,
+    recommend_all,
+    smn_to_sns_index_veg,
+    sns_value_to_index,
+)
+from rb209.tables import CROP_ID, CROPS, SOIL_ID
+from rb209.vector import (
+    PREVIOUS_CROPS,
+    RAINFALL,
+    SNS_METHODS,
+    SNS_SOILS,
+    VEG_PREVIOUS_CROPS,
+    VEG_RAINFALL,
+    VEG_SNS_METHODS,
+    VEG_SOILS,
+    NoteFlag,
+    calculate_sns_many,
+    lime_plan_many,
+    recommend_all_array,
+    smn_to_sns_index_veg_many,
+    sns_value_to_index_many,
+    veg_sns_many,
+)
+
+_NUTRIENTS = ("nitrogen", "phosphorus", "potassium", "magnesium", "sulfur", "sodium")
+
+
+class TestRecommendAllArray(unittest.TestCase):
+    def test_matches_recommend_all_over_grid(self):
+        rows = []
+        for crop in CROPS:
+            for sns in range(7):
+                for idx in (0, 2, 9):
+                    for soil in (None, "light", "heavy"):
+                        rows.append((crop, sns, idx, idx, idx, idx % 2 == 0, soil))
+        expected = {}
+        for i, row in enumerate(rows):
+            try:
+                expected[i] = recommend_all(*row)
+            except ValueError:
+                pass
+        crops, sns, p, k, mg, straw, soil = (list(c) for c in zip(*rows))
+        out = recommend_all_array(crops, sns, p, k, mg, straw, soil)
+        self.assertGreater(len(expected), 1000)
+        for i, rec in expected.items():
+            for name in _NUTRIENTS:
+                self.assertEqual(out[name][i], getattr(rec, name), (rows[i], name))
+
+    def test_yield_and_ber_adjustments(self):
+        out = recommend_all_array(
+            ["winter-wheat-feed", "winter-wheat-feed"], [2, 2], [2, 2], [1, 1],
+            expected_yield=array("d", [10.0, float("nan")]),
+            ber=[3.5, None],
+        )
+        rec = recommend_all("winter-wheat-feed", 2, 2, 1, expected_yield=10.0, ber=3.5)
+        self.assertEqual(out["nitrogen"][0], rec.nitrogen)
+        self.assertEqual(out["phosphorus"][0], rec.phosphorus)
+        self.assertEqual(out["potassium"][0], rec.potassium)
+        self.assertTrue(out["notes"][0] & NoteFlag.YIELD_ADJUSTED)
+        self.assertTrue(out["notes"][0] & NoteFlag.BER_ADJUSTED)
+        self.assertEqual(out["nitrogen"][1], 150)
+        self.assertFalse(out["notes"][1] & NoteFlag.YIELD_ADJUSTED)
+
+    def test_accepts_crop_and_soil_ids(self):
+        out = recommend_all_array(
+            array("H", [CROP_ID["winter-wheat-feed"]]), [0], [2], [1],
+            soil_type=array("B", [SOIL_ID["light"]]),
+        )
+        self.assertEqual(out["nitrogen"][0], 180)
+
+    def test_scalar_broadcast(self):
+        out = recommend_all_array(["spring-barley"] * 3, [0, 1, 2], 2, 1, straw_removed=False)
+        self.assertEqual(len(out["nitrogen"]), 3)
+        self.assertEqual(list(out["potassium"]), [40.0, 40.0, 40.0])
+
+    def test_missing_table_data_is_nan(self):
+        out = recommend_all_array(["fruit-pear"], [2], [2], [2])
+        self.assertTrue(math.isnan(out["nitrogen"][0]))
+
+    def test_output_types(self):
+        out = recommend_all_array(["peas"], [0], [0], [0])
+        for name in _NUTRIENTS:
+            self.assertEqual(out[name].typecode, "d")
+        self.assertEqual(out["notes"].typecode, "L")
+
+
+class TestNoteFlags(unittest.TestCase):
+    def _flags(self, *args, **kwargs) -> NoteFlag:
+        out = recommend_all_array(*[[a] for a in args], **{k: [v] for k, v in kwargs.items()})
+        return NoteFlag(out["notes"][0])
+
+    def test_straw_and_crop_note(self):
+        flags = self._flags("winter-wheat-feed", 2, 2, 1, straw_removed=False)
+        self.assertIn(NoteFlag.STRAW_INCORPORATED, flags)
+        self.assertIn(NoteFlag.CROP_NOTE, flags)
+        self.assertIn(NoteFlag.TIMING_HINT, flags)
+        self.assertNotIn(NoteFlag.STRAW_REMOVED, flags)
+
+    def test_n_fixing(self):
+        self.assertIn(NoteFlag.N_FIXING, self._flags("peas", 0, 2, 2))
+
+    def test_hypomagnesaemia(self):
+        self.assertIn(NoteFlag.HYPOMAGNESAEMIA, self._flags("grass-grazed", 0, 2, 0, mg_index=0))
+
+    def test_combine_drill(self):
+        flags = self._flags("winter-wheat-feed", 0, 2, 0, soil_type="light")
+        self.assertIn(NoteFlag.COMBINE_DRILL_LIMIT, flags)
+
+    def test_sodium(self):
+        self.assertIn(NoteFlag.SODIUM, self._flags("sugar-beet", 1, 1, 0))
+        self.assertIn(NoteFlag.SODIUM, self._flags("veg-celery-seedbed", 1, 1, 0))
+
+    def test_flag_count_matches_note_count(self):
+        # Each flag corresponds to exactly one note, except sodium which may
+        # add several lines.
+        for crop in ("winter-wheat-feed", "potatoes-maincrop", "spring-barley",
+                     "veg-leeks", "veg-carrots", "winter-oilseed-rape"):
+            rec = recommend_all(crop, 0, 0, 0, mg_index=0)
+            flags = self._flags(crop, 0, 0, 0, mg_index=0)
+            self.assertNotIn(NoteFlag.SODIUM, flags)
+            self.assertEqual(bin(flags).count("1"), len(rec.notes), crop)
+
+
+class TestValidation(unittest.TestCase):
+    def test_unknown_crop(self):
+        with self.assertRaises(ValueError) as ctx:
+            recommend_all_array(["peas", "nope"], [0, 0], [0, 0], [0, 0])
+        self.assertIn("row 1", str(ctx.exception))
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(ValueError):
+            recommend_all_array(["peas"], [7], [0], [0])
+
+    def test_index_not_a_number(self):
+        with self.assertRaisesRegex(
+            ValueError, r"SNS index must be an integer between 0 and 6, got None at row 1",
+        ):
+            recommend_all_array(["peas", "peas"], [0, None], [0, 0], [0, 0])
+        with self.assertRaisesRegex(
+            ValueError, r"K index must be an integer between 0 and 9, got 'two' at row 0",
+        ):
+            recommend_all_array(["peas"], [0], [0], ["two"])
+        with self.assertRaisesRegex(ValueError, r"got nan at row 0"):
+            recommend_all_array(["peas"], [0], [math.nan], [0])
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            recommend_all_array(["peas", "peas"], [0], [0, 0], [0, 0])
+
+    def test_yield_without_data(self):
+        with self.assertRaises(ValueError):
+            recommend_all_array(["peas"], [0], [0], [0], expected_yield=[5.0])
+
+
+class TestCalculateSnsMany(unittest.TestCase):
+    def test_matches_calculate_sns_over_grid(self):
+        rows = list(itertools.product(PREVIOUS_CROPS, SNS_SOILS, RAINFALL))
+        out = calculate_sns_many(*zip(*rows))
+        for i, row in enumerate(rows):
+            self.assertEqual(out["sns_index"][i], calculate_sns(*row).sns_index, row)
+        self.assertEqual(set(out["method"]), {SNS_METHODS.index("field-assessment")})
+
+    def test_codes_and_scalars(self):
+        by_name = calculate_sns_many(["cereals", "potatoes"], "heavy", "low")
+        by_code = calculate_sns_many(
+            [PREVIOUS_CROPS.index("cereals"), PREVIOUS_CROPS.index("potatoes")],
+            [SNS_SOILS.index("heavy")] * 2, RAINFALL.index("low"),
+        )
+        self.assertEqual(by_name, by_code)
+        self.assertEqual(list(by_name["sns_index"]), [2, 3])
+
+    def test_grass_history_combined(self):
+        histories = list(itertools.product(
+            ["1-2yr", "3-5yr"], ["low", "high"], ["cut", "grazed", "1-cut-then-grazed"],
+            [1, 2, 3],
+        ))
+        rows = [
+            (prev, soil, rain, *history)
+            for prev in ("cereals", "grass-long-term")
+            for soil in ("light", "medium", "heavy")
+            for rain in RAINFALL
+            for history in histories
+        ]
+        rows.append(("cereals", "organic", "low", None, None, None, None))
+        out = calculate_sns_many(*zip(*rows))
+        for i, (prev, soil, rain, age, intensity, management, year) in enumerate(rows):
+            if age is None:
+                expected = calculate_sns(prev, soil, rain)
+            else:
+                expected = calculate_sns(prev, soil, rain, grass_history={
+                    "ley_age": age, "n_intensity": intensity,
+                    "management": management, "year": year,
+                })
+            self.assertEqual(out["sns_index"][i], expected.sns_index)
+            self.assertEqual(SNS_METHODS[out["method"][i]], expected.method)
+
+    def test_default_year(self):
+        out = calculate_sns_many(["cereals"], "medium", "low", "1-2yr", "low", "cut")
+        expected = calculate_sns("cereals", "medium", "low", grass_history={
+            "ley_age": "1-2yr", "n_intensity": "low", "management": "cut",
+        })
+        self.assertEqual(out["sns_index"][0], expected.sns_index)
+
+    def test_errors_name_row(self):
+        with self.assertRaisesRegex(ValueError, "Unknown previous crop 'turnips' at row 1"):
+            calculate_sns_many(["cereals", "turnips"], "medium", "low")
+        with self.assertRaisesRegex(ValueError, "organic soils \\(row 0\\)"):
+            calculate_sns_many(["cereals"], "organic", "low", "1-2yr", "low", "cut")
+        with self.assertRaises(ValueError):
+            calculate_sns_many(["cereals"], [9], "low")
+
+
+class TestVegSnsMany(unittest.TestCase):
+    def test_matches_calculate_veg_sns_over_grid(self):
+        rows = list(itertools.product(VEG_PREVIOUS_CROPS, VEG_SOILS, VEG_RAINFALL))
+        out = veg_sns_many(*zip(*rows))
+        for i, row in enumerate(rows):
+            expected = calculate_veg_sns(*row)
+            self.assertEqual(out["sns_index"][i], expected.sns_index, row)
+            self.assertEqual(VEG_SNS_METHODS[out["method"][i]], expected.method, row)
+            self.assertEqual(out["advisory"][i], expected.method.endswith("advisory"), row)
+
+    def test_smn_matches_smn_to_sns_index_veg(self):
+        values = [0, 10, 19.9, 20, 27, 27.5, 40, 53, 80, 80.1, 95, 120, 160, 240, 500]
+        rows = list(itertools.product(values, [30, 60, 90]))
+        smn, depth = zip(*rows)
+        out = veg_sns_many(["cereals"] * len(rows), "peat", "low", smn=smn, depth_cm=depth)
+        for i, (value, depth_cm) in enumerate(rows):
+            self.assertEqual(out["sns_index"][i], smn_to_sns_index_veg(value, depth_cm))
+        self.assertEqual(set(out["method"]), {VEG_SNS_METHODS.index("veg-smn")})
+        self.assertEqual(set(out["advisory"]), {0})
+
+    def test_missing_smn_falls_back_to_tables(self):
+        out = veg_sns_many(
+            ["cereals", "cereals", "cereals"], ["medium", "medium", "organic"], "moderate",
+            smn=[None, math.nan, None], depth_cm=30,
+        )
+        self.assertEqual(
+            [VEG_SNS_METHODS[m] for m in out["method"]],
+            ["veg-field-assessment", "veg-field-assessment", "veg-field-assessment-advisory"],
+        )
+        self.assertEqual(list(out["advisory"]), [0, 0, 1])
+
+    def test_errors_report_row(self):
+        with self.assertRaisesRegex(ValueError, "depth_cm must be 30, 60, or 90, got 45 at row 1"):
+            veg_sns_many(["cereals"] * 2, "medium", "low", smn=[30, 30], depth_cm=[30, 45])
+        with self.assertRaisesRegex(ValueError, "non-negative, got -1 at row 0"):
+            veg_sns_many(["cereals"], "medium", "low", smn=[-1], depth_cm=30)
+        with self.assertRaisesRegex(ValueError, "Unknown vegetable soil type 'clay'"):
+            veg_sns_many(["cereals"], ["clay"], "low")
+
+
+class TestSmnMany(unittest.TestCase):
+    VALUES = [0, 19.9, 19.95, 27, 39.9, 40, 59.9, 60, 60.01, 80, 120, 160, 160.5, 240, 241, 1e6]
+
+    def test_table_4_10(self):
+        out = sns_value_to_index_many(self.VALUES)
+        self.assertIsInstance(out, array)
+        self.assertEqual(list(out), [sns_value_to_index(v) for v in self.VALUES])
+
+    def test_table_6_6(self):
+        for depth in (30, 60, 90):
+            self.assertEqual(
+                list(smn_to_sns_index_veg_many(self.VALUES, depth)),
+                [smn_to_sns_index_veg(v, depth) for v in self.VALUES],
+            )
+        depths = [30, 60, 90] * 5 + [30]
+        self.assertEqual(
+            list(smn_to_sns_index_veg_many(array("d", self.VALUES), depths)),
+            [smn_to_sns_index_veg(v, d) for v, d in zip(self.VALUES, depths)],
+        )
+
+    def test_errors_report_row(self):
+        with self.assertRaisesRegex(ValueError, "non-negative, got -1 at row 2"):
+            sns_value_to_index_many([1, 2, -1])
+        with self.assertRaisesRegex(ValueError, "non-negative, got -1 at row 2"):
+            sns_value_to_index_many([1, math.nan, -1])
+        with self.assertRaisesRegex(ValueError, "must be a number, got '5' at row 0"):
+            smn_to_sns_index_veg_many(["5"], 30)
+        with self.assertRaisesRegex(ValueError, "got 45 at row 1"):
+            smn_to_sns_index_veg_many([5, 5], [30, 45])
+        with self.assertRaisesRegex(ValueError, "got 45"):
+            smn_to_sns_index_veg_many([5, 5], 45)
+
+    def test_nan_matches_scalar(self):
+        values = [1.0, math.nan, 300.0, math.nan]
+        self.assertEqual(list(sns_value_to_index_many(values)), [0, 6, 6, 6])
+        self.assertEqual(sns_value_to_index(math.nan), 6)
+        self.assertEqual(
+            list(smn_to_sns_index_veg_many(values, 30)),
+            [smn_to_sns_index_veg(v, 30) for v in values],
+        )
+        depths = [30, 60, 90, 30]
+        self.assertEqual(
+            list(smn_to_sns_index_veg_many(values, depths)),
+            [smn_to_sns_index_veg(v, d) for v, d in zip(values, depths)],
+        )
+
+    def test_empty(self):
+        self.assertEqual(len(sns_value_to_index_many([])), 0)
+        self.assertEqual(len(smn_to_sns_index_veg_many([], 30)), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy not installed")
+    def test_numpy_matches_pure_path(self):
+        import numpy as np
+
+        pure = [*self.VALUES, math.nan]
+        values = np.array(pure)
+        self.assertEqual(sns_value_to_index_many(values), sns_value_to_index_many(pure))
+        self.assertEqual(sns_value_to_index_many(values)[-1], 6)
+        depths = [30, 60, 90] * 5 + [30, 60]
+        self.assertEqual(
+            smn_to_sns_index_veg_many(values, np.array(depths)),
+            smn_to_sns_index_veg_many(pure, depths),
+        )
+        self.assertEqual(
+            smn_to_sns_index_veg_many(values, 90), smn_to_sns_index_veg_many(pure, 90),
+        )
+        with self.assertRaisesRegex(ValueError, "non-negative, got -1.0 at row 1"):
+            sns_value_to_index_many(np.array([1.0, -1.0]))
+
+
+class TestLimePlanMany(unittest.TestCase):
+    def test_matches_calculate_lime(self):
+        rows = list(itertools.product(
+            [3.0, 4.6, 5.0, 5.9, 6.5, 7.2, 9.0], ["light", "medium", "heavy", "organic"],
+            ["arable", "grassland"],
+        ))
+        ph, soil, use = zip(*rows)
+        out = lime_plan_many(ph, soil, use)
+        self.assertEqual(
+            list(out["lime_required"]),
+            [calculate_lime(p, None, s, u).lime_required for p, s, u in rows],
+        )
+
+    def test_split_schedule_and_tonnage(self):
+        # 20.9 t/ha, 5.5 t/ha and none, on 10, 2 and 5 ha.
+        out = lime_plan_many(
+            [4.6, 5.5, 7.0], ["organic", "medium", "light"], target_ph=[6.5, 6.5, 6.5],
+            area_ha=[10, 2, 5],
+        )
+        self.assertEqual(list(out["lime_required"]), [20.9, 5.5, 0.0])
+        self.assertEqual(list(out["years"]), [3, 1, 0])
+        self.assertEqual(list(out["final_dose"]), [5.9, 5.5, 0.0])
+        self.assertEqual(list(out["tonnage_by_year"]), [86.0, 75.0, 59.0])
+
+    def test_max_dose_and_potatoes(self):
+        out = lime_plan_many(
+            [5.5, 5.5], "heavy", "arable", crop=["potatoes-maincrop", None], max_dose=3.0,
+        )
+        self.assertEqual(list(out["years"]), [3, 3])
+        self.assertEqual(list(out["final_dose"]), [1.5, 1.5])
+        self.assertEqual(list(out["before_potatoes"]), [1, 0])
+
+    def test_errors_report_row(self):
+        with self.assertRaisesRegex(ValueError, "Unknown soil type 'sandy'.* at row 1"):
+            lime_plan_many([6.0, 6.0], ["light", "sandy"], "arable")
+        with self.assertRaisesRegex(ValueError, "Either target_ph or land_use .* at row 0"):
+            lime_plan_many([6.0], ["light"])
+        with self.assertRaisesRegex(ValueError, "Current pH must be between .* at row 1"):
+            lime_plan_many([6.0, 2.0], "light", "arable")
+        with self.assertRaisesRegex(ValueError, "Target pH must be between .* at row 0"):
+            lime_plan_many([6.0], "light", target_ph=[9.0])
+        with self.assertRaisesRegex(ValueError, "max_dose"):
+            lime_plan_many([6.0], "light", "arable", max_dose=0)
+        for max_dose in (float("inf"), float("nan")):
+            with self.assertRaisesRegex(ValueError, "max_dose must be positive and finite"):
+                lime_plan_many([6.0], "light", "arable", max_dose=max_dose)
+
+    def test_scalar_arguments_after_current_ph(self):
+        out = lime_plan_many([5.5, 6.0], "medium", "arable", crop="potatoes-maincrop", area_ha=2)
+        self.assertEqual(
+            list(out["lime_required"]),
+            [calculate_lime(ph, None, "medium", "arable").lime_required for ph in (5.5, 6.0)],
+        )
+        self.assertEqual(list(out["before_potatoes"]), [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()